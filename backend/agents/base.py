@@ -0,0 +1,243 @@
+import json
+import time
+
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.types import Command
+
+from ..models.state import CareerPlanningState
+from ..services.llm_cache import LLMResponseCache
+from ..services.context_budget import agent_token_budget, fit_messages, truncate_text
+from ..services.structured_output import describe_raw_output, extract_json, structured_output_method
+from ..services.llm_scheduler import get_llm_scheduler
+from ..services.telemetry import record_llm_call, record_node, record_parse_failure, record_retry
+
+STRUCTURED_REPAIR_PROMPT = """Your previous reply could not be used: {error}
+
+Previous reply:
+{previous}
+
+Reply again with only the corrected output, matching the required schema exactly."""
+
+# Tokens of an agent's reply kept in the state message; the parsed output has its own key
+STATE_MESSAGE_TOKENS = 64
+
+# Order in which the agents hand off to each other after the supervisor
+AGENT_PIPELINE = ["skills_agent", "industry_agent", "learning_agent", "resources_agent"]
+
+def _with_timing(name: str, output, elapsed: float):
+    """Attach the node's wall time to its state update"""
+    record_node(name, elapsed)
+    timing = {"node_timings": {name: elapsed}}
+    if isinstance(output, Command):
+        return Command(
+            graph=output.graph,
+            update={**(output.update or {}), **timing},
+            resume=output.resume,
+            goto=output.goto
+        )
+    return {**(output or {}), **timing}
+
+def timed_node(name: str, func, afunc):
+    """Build a graph node that records per-node wall time for both sync and async runs"""
+    def run(state: CareerPlanningState):
+        started = time.perf_counter()
+        output = func(state)
+        return _with_timing(name, output, time.perf_counter() - started)
+
+    async def arun(state: CareerPlanningState):
+        started = time.perf_counter()
+        output = await afunc(state)
+        return _with_timing(name, output, time.perf_counter() - started)
+
+    return RunnableLambda(run, afunc=arun, name=name)
+
+class BaseCareerAgent:
+    """Shared plumbing for agents that expose both sync and async LangGraph nodes"""
+
+    name = "agent"
+    # Pydantic model for the agent's reply; enables the STRUCTURED_OUTPUT path
+    output_schema = None
+
+    def __init__(self, model: ChatOpenAI, cache: LLMResponseCache = None):
+        self.model = model
+        self.cache = cache
+        self.token_budget = agent_token_budget()
+        self.structured_method = structured_output_method() if self.output_schema else None
+        self._structured_model = None
+        # Rate limits, adaptive concurrency and retries shared by every agent in the process
+        self.scheduler = get_llm_scheduler()
+
+    def _user_message(self, state: CareerPlanningState) -> str:
+        """Return the latest user message, skipping agent responses appended to the state"""
+        for message in reversed(state.get("messages") or []):
+            if isinstance(message, HumanMessage):
+                return message.content
+        return ""
+
+    def _is_parallel(self, state: CareerPlanningState) -> bool:
+        return state.get("execution_mode") == "parallel"
+
+    def _next_agent(self, state: CareerPlanningState, default: str) -> str:
+        """Follow the normal hand-off, unless an incremental re-plan limits which agents run"""
+        agents_to_run = state.get("agents_to_run")
+        if not agents_to_run:
+            return default
+        remaining = AGENT_PIPELINE[AGENT_PIPELINE.index(self.name) + 1:]
+        return next((agent for agent in remaining if agent in agents_to_run), "__end__")
+
+    def _reply_update(self, response, output_key: str) -> dict:
+        """State entries for a model reply: a compact AIMessage and its metadata, not the raw reply"""
+        content = getattr(response, "content", response)
+        if not isinstance(content, str):
+            content = json.dumps(content, default=str)
+        response_metadata = getattr(response, "response_metadata", None) or {}
+        usage = getattr(response, "usage_metadata", None) or {}
+        metadata = {
+            "output": output_key,
+            "model": response_metadata.get("model_name"),
+            "finish_reason": response_metadata.get("finish_reason"),
+            "structured_output": response_metadata.get("structured_output"),
+            "input_tokens": usage.get("input_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "reply_chars": len(content)
+        }
+        return {
+            "messages": [AIMessage(content=truncate_text(content, STATE_MESSAGE_TOKENS), name=self.name)],
+            "agent_metadata": {self.name: {key: value for key, value in metadata.items() if value is not None}}
+        }
+
+    def _parse_json(self, response, required=()):
+        """Decode the JSON reply; raises ValueError (and counts it) when the caller must fall back"""
+        data, _ = extract_json(getattr(response, "content", response))
+        missing = [field for field in required if not isinstance(data, dict) or field not in data]
+        if not isinstance(data, dict) or missing:
+            record_parse_failure(self.name, "fallback")
+            raise ValueError(f"Unusable {self.name} reply" + (f", missing {missing}" if missing else ""))
+        return data
+
+    def _call_model(self, runnable, messages):
+        """One model call, queued behind the LLM scheduler when it is enabled"""
+        if self.scheduler is None:
+            return runnable.invoke(messages)
+        return self.scheduler.run(lambda: runnable.invoke(messages), messages, component=self.name)
+
+    async def _acall_model(self, runnable, messages):
+        if self.scheduler is None:
+            return await runnable.ainvoke(messages)
+        return await self.scheduler.arun(lambda: runnable.ainvoke(messages), messages, component=self.name)
+
+    def _structured(self):
+        if self._structured_model is None:
+            self._structured_model = self.model.with_structured_output(
+                self.output_schema, method=self.structured_method, include_raw=True
+            )
+        return self._structured_model
+
+    def _cache_variant(self, structured: bool):
+        return f"structured:{self.structured_method}:{self.output_schema.__name__}" if structured else None
+
+    def _repair_messages(self, messages, result):
+        error = result.get("parsing_error") or "the reply did not match the schema"
+        return messages + [HumanMessage(content=STRUCTURED_REPAIR_PROMPT.format(
+            error=error, previous=describe_raw_output(result.get("raw"))
+        ))]
+
+    def _structured_reply(self, result, usage):
+        """Turn a structured result into an AIMessage whose content is the validated JSON
+
+        When parsing failed even after the repair, the raw reply is returned so the
+        agent's normal fallback handles it.
+        """
+        raw = result.get("raw")
+        if result.get("parsed") is None:
+            reply = raw if isinstance(raw, AIMessage) else AIMessage(content=describe_raw_output(raw))
+            return reply.model_copy(update={"usage_metadata": usage or reply.usage_metadata})
+        return AIMessage(
+            content=result["parsed"].model_dump_json(exclude_none=True),
+            usage_metadata=usage,
+            response_metadata={**(getattr(raw, "response_metadata", None) or {}), "structured_output": self.structured_method}
+        )
+
+    @staticmethod
+    def _add_usage(total, raw):
+        usage = getattr(raw, "usage_metadata", None)
+        if not usage:
+            return total
+        if not total:
+            return dict(usage)
+        return {key: total.get(key, 0) + usage.get(key, 0) for key in ("input_tokens", "output_tokens", "total_tokens")}
+
+    def _invoke_structured(self, messages):
+        """Schema-constrained call with at most one repair retry"""
+        result = self._call_model(self._structured(), messages)
+        usage = self._add_usage(None, result.get("raw"))
+        if result.get("parsed") is None:
+            record_parse_failure(self.name, "structured")
+            record_retry(self.name, "structured_output_repair")
+            result = self._call_model(self._structured(), self._repair_messages(messages, result))
+            usage = self._add_usage(usage, result.get("raw"))
+            if result.get("parsed") is None:
+                record_parse_failure(self.name, "repair")
+        return self._structured_reply(result, usage)
+
+    async def _ainvoke_structured(self, messages):
+        result = await self._acall_model(self._structured(), messages)
+        usage = self._add_usage(None, result.get("raw"))
+        if result.get("parsed") is None:
+            record_parse_failure(self.name, "structured")
+            record_retry(self.name, "structured_output_repair")
+            result = await self._acall_model(self._structured(), self._repair_messages(messages, result))
+            usage = self._add_usage(usage, result.get("raw"))
+            if result.get("parsed") is None:
+                record_parse_failure(self.name, "repair")
+        return self._structured_reply(result, usage)
+
+    def _cacheable(self, response, structured: bool) -> bool:
+        # Never cache a structured call that still failed, or it would be replayed
+        return not structured or bool((response.response_metadata or {}).get("structured_output"))
+
+    def _invoke_model(self, messages, model=None):
+        """Call the model synchronously, serving repeated prompts from the response cache
+
+        The plain model (no explicit model, e.g. no tools bound) goes through the
+        structured-output path when it is enabled.
+        """
+        structured = model is None and self.structured_method is not None
+        model = model or self.model
+        variant = self._cache_variant(structured)
+        messages = fit_messages(messages, self.token_budget)
+        started = time.perf_counter()
+        if self.cache:
+            cached = self.cache.lookup(model, messages, variant)
+            if cached is not None:
+                record_llm_call(self.name, time.perf_counter() - started, cached, cache_hit=True)
+                return cached
+        response = self._invoke_structured(messages) if structured else self._call_model(model, messages)
+        record_llm_call(self.name, time.perf_counter() - started, response)
+        if self.cache and self._cacheable(response, structured):
+            self.cache.save(model, messages, response, variant)
+        return response
+
+    async def _ainvoke_model(self, messages, model=None):
+        """Call the model without blocking the event loop"""
+        structured = model is None and self.structured_method is not None
+        model = model or self.model
+        variant = self._cache_variant(structured)
+        messages = fit_messages(messages, self.token_budget)
+        started = time.perf_counter()
+        if self.cache:
+            cached = self.cache.lookup(model, messages, variant)
+            if cached is not None:
+                record_llm_call(self.name, time.perf_counter() - started, cached, cache_hit=True)
+                return cached
+        response = await self._ainvoke_structured(messages) if structured else await self._acall_model(model, messages)
+        record_llm_call(self.name, time.perf_counter() - started, response)
+        if self.cache and self._cacheable(response, structured):
+            self.cache.save(model, messages, response, variant)
+        return response
+
+    def as_node(self):
+        """Wrap the agent so graph.invoke uses __call__ and graph.ainvoke uses acall"""
+        return timed_node(self.name, self.__call__, self.acall)
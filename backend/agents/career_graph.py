@@ -1,64 +1,188 @@
 import os
+import json
+import time
+import hashlib
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Literal
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph, END
-from langgraph.constants import START
-from langchain.schema import HumanMessage
-
-from .supervisor import CareerSupervisorAgent
-from .skills_agent import SkillsAssessmentAgent
-from .industry_agent import IndustryResearchAgent
-from .learning_agent import LearningPathAgent
-from .resources_agent import ResourceRecommendationAgent
-from ..models.state import CareerPlanningState
+
+from ..services.llm_cache import create_llm_cache_from_env
+from ..services.search_cache import create_search_cache_from_env, normalize_query
+from ..services.single_flight import SingleFlight
+from ..services.roles import get_role_index, role_id
+from ..services.http_clients import get_http_clients
+from ..services.llm_scheduler import get_llm_scheduler
+from ..services.link_checker import get_link_checker
+from ..services.context_budget import count_tokens
+from ..services.resource_index import get_resource_index
+from ..services.skills_taxonomy import get_skills_taxonomy
+from ..services.telemetry import record_coalesced
+
+# Plan sections sent to streaming clients as soon as the node that produces them finishes
+STREAMED_SECTIONS = ("skills_assessment", "industry_insights", "learning_path", "resources", "next_agent")
+
+# LangChain, LangGraph, the OpenAI SDK and the agent modules are imported by the builders
+# that need them, so importing this module (e.g. at server start) doesn't pay for them
+
+# Nodes whose LLM tokens are forwarded to streaming clients (the supervisor only emits a route name)
+STREAMED_TOKEN_NODES = ("skills_agent", "industry_agent", "learning_agent", "resources_agent")
 
 class CareerPlanningGraph:
-    def __init__(self, openai_api_key: str):
-        # Initialize the LLM
-        self.model = ChatOpenAI(
-            temperature=0.1,
-            api_key=openai_api_key,
-            model="gpt-4o-mini-2024-07-18"
+    def __init__(self, openai_api_key: str, use_async: bool = None, max_sync_workers: int = None,
+                 execution_mode: str = None, model=None, search_tool=None):
+        # Initialize the LLM (benchmarks inject a stub chat model and search tool instead);
+        # it shares the process-wide connection pool with the search tool
+        http_clients = get_http_clients()
+        if model is None:
+            from langchain_openai import ChatOpenAI
+            model = ChatOpenAI(
+                temperature=0.1,
+                api_key=openai_api_key,
+                model="gpt-4o-mini-2024-07-18",
+                http_client=http_clients.sync_client(),
+                http_async_client=http_clients.async_client(),
+                # The LLM scheduler owns retries (with Retry-After and adaptive concurrency) when enabled
+                max_retries=0 if get_llm_scheduler() else 2
+            )
+        self.model = model
+        
+        # Shared response cache so popular transitions skip the LLM entirely
+        self.llm_cache = create_llm_cache_from_env()
+        self.search_cache = create_search_cache_from_env()
+        
+        # Agents and the compiled graph are built on first use (or by warmup()), so creating
+        # the planner at startup costs little more than the imports
+        self._search_tool = search_tool
+        self._agents = {}
+        self._graph = None
+        self._build_lock = threading.RLock()
+        
+        # Async graph execution is the default; the executor only serves the sync fallback
+        if use_async is None:
+            use_async = os.getenv("CAREER_GRAPH_ASYNC", "true").lower() != "false"
+        self.use_async = use_async
+        self.max_sync_workers = max_sync_workers or int(os.getenv("CAREER_GRAPH_SYNC_WORKERS", "4"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_sync_workers,
+            thread_name_prefix="career-graph"
         )
         
-        # Initialize all agents
-        self.supervisor = CareerSupervisorAgent(self.model)
-        self.skills_agent = SkillsAssessmentAgent(self.model)
-        self.industry_agent = IndustryResearchAgent(self.model)
-        self.learning_agent = LearningPathAgent(self.model)
-        self.resources_agent = ResourceRecommendationAgent(self.model)
+        # "sequential" runs the agents one after another; "parallel" fans out
+        # industry research and role-level resource searches alongside skills assessment
+        self.execution_mode = execution_mode or os.getenv("CAREER_GRAPH_MODE", "sequential")
+        if self.execution_mode not in ("sequential", "parallel"):
+            raise ValueError(f"Unknown execution mode: {self.execution_mode}")
         
-        # Build the graph
-        self.graph = self._build_graph()
+        # Free-text roles are mapped to canonical role IDs before any agent runs, so the catalog
+        # and skills taxonomy see "senior_software_engineer" for "Sr. SWE"; prompts keep the
+        # user's own wording, and roles missing from the request are read from the message
+        self.canonicalize_roles = os.getenv("ROLE_CANONICALIZATION", "true").lower() != "false"
+        
+        # Identical requests that arrive while one is already running share its result
+        coalesce = os.getenv("PLAN_COALESCING", "true").lower() != "false"
+        self.coalescer = SingleFlight() if coalesce else None
+        
+        # Resource links are verified in the background; dead ones sink on later plans
+        self.link_checker = get_link_checker()
+        
+    def _agent(self, name: str, factory):
+        with self._build_lock:
+            if name not in self._agents:
+                self._agents[name] = factory()
+            return self._agents[name]
+
+    @property
+    def supervisor(self):
+        from .supervisor import CareerSupervisorAgent
+        return self._agent("supervisor", lambda: CareerSupervisorAgent(self.model, self.llm_cache))
+
+    @property
+    def skills_agent(self):
+        from .skills_agent import SkillsAssessmentAgent
+        return self._agent("skills_agent", lambda: SkillsAssessmentAgent(self.model, self.llm_cache))
+
+    @property
+    def industry_agent(self):
+        from .industry_agent import IndustryResearchAgent
+        return self._agent("industry_agent", lambda: IndustryResearchAgent(self.model, self.llm_cache))
+
+    @property
+    def learning_agent(self):
+        from .learning_agent import LearningPathAgent
+        return self._agent("learning_agent", lambda: LearningPathAgent(self.model, self.llm_cache))
+
+    @property
+    def resources_agent(self):
+        from .resources_agent import ResourceRecommendationAgent
+        return self._agent("resources_agent", lambda: ResourceRecommendationAgent(
+            self.model, self.llm_cache, self.search_cache, search_tool=self._search_tool
+        ))
+
+    @property
+    def graph(self):
+        """The compiled workflow, built (with every agent) on first use"""
+        if self._graph is None:
+            with self._build_lock:
+                if self._graph is None:
+                    self._graph = self._build_graph()
+        return self._graph
+
+    def warmup(self):
+        """Build everything the first request would otherwise pay for; returns seconds per step"""
+        steps = {
+            "graph": lambda: self.graph,
+            "search_tool": lambda: self.resources_agent.search_client,
+            "tokenizer": lambda: count_tokens("warmup"),
+            "role_index": get_role_index,
+            "skills_taxonomy": get_skills_taxonomy,
+            "resource_index": get_resource_index
+        }
+        timings = {}
+        for name, step in steps.items():
+            started = time.perf_counter()
+            step()
+            timings[name] = round(time.perf_counter() - started, 3)
+        return timings
     
     def _build_graph(self):
         """Build the LangGraph multi-agent workflow"""
+        from langgraph.graph import StateGraph
+        from .base import timed_node
+        from ..models.state import CareerPlanningState
         
         # Create the graph builder
         builder = StateGraph(CareerPlanningState)
         
         # Add all agent nodes
-        builder.add_node("supervisor", self.supervisor)
-        builder.add_node("skills_agent", self.skills_agent)
-        builder.add_node("industry_agent", self.industry_agent)
-        builder.add_node("learning_agent", self.learning_agent)
-        builder.add_node("resources_agent", self.resources_agent)
+        builder.add_node("supervisor", self.supervisor.as_node())
+        builder.add_node("skills_agent", self.skills_agent.as_node())
+        builder.add_node("industry_agent", self.industry_agent.as_node())
+        builder.add_node("learning_agent", self.learning_agent.as_node())
+        builder.add_node("resources_agent", self.resources_agent.as_node())
+        builder.add_node("resources_prefetch", timed_node(
+            "resources_prefetch", self.resources_agent.prefetch, self.resources_agent.aprefetch
+        ))
         
         # Define the workflow entry point
         builder.set_entry_point("supervisor")
         
         # All agents return to supervisor except resources_agent (which ends)
-        # The Command objects in each agent handle the routing
+        # The Command objects in each agent handle the routing; in parallel mode the
+        # supervisor fans out and the branches join at learning_agent
         
         return builder.compile()
     
-    def plan_career(self, user_message: str, current_role: str = None, target_role: str = None, 
-                   conversation_history: list = None, existing_learning_path: dict = None, 
-                   is_follow_up: bool = False):
-        """Enhanced career planning with conversation context"""
-        
-        # Create initial state with context
-        initial_state = {
+    def _initial_state(self, user_message: str, current_role: str = None, target_role: str = None,
+                       conversation_history: list = None, existing_learning_path: dict = None,
+                       is_follow_up: bool = False, execution_mode: str = None,
+                       previous_outputs: dict = None):
+        """Create initial state with context"""
+        from langchain_core.messages import HumanMessage
+        state = {
+            "execution_mode": execution_mode or self.execution_mode,
             "messages": [HumanMessage(content=user_message)],
             "current_role": current_role,
             "target_role": target_role,
@@ -67,10 +191,48 @@ class CareerPlanningGraph:
             "is_follow_up": is_follow_up
         }
         
-        # Run the graph
-        result = self.graph.invoke(initial_state)
+        # Resume a follow-up from the previous plan so only stale agents need to run
+        if is_follow_up and previous_outputs:
+            for field in ("skills_assessment", "industry_insights", "learning_path", "resources", "mermaid_chart"):
+                if previous_outputs.get(field):
+                    state[field] = previous_outputs[field]
+            state["current_role"] = current_role or previous_outputs.get("current_role")
+            state["target_role"] = target_role or previous_outputs.get("target_role")
+            state["existing_learning_path"] = existing_learning_path or previous_outputs.get("learning_path")
         
-        # Extract the final response
+        if self.canonicalize_roles:
+            state["current_role_id"] = role_id(state["current_role"])
+            state["target_role_id"] = role_id(state["target_role"])
+        return state
+
+    def _canonical_roles(self, user_message: str, current_role: str = None, target_role: str = None):
+        """Roles the request left out, taken from the message itself
+
+        Roles stay in the user's own words ("Senior Product Manager", not the closest canonical
+        name); canonical IDs are only used for cache and catalog keys and the skills taxonomy.
+        """
+        if not self.canonicalize_roles:
+            return current_role, target_role
+        current, target = get_role_index().resolve(user_message, current_role, target_role)
+        resolved = (current_role or (current.text if current else None), target_role or (target.text if target else None))
+        if resolved != (current_role, target_role):
+            print(f"🏷️ Roles: {current_role!r} → {resolved[0]!r}, {target_role!r} → {resolved[1]!r}")
+        return resolved
+
+    def _timings(self, result, started: float):
+        """Per-node wall time plus the end-to-end total, for comparing execution modes"""
+        timings = {
+            "mode": result.get("execution_mode"),
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "nodes": {node: round(seconds, 3) for node, seconds in (result.get("node_timings") or {}).items()}
+        }
+        print(f"⏱️ {timings['mode']} plan finished in {timings['total_seconds']}s: {timings['nodes']}")
+        return timings
+
+    def _format_result(self, result, is_follow_up=False, started: float = None):
+        """Extract the final response"""
+        if self.link_checker and result.get("resources"):
+            result = {**result, "resources": self.link_checker.review(result["resources"])}
         return {
             "message": self._generate_summary(result, is_follow_up),
             "mermaid_chart": result.get("mermaid_chart", ""),
@@ -80,8 +242,150 @@ class CareerPlanningGraph:
             "resources": result.get("resources", {}),
             "current_role": result.get("current_role"),
             "target_role": result.get("target_role"),
-            "is_follow_up": is_follow_up
+            "is_follow_up": is_follow_up,
+            "agents_run": [node for node in (result.get("node_timings") or {}) if node != "supervisor"],
+            "agent_metadata": result.get("agent_metadata") or {},
+            "timings": self._timings(result, started) if started is not None else None
         }
+
+    def _coalescing_key(self, user_message: str, current_role: str = None, target_role: str = None,
+                        conversation_history: list = None, existing_learning_path: dict = None,
+                        is_follow_up: bool = False, execution_mode: str = None,
+                        previous_outputs: dict = None) -> str:
+        """Requests that would produce the same plan: normalized message and roles plus the follow-up context"""
+        payload = json.dumps({
+            "message": normalize_query(user_message),
+            "current_role": normalize_query(current_role),
+            "target_role": normalize_query(target_role),
+            "is_follow_up": bool(is_follow_up),
+            "execution_mode": execution_mode or self.execution_mode,
+            "history": conversation_history or [],
+            "existing_learning_path": existing_learning_path if is_follow_up else None,
+            "previous_outputs": previous_outputs if is_follow_up else None
+        }, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _shared_result(self, result, shared: bool):
+        """Give every caller its own top-level dict, since the API adds keys to it"""
+        if shared:
+            record_coalesced()
+        return {**result, "coalesced": shared}
+
+    def plan_career(self, user_message: str, current_role: str = None, target_role: str = None, 
+                   conversation_history: list = None, existing_learning_path: dict = None, 
+                   is_follow_up: bool = False, execution_mode: str = None,
+                   previous_outputs: dict = None):
+        """Enhanced career planning with conversation context"""
+        current_role, target_role = self._canonical_roles(user_message, current_role, target_role)
+        args = (user_message, current_role, target_role, conversation_history, existing_learning_path,
+                is_follow_up, execution_mode, previous_outputs)
+        if self.coalescer is None:
+            return self._run_plan(*args)
+        result, shared = self.coalescer.run_sync(self._coalescing_key(*args), partial(self._run_plan, *args))
+        return self._shared_result(result, shared)
+
+    def _run_plan(self, user_message: str, current_role: str = None, target_role: str = None,
+                  conversation_history: list = None, existing_learning_path: dict = None,
+                  is_follow_up: bool = False, execution_mode: str = None,
+                  previous_outputs: dict = None):
+        started = time.perf_counter()
+        initial_state = self._initial_state(
+            user_message, current_role, target_role,
+            conversation_history, existing_learning_path, is_follow_up, execution_mode,
+            previous_outputs
+        )
+        
+        # Run the graph
+        result = self.graph.invoke(initial_state)
+        return self._format_result(result, is_follow_up, started)
+
+    async def aplan_career(self, user_message: str, current_role: str = None, target_role: str = None,
+                           conversation_history: list = None, existing_learning_path: dict = None,
+                           is_follow_up: bool = False, execution_mode: str = None,
+                           previous_outputs: dict = None):
+        """Async career planning that never blocks the event loop"""
+        current_role, target_role = self._canonical_roles(user_message, current_role, target_role)
+        args = (user_message, current_role, target_role, conversation_history, existing_learning_path,
+                is_follow_up, execution_mode, previous_outputs)
+        if not self.use_async:
+            # Sync fallback: run the blocking graph on the bounded executor
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                contextvars.copy_context().run,
+                partial(self.plan_career, *args)
+            )
+        
+        if self.coalescer is None:
+            return await self._arun_plan(*args)
+        result, shared = await self.coalescer.run(self._coalescing_key(*args), partial(self._arun_plan, *args))
+        return self._shared_result(result, shared)
+
+    async def _arun_plan(self, user_message: str, current_role: str = None, target_role: str = None,
+                         conversation_history: list = None, existing_learning_path: dict = None,
+                         is_follow_up: bool = False, execution_mode: str = None,
+                         previous_outputs: dict = None):
+        started = time.perf_counter()
+        initial_state = self._initial_state(
+            user_message, current_role, target_role,
+            conversation_history, existing_learning_path, is_follow_up, execution_mode,
+            previous_outputs
+        )
+        result = await self.graph.ainvoke(initial_state)
+        return self._format_result(result, is_follow_up, started)
+
+    async def astream_plan(self, user_message: str, current_role: str = None, target_role: str = None,
+                           conversation_history: list = None, existing_learning_path: dict = None,
+                           is_follow_up: bool = False, execution_mode: str = None,
+                           previous_outputs: dict = None):
+        """Yield (event, payload) pairs as each node finishes, with LLM tokens in between"""
+        from ..models.state import merge_agent_metadata, merge_timings
+        started = time.perf_counter()
+        current_role, target_role = self._canonical_roles(user_message, current_role, target_role)
+        initial_state = self._initial_state(
+            user_message, current_role, target_role,
+            conversation_history, existing_learning_path, is_follow_up, execution_mode,
+            previous_outputs
+        )
+        
+        # Rebuild the final state from node updates so the summary needs no second run
+        state = dict(initial_state)
+        async for mode, chunk in self.graph.astream(initial_state, stream_mode=["updates", "messages"]):
+            if mode == "messages":
+                message_chunk, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if node in STREAMED_TOKEN_NODES and isinstance(message_chunk.content, str) and message_chunk.content:
+                    yield "token", {"node": node, "content": message_chunk.content}
+                continue
+            
+            for node, update in chunk.items():
+                update = update or {}
+                for key, value in update.items():
+                    if key == "node_timings":
+                        state[key] = merge_timings(state.get(key), value)
+                    elif key == "agent_metadata":
+                        state[key] = merge_agent_metadata(state.get(key), value)
+                    elif key != "messages":
+                        state[key] = value
+                sections = {key: update[key] for key in STREAMED_SECTIONS if key in update}
+                yield "node", {"node": node, "sections": sections, "seconds": round((update.get("node_timings") or {}).get(node, 0.0), 3)}
+        
+        yield "summary", self._format_result(state, is_follow_up, started)
+
+    def cache_stats(self):
+        """Hit/miss counters for the LLM response and search result caches"""
+        resources_agent = self._agents.get("resources_agent")
+        search_client = resources_agent.search_client if resources_agent else None
+        return {
+            "llm": self.llm_cache.stats() if self.llm_cache else {"backend": "none"},
+            "search": search_client.describe() if hasattr(search_client, "describe") else {"backend": "none"},
+            "coalescing": self.coalescer.stats() if self.coalescer else {"enabled": False},
+            "links": self.link_checker.stats() if self.link_checker else {"mode": "off"}
+        }
+
+    def close(self):
+        """Release the sync fallback executor"""
+        self._executor.shutdown(wait=False)
     
     def _generate_summary(self, result, is_follow_up=False):
         """Generate a comprehensive summary from all agent outputs"""
@@ -156,7 +460,11 @@ class CareerPlanningGraph:
                     url = course.get("url", "")
                     cost = course.get("cost", "")
                     
-                    course_line = f"• **[{title}]({url})** by {provider}"
+                    # Known-dead links stay listed (demoted) but aren't rendered clickable
+                    if url and course.get("link_status") != "dead":
+                        course_line = f"• **[{title}]({url})** by {provider}"
+                    else:
+                        course_line = f"• **{title}** by {provider}"
                     if level or duration or cost:
                         details = " • ".join(filter(None, [level, duration, cost]))
                         course_line += f" _{details}_"
@@ -203,7 +511,7 @@ class CareerPlanningGraph:
         return "\n".join(summary_parts)
 
 # Factory function for easy instantiation
-def create_career_planning_graph(openai_api_key: str = None):
+def create_career_planning_graph(openai_api_key: str = None, **kwargs):
     """Create a CareerPlanningGraph instance"""
     if not openai_api_key:
         openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -211,4 +519,4 @@ def create_career_planning_graph(openai_api_key: str = None):
     if not openai_api_key:
         raise ValueError("OpenAI API key is required")
     
-    return CareerPlanningGraph(openai_api_key) 
\ No newline at end of file
+    return CareerPlanningGraph(openai_api_key, **kwargs) 
\ No newline at end of file
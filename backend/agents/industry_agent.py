@@ -2,13 +2,22 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.types import Command
 from typing import Literal
-import json
 
+from .base import BaseCareerAgent
 from ..models.state import CareerPlanningState
+from ..models.agent_outputs import IndustryInsights
+from ..services.llm_cache import LLMResponseCache
+from ..services.context_budget import compact_json
 
-class IndustryResearchAgent:
-    def __init__(self, model: ChatOpenAI):
-        self.model = model
+# The skills assessment only frames the research, so the gaps are all we send
+SKILLS_FIELDS = ("priority_skills", "skill_gaps")
+
+class IndustryResearchAgent(BaseCareerAgent):
+    name = "industry_agent"
+    output_schema = IndustryInsights
+
+    def __init__(self, model: ChatOpenAI, cache: LLMResponseCache = None):
+        super().__init__(model, cache)
         self.system_prompt = """You are an Industry Research Agent, an expert market analyst specializing in career trends and industry insights.
 
 Your role:
@@ -28,25 +37,26 @@ Always respond in JSON format with:
     "job_opportunities": ["types of roles available"]
 }"""
 
-    def __call__(self, state: CareerPlanningState) -> Command[Literal["learning_agent", "__end__"]]:
+    def _build_messages(self, state: CareerPlanningState):
+        """Build the industry research prompt for the target role"""
         skills_info = state.get("skills_assessment") or {}
         
-        messages = [
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=f"""
 Target Role: {state.get('target_role') or 'Not specified'}
 Current Role: {state.get('current_role') or 'Not specified'}
-Skills Assessment: {json.dumps(skills_info, indent=2)}
+Skills Assessment: {compact_json(skills_info, SKILLS_FIELDS)}
 
 Please provide comprehensive industry research for the target role.
 """)
         ]
-        
-        response = self.model.invoke(messages)
-        
+
+    def _process(self, state: CareerPlanningState, response) -> Command:
+        """Parse the industry insights and hand off to the learning agent"""
         try:
-            industry_data = json.loads(response.content)
-        except:
+            industry_data = self._parse_json(response)
+        except ValueError:
             # Fallback if JSON parsing fails
             industry_data = {
                 "industry_overview": "Growing technology sector with high demand for skilled professionals",
@@ -59,9 +69,17 @@ Please provide comprehensive industry research for the target role.
             }
         
         return Command(
-            goto="learning_agent",
+            goto=self._next_agent(state, "learning_agent"),
             update={
                 "industry_insights": industry_data,
-                "messages": state['messages'] + [response]
+                **self._reply_update(response, "industry_insights")
             }
-        ) 
\ No newline at end of file
+        )
+
+    def __call__(self, state: CareerPlanningState) -> Command[Literal["learning_agent", "__end__"]]:
+        response = self._invoke_model(self._build_messages(state))
+        return self._process(state, response)
+
+    async def acall(self, state: CareerPlanningState) -> Command[Literal["learning_agent", "__end__"]]:
+        response = await self._ainvoke_model(self._build_messages(state))
+        return self._process(state, response)
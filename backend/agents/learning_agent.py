@@ -2,13 +2,24 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.types import Command
 from typing import Literal
-import json
 
+from .base import BaseCareerAgent
 from ..models.state import CareerPlanningState
+from ..models.agent_outputs import LearningPath
+from ..services.llm_cache import LLMResponseCache
+from ..services.context_budget import compact_json
 
-class LearningPathAgent:
-    def __init__(self, model: ChatOpenAI):
-        self.model = model
+# Fields of the upstream outputs the learning path is actually built from
+SKILLS_FIELDS = ("skill_gaps", "strengths", "priority_skills")
+INDUSTRY_FIELDS = ("market_demand", "growth_projection", "emerging_trends")
+LEARNING_PATH_FIELDS = ("learning_phases", "timeline", "milestones")
+
+class LearningPathAgent(BaseCareerAgent):
+    name = "learning_agent"
+    output_schema = LearningPath
+
+    def __init__(self, model: ChatOpenAI, cache: LLMResponseCache = None):
+        super().__init__(model, cache)
         self.system_prompt = """You are a Learning Path Agent, an expert learning strategist who creates and refines personalized career roadmaps.
 
 Your role:
@@ -67,49 +78,49 @@ Keep phases practical, actionable, and timeline-focused."""
         fixed_chart = re.sub(pattern, replace_quotes, mermaid_chart)
         return fixed_chart
 
-    def __call__(self, state: CareerPlanningState) -> Command[Literal["resources_agent", "__end__"]]:
+    def _build_messages(self, state: CareerPlanningState):
+        """Build a new-plan or modification prompt depending on the conversation context"""
         skills_info = state.get("skills_assessment") or {}
         industry_info = state.get("industry_insights") or {}
         existing_path = state.get("existing_learning_path")
         is_follow_up = state.get("is_follow_up", False)
         conversation_history = state.get("conversation_history", [])
-        user_message = state["messages"][-1].content if state["messages"] else ""
+        user_message = self._user_message(state)
         
         # Create context-aware prompt
         context_info = f"""
 Current Role: {state.get('current_role') or 'Software Engineer'}
 Target Role: {state.get('target_role') or 'Senior Software Engineer'}
 Is Follow-up Request: {is_follow_up}
-Skills Assessment: {json.dumps(skills_info, indent=2)}
-Industry Insights: {json.dumps(industry_info, indent=2)}
+Skills Assessment: {compact_json(skills_info, SKILLS_FIELDS)}
+Industry Insights: {compact_json(industry_info, INDUSTRY_FIELDS)}
 User's Current Request: {user_message}
 """
 
         if is_follow_up and existing_path:
             context_info += f"""
 EXISTING LEARNING PATH TO MODIFY:
-{json.dumps(existing_path, indent=2)}
+{compact_json(existing_path, LEARNING_PATH_FIELDS)}
 
 INSTRUCTION: The user wants to modify their existing learning path. Focus on their specific request and update accordingly. Don't create a completely new plan - refine what exists.
 """
         else:
             context_info += "\nINSTRUCTION: Create a comprehensive new learning path from scratch."
 
-        messages = [
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=context_info)
         ]
-        
-        response = self.model.invoke(messages)
+
+    def _process(self, state: CareerPlanningState, response) -> Command:
+        """Parse the learning path, falling back to the existing or a default plan"""
+        existing_path = state.get("existing_learning_path")
+        is_follow_up = state.get("is_follow_up", False)
         
         try:
-            learning_data = json.loads(response.content)
-            
-            # Ensure required fields exist
-            if "learning_phases" not in learning_data:
-                raise ValueError("Missing learning_phases")
-                
-        except (json.JSONDecodeError, ValueError):
+            # learning_phases is required; without it the plan can't be drawn
+            learning_data = self._parse_json(response, required=("learning_phases",))
+        except ValueError:
             # Fallback with a basic structure
             current_role = state.get('current_role') or 'Software Engineer'
             target_role = state.get('target_role') or 'Senior Software Engineer'
@@ -146,9 +157,17 @@ INSTRUCTION: The user wants to modify their existing learning path. Focus on the
                 }
         
         return Command(
-            goto="resources_agent",
+            goto=self._next_agent(state, "resources_agent"),
             update={
                 "learning_path": learning_data,
-                "messages": state["messages"] + [response]
+                **self._reply_update(response, "learning_path")
             }
-        ) 
\ No newline at end of file
+        )
+
+    def __call__(self, state: CareerPlanningState) -> Command[Literal["resources_agent", "__end__"]]:
+        response = self._invoke_model(self._build_messages(state))
+        return self._process(state, response)
+
+    async def acall(self, state: CareerPlanningState) -> Command[Literal["resources_agent", "__end__"]]:
+        response = await self._ainvoke_model(self._build_messages(state))
+        return self._process(state, response)
@@ -1,35 +1,71 @@
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
-from langchain_tavily import TavilySearch
 from langgraph.types import Command
 from typing import Literal
+import asyncio
+import contextvars
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
+from .base import BaseCareerAgent
 from ..models.state import CareerPlanningState
+from ..models.agent_outputs import ResourceRecommendations
+from ..services.llm_cache import LLMResponseCache
+from ..services.search_cache import wrap_search_tool
+from ..services.web_search import create_search_tool_from_env
+from ..services.context_budget import compact_json, select_fields
+from ..services.resource_index import get_resource_index
+from ..services.resource_search import extract_metadata, merge_search_results, normalize_url, rank_results
+from ..services.telemetry import record_abandoned
 
-class ResourceRecommendationAgent:
-    def __init__(self, model: ChatOpenAI):
-        self.model = model
+# Only what resource matching needs from each learning phase and search result
+PHASE_FIELDS = ("phase", "duration", "skills")
+SEARCH_RESULT_FIELDS = ("title", "url", "content")
+
+# Resource fields that pre-search metadata can fill in when the model leaves them out
+METADATA_FIELDS = ("provider", "duration", "cost", "level")
+INDEX_METADATA_FIELDS = ("provider", "kind", "cost", "duration", "level")
+
+class ResourceRecommendationAgent(BaseCareerAgent):
+    name = "resources_agent"
+    output_schema = ResourceRecommendations
+
+    def __init__(self, model: ChatOpenAI, cache: LLMResponseCache = None, search_cache=None,
+                 search_tool=None):
+        super().__init__(model, cache)
         
-        # Initialize web search tool
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        if not tavily_api_key:
-            print("⚠️ TAVILY_API_KEY not found, web search will be disabled")
-            self.search_tool = None
-        else:
-            self.search_tool = TavilySearch(
-                max_results=5,
-                search_depth="advanced",
-                include_answer=True,
-                include_raw_content=False
-            )
+        # The web search tool (an injected tool, e.g. the benchmark stub, wins over Tavily), its
+        # cached client and the tool-bound model are built on first use; see _ensure_search
+        self._search_tool = search_tool
+        self._search_cache = search_cache
+        self._search_client = None
+        self._model_with_tools = None
+        self._search_ready = False
+        self._search_lock = threading.Lock()
         
-        # Bind tools to the model only if search tool is available
-        if self.search_tool:
-            self.model_with_tools = model.bind_tools([self.search_tool])
-        else:
-            self.model_with_tools = model
+        # Tool calls run concurrently; a slow search times out on its own without
+        # holding back the results of the others
+        self.tool_timeout = float(os.getenv("RESOURCES_TOOL_TIMEOUT_SECONDS", "20"))
+        self._tool_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("RESOURCES_TOOL_WORKERS", "4")),
+            thread_name_prefix="resources-tools"
+        )
+        
+        # "presearch" runs the prepared queries directly and makes one formatting call;
+        # "agentic" lets the model choose its searches (one extra round-trip)
+        self.search_mode = os.getenv("RESOURCES_SEARCH_MODE", "presearch").lower()
+        self.presearch_limit = int(os.getenv("RESOURCES_PRESEARCH_RESULTS", "12"))
+        
+        # Local BM25 index of curated and previously searched resources (loaded on first use, see
+        # resource_index); "fill" only searches live for skills it doesn't cover (or covers with
+        # stale entries), "only" never does
+        self.index_mode = os.getenv("RESOURCE_INDEX", "fill").lower()
+        self.index_min_hits = int(os.getenv("RESOURCE_INDEX_MIN_HITS", "2"))
+        max_age_days = float(os.getenv("RESOURCE_INDEX_MAX_AGE_DAYS", "30"))
+        self.index_max_age = max_age_days * 24 * 3600 if max_age_days > 0 else None
         
         self.system_prompt = """You are a Resource Recommendation Agent, an expert curator of learning resources and career development materials with access to real-time web search.
 
@@ -70,68 +106,247 @@ Always respond in JSON format with clickable URLs:
     "free_resources": ["Resource Name - Description"]
 }"""
 
-    def _execute_tools(self, tool_calls):
-        """Execute tool calls and return results"""
-        tool_results = []
-        for tool_call in tool_calls:
+    def _ensure_search(self):
+        """Build the Tavily tool, its cached client and the tool-bound model once, on first use"""
+        if self._search_ready:
+            return
+        with self._search_lock:
+            if self._search_ready:
+                return
+            if self._search_tool is None:
+                self._search_tool = create_search_tool_from_env()
+            if self._search_tool is None:
+                print("⚠️ TAVILY_API_KEY not found, web search will be disabled")
+            # Searches go through the result cache; the raw tool is still what gets bound to the model
+            self._search_client = wrap_search_tool(self._search_tool, self._search_cache)
+            # Bind tools to the model only if search tool is available
+            self._model_with_tools = self.model.bind_tools([self._search_tool]) if self._search_tool else self.model
+            self._search_ready = True
+
+    @property
+    def search_tool(self):
+        self._ensure_search()
+        return self._search_tool
+
+    @property
+    def search_client(self):
+        self._ensure_search()
+        return self._search_client
+
+    @property
+    def model_with_tools(self):
+        self._ensure_search()
+        return self._model_with_tools
+
+    @property
+    def resource_index(self):
+        """The process-wide resource index (None when RESOURCE_INDEX=off), loaded on first use"""
+        return get_resource_index()
+
+    def _parse_tool_call(self, tool_call):
+        """Normalize the different tool call formats into (name, args, id)"""
+        tool_name = tool_call.get("name") or tool_call.get("function", {}).get("name")
+        tool_args = tool_call.get("args") or tool_call.get("function", {}).get("arguments", {})
+        tool_id = tool_call.get("id") or tool_call.get("tool_call_id")
+        
+        # Parse args if it's a string
+        if isinstance(tool_args, str):
+            tool_args = json.loads(tool_args)
+        return tool_name, tool_args, tool_id
+
+    def _is_search_call(self, tool_name):
+        # langchain_tavily names its tool "tavily_search"; keep the legacy community name too
+        if self.search_tool is None:
+            return False
+        return tool_name in (self.search_tool.name, "tavily_search_results_json")
+
+    def _unknown_tool_message(self, tool_name, tool_id):
+        # Handle unknown tool calls with a default response
+        return ToolMessage(
+            content=json.dumps({"error": f"Unknown tool: {tool_name}"}),
+            name=tool_name or "unknown_tool",
+            tool_call_id=tool_id
+        )
+
+    def _tool_error_message(self, tool_call, error):
+        # Handle any errors in tool execution
+        return ToolMessage(
+            content=json.dumps({"error": f"Tool execution failed: {str(error)}"}),
+            name=tool_call.get("name", "unknown_tool"),
+            tool_call_id=tool_call.get("id", "unknown_id")
+        )
+
+    def _run_concurrently(self, calls):
+        """Run zero-arg callables on the tool pool; returns results or exceptions in call order"""
+        # Copy the context so pool threads still report into this request's trace
+        futures = [self._tool_executor.submit(contextvars.copy_context().run, call) for call in calls]
+        deadline = time.monotonic() + self.tool_timeout
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeoutError:
+                # A running call can't be cancelled: it holds its pool thread until the search
+                # client's own timeout (see create_search_tool_from_env) ends it
+                if not future.cancel():
+                    record_abandoned("resources_tools", self.tool_timeout)
+                outcomes.append(TimeoutError(f"timed out after {self.tool_timeout:.0f}s"))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    async def _arun_concurrently(self, coroutines):
+        """Await coroutines together, each under the per-call timeout; results or exceptions in order"""
+        async def bounded(coroutine):
+            try:
+                return await asyncio.wait_for(coroutine, timeout=self.tool_timeout)
+            except asyncio.TimeoutError:
+                return TimeoutError(f"timed out after {self.tool_timeout:.0f}s")
+        return await asyncio.gather(*[bounded(c) for c in coroutines], return_exceptions=True)
+
+    def _tool_message(self, tool_call, outcome):
+        """Turn a search outcome into the ToolMessage answering this tool_call_id"""
+        if isinstance(outcome, Exception):
+            return self._tool_error_message(tool_call, outcome)
+        tool_name, _, tool_id = self._parse_tool_call(tool_call)
+        return ToolMessage(
+            content=self._compact_tool_result(outcome),
+            name=tool_name,
+            tool_call_id=tool_id
+        )
+
+    def _compact_tool_result(self, outcome):
+        """Drop Tavily bookkeeping (images, timings, raw content) before it reaches the prompt"""
+        if not isinstance(outcome, dict):
+            return json.dumps(outcome)
+        return compact_json({
+            "query": outcome.get("query"),
+            "answer": outcome.get("answer"),
+            "results": [select_fields(result, SEARCH_RESULT_FIELDS) for result in outcome.get("results", [])]
+        })
+
+    def _split_tool_calls(self, tool_calls):
+        """Separate search calls we can dispatch from calls that get an immediate reply"""
+        searches, replies = [], {}
+        for index, tool_call in enumerate(tool_calls):
             try:
-                # Handle different tool call formats
-                tool_name = tool_call.get("name") or tool_call.get("function", {}).get("name")
-                tool_args = tool_call.get("args") or tool_call.get("function", {}).get("arguments", {})
-                tool_id = tool_call.get("id") or tool_call.get("tool_call_id")
-                
-                if tool_name == "tavily_search_results_json" and self.search_tool:
-                    # Parse args if it's a string
-                    if isinstance(tool_args, str):
-                        tool_args = json.loads(tool_args)
-                    
-                    result = self.search_tool.invoke(tool_args)
-                    tool_results.append(
-                        ToolMessage(
-                            content=json.dumps(result),
-                            name=tool_name,
-                            tool_call_id=tool_id
-                        )
-                    )
+                tool_name, tool_args, tool_id = self._parse_tool_call(tool_call)
+                if self._is_search_call(tool_name):
+                    searches.append((index, tool_args))
                 else:
-                    # Handle unknown tool calls with a default response
-                    tool_results.append(
-                        ToolMessage(
-                            content=json.dumps({"error": f"Unknown tool: {tool_name}"}),
-                            name=tool_name or "unknown_tool",
-                            tool_call_id=tool_id
-                        )
-                    )
+                    replies[index] = self._unknown_tool_message(tool_name, tool_id)
             except Exception as e:
-                # Handle any errors in tool execution
-                tool_results.append(
-                    ToolMessage(
-                        content=json.dumps({"error": f"Tool execution failed: {str(e)}"}),
-                        name=tool_call.get("name", "unknown_tool"),
-                        tool_call_id=tool_call.get("id", "unknown_id")
-                    )
-                )
-        return tool_results
+                replies[index] = self._tool_error_message(tool_call, e)
+        return searches, replies
 
-    def __call__(self, state: CareerPlanningState) -> Command[Literal["__end__"]]:
+    def _execute_tools(self, tool_calls):
+        """Execute tool calls concurrently; (tool messages in the original order, search outcomes)"""
+        searches, replies = self._split_tool_calls(tool_calls)
+        outcomes = self._run_concurrently(
+            [lambda args=args: self.search_client.invoke(args) for _, args in searches]
+        )
+        for (index, _), outcome in zip(searches, outcomes):
+            replies[index] = self._tool_message(tool_calls[index], outcome)
+        return [replies[index] for index in range(len(tool_calls))], outcomes
+
+    async def _aexecute_tools(self, tool_calls):
+        """Async variant of _execute_tools using the search tool's ainvoke"""
+        searches, replies = self._split_tool_calls(tool_calls)
+        outcomes = await self._arun_concurrently(
+            [self.search_client.ainvoke(args) for _, args in searches]
+        )
+        for (index, _), outcome in zip(searches, outcomes):
+            replies[index] = self._tool_message(tool_calls[index], outcome)
+        return [replies[index] for index in range(len(tool_calls))], outcomes
+
+    def _role_search_queries(self, target_role):
+        """Queries that only depend on the target role, so they can run before skills are known"""
+        return [
+            f"best {target_role} courses 2024 online certification",
+            f"{target_role} certification programs professional development"
+        ]
+
+    def _search_queries(self, target_role, priority_skills):
+        """Build search queries for current resources"""
+        role_queries = self._role_search_queries(target_role)
+        return [
+            role_queries[0],
+            f"{' '.join(priority_skills[:3])} learning resources tutorials 2024",
+            role_queries[1]
+        ]
+
+    @staticmethod
+    def _slim_search_result(result):
+        """A search outcome cut down to what later nodes read, so the raw payload stays out of the state
+
+        Title, URL and a snippet (as "content", which merging and ranking read) plus the search
+        score ranking is based on.
+        """
+        results = result.get("results") if isinstance(result, dict) else None
+        return {"results": [
+            {**select_fields(r, ("title", "url", "score")), "content": (r.get("content") or "")[:300]}
+            for r in results or [] if isinstance(r, dict)
+        ]}
+
+    def _compact_search_results(self, prefetched):
+        """Keep only what the model needs from each pre-fetched search result"""
+        compact = []
+        for entry in prefetched:
+            result = entry.get("result") or {}
+            compact.append({
+                "query": entry.get("query"),
+                "results": [
+                    {**select_fields(r, SEARCH_RESULT_FIELDS), "content": (r.get("content") or "")[:300]}
+                    for r in result.get("results", [])
+                ]
+            })
+        return compact
+
+    def prefetch(self, state: CareerPlanningState) -> Command[Literal["learning_agent"]]:
+        """Run the role-level searches while the skills assessment is still in flight"""
+        target_role = state.get('target_role') or 'Not specified'
+        prefetched = []
+        if self.search_tool and self.index_mode != "only":
+            queries = self._role_search_queries(target_role)
+            results = self._run_concurrently(
+                [lambda query=query: self.search_client.invoke({"query": query}) for query in queries]
+            )
+            for query, result in zip(queries, results):
+                if isinstance(result, Exception):
+                    print(f"⚠️ Prefetch search failed for '{query}': {str(result)}")
+                else:
+                    prefetched.append({"query": query, "result": self._slim_search_result(result)})
+        return Command(goto="learning_agent", update={"prefetched_search_results": prefetched})
+
+    async def aprefetch(self, state: CareerPlanningState) -> Command[Literal["learning_agent"]]:
+        """Async variant of prefetch that issues the role-level searches concurrently"""
+        target_role = state.get('target_role') or 'Not specified'
+        prefetched = []
+        if self.search_tool and self.index_mode != "only":
+            queries = self._role_search_queries(target_role)
+            results = await self._arun_concurrently(
+                [self.search_client.ainvoke({"query": query}) for query in queries]
+            )
+            for query, result in zip(queries, results):
+                if isinstance(result, Exception):
+                    print(f"⚠️ Prefetch search failed for '{query}': {str(result)}")
+                else:
+                    prefetched.append({"query": query, "result": self._slim_search_result(result)})
+        return Command(goto="learning_agent", update={"prefetched_search_results": prefetched})
+
+    def _build_messages(self, state: CareerPlanningState):
+        """Build the resource search prompt from the skills assessment and learning path"""
         skills_info = state.get("skills_assessment") or {}
         learning_path = state.get("learning_path") or {}
         target_role = state.get('target_role') or 'Not specified'
         priority_skills = skills_info.get('priority_skills', [])
         
-        # Build search queries for current resources
-        search_queries = [
-            f"best {target_role} courses 2024 online certification",
-            f"{' '.join(priority_skills[:3])} learning resources tutorials 2024",
-            f"{target_role} certification programs professional development"
-        ]
+        search_queries = self._search_queries(target_role, priority_skills)
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""
+        prompt = f"""
 Target Role: {target_role}
 Skills to Develop: {priority_skills}
-Learning Phases: {learning_path.get('learning_phases', [])}
+Learning Phases: {compact_json([select_fields(phase, PHASE_FIELDS) for phase in learning_path.get('learning_phases', [])])}
 
 Please search for current, up-to-date learning resources for this career transition. 
 Focus on finding:
@@ -140,54 +355,162 @@ Focus on finding:
 3. Professional communities and networking opportunities
 
 Then provide specific, actionable resource recommendations with working URLs.
-""")
-        ]
-        
-        # First, get the model's response (may include tool calls)
-        try:
-            response = self.model_with_tools.invoke(messages)
-            messages.append(response)
-            print(f"🤖 Model response received. Has tool calls: {hasattr(response, 'tool_calls') and bool(response.tool_calls)}")
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                print(f"🔧 Tool calls: {[tc.get('name', 'unknown') for tc in response.tool_calls]}")
-        except Exception as e:
-            print(f"❌ Error in model invocation: {str(e)}")
-            raise
+"""
+        prefetched = state.get("prefetched_search_results")
+        if prefetched:
+            prompt += f"""
+PRE-FETCHED SEARCH RESULTS (already searched: {[entry['query'] for entry in prefetched]}):
+{compact_json(self._compact_search_results(prefetched))}
+
+Only search again for what these results don't cover, such as: {search_queries[1]}
+"""
         
-        # Execute any tool calls
-        if hasattr(response, 'tool_calls') and response.tool_calls:
-            print(f"🔍 Executing {len(response.tool_calls)} tool calls...")
-            tool_results = self._execute_tools(response.tool_calls)
-            messages.extend(tool_results)
-            
-            # Get final response with search results - use the model WITHOUT tools to avoid recursion
-            final_response = self.model.invoke(messages + [
-                HumanMessage(content="Based on the search results above, provide the resource recommendations in the required JSON format with real, working URLs. Do not make any more tool calls.")
-            ])
+        return [
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=prompt)
+        ]
+
+    def _local_resources(self, priority_skills):
+        """Index matches per priority skill as a search outcome, plus the skills it doesn't cover"""
+        best, gaps = {}, []
+        for skill in priority_skills[:5]:
+            matches = self.resource_index.search(skill, limit=3)
+            fresh = [doc for _, doc in matches if self.resource_index.is_fresh(doc, self.index_max_age)]
+            if len(fresh) < self.index_min_hits:
+                gaps.append(skill)
+            # Scores relative to each skill's best match, so every skill contributes its top resources
+            for score, doc in matches:
+                relative = score / matches[0][0]
+                if relative > best.get(doc["url"], (0.0, None))[0]:
+                    best[doc["url"]] = (relative, doc)
+        if not best:
+            return None, gaps
+        return {
+            "query": "local resource index",
+            "results": [
+                {
+                    "title": doc["title"],
+                    "url": doc["url"],
+                    "content": doc.get("description") or f"{doc.get('kind', 'resource')} covering {', '.join(doc.get('skills') or [])}",
+                    "score": round(score, 3),
+                    "metadata": {field: doc[field] for field in INDEX_METADATA_FIELDS if doc.get(field)}
+                }
+                for score, doc in best.values()
+            ]
+        }, gaps
+
+    def _presearch_plan(self, state: CareerPlanningState):
+        """(live queries, local index outcome): the index answers what it covers, live search the rest
+
+        Queries the parallel-mode prefetch already ran are skipped.
+        """
+        target_role = state.get('target_role') or 'Not specified'
+        priority_skills = (state.get("skills_assessment") or {}).get('priority_skills', [])
+        done = {entry["query"] for entry in state.get("prefetched_search_results") or []}
+        local = None
+        if self.resource_index is None:
+            queries = self._search_queries(target_role, priority_skills)
         else:
-            print("ℹ️ No tool calls made, using direct response")
-            final_response = response
-        
-        try:
-            # Try to parse JSON from response
-            if hasattr(final_response, 'content'):
-                content = final_response.content
+            local, gaps = self._local_resources(priority_skills)
+            if not self.search_tool or self.index_mode == "only":
+                queries = []
+            elif local is None:
+                # Nothing indexed for this transition yet
+                queries = self._search_queries(target_role, priority_skills)
+            else:
+                queries = [f"{skill} course tutorial" for skill in gaps[:3]]
+            print(f"📚 Resource index: {len(local['results']) if local else 0} matches, live search for {gaps or 'nothing'}")
+        return [query for query in queries if query not in done], local
+
+    def _candidates(self, state: CareerPlanningState, queries, outcomes, local=None):
+        """Dedupe and rank every search result by URL, with metadata read from the result itself"""
+        live = []
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"⚠️ Search failed for '{query}': {str(outcome)}")
             else:
-                content = str(final_response)
-                
-            # Extract JSON if it's wrapped in markdown
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                content = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                content = content[json_start:json_end].strip()
-                
-            resources_data = json.loads(content)
-        except:
+                live.append(outcome)
+        priority_skills = (state.get("skills_assessment") or {}).get('priority_skills', [])
+        if self.resource_index is not None:
+            # Live results are indexed right away, so the next request for these skills stays local
+            for outcome in live:
+                self.resource_index.add_search_results(outcome, priority_skills)
+        prefetched = [entry.get("result") for entry in state.get("prefetched_search_results") or []]
+        results = merge_search_results(prefetched + ([local] if local else []) + live)
+        ranked = rank_results(results, priority_skills, self.presearch_limit)
+        print(f"🔎 {len(results)} unique results from {len(queries) + len(prefetched)} searches, keeping {len(ranked)}")
+        return [
+            {"title": r.get("title"), "url": r.get("url"), "snippet": (r.get("content") or "")[:300],
+             **extract_metadata(r), **(r.get("metadata") or {})}
+            for r in ranked
+        ]
+
+    def _presearch_messages(self, state: CareerPlanningState, candidates):
+        """One formatting prompt over the ranked search results; no tools are bound"""
+        learning_path = state.get("learning_path") or {}
+        target_role = state.get('target_role') or 'Not specified'
+        priority_skills = (state.get("skills_assessment") or {}).get('priority_skills', [])
+        prompt = f"""
+Target Role: {target_role}
+Skills to Develop: {priority_skills}
+Learning Phases: {compact_json([select_fields(phase, PHASE_FIELDS) for phase in learning_path.get('learning_phases', [])])}
+
+SEARCH RESULTS (already searched and ranked, best first; provider, kind, cost, duration and level were read from each result where available):
+{compact_json(candidates)}
+
+Provide resource recommendations for this career transition from these results, using their exact URLs.
+Keep the given metadata and only fill in what is missing when the snippet supports it.
+Books and communities may come from your own knowledge when the results don't cover them.
+"""
+        return [
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=prompt)
+        ]
+
+    def _fill_metadata(self, resources_data, candidates):
+        """Fill fields the model left empty from the metadata extracted for the same URL"""
+        by_url = {normalize_url(candidate["url"]): candidate for candidate in candidates}
+        for section in ("courses", "certifications"):
+            for item in resources_data.get(section) or []:
+                if not isinstance(item, dict) or not item.get("url"):
+                    continue
+                candidate = by_url.get(normalize_url(item["url"]))
+                if candidate is None:
+                    continue
+                for field in METADATA_FIELDS:
+                    if not item.get(field) and candidate.get(field):
+                        item[field] = candidate[field]
+
+    def _log_response(self, response):
+        print(f"🤖 Model response received. Has tool calls: {hasattr(response, 'tool_calls') and bool(response.tool_calls)}")
+        if hasattr(response, 'tool_calls') and response.tool_calls:
+            print(f"🔧 Tool calls: {[tc.get('name', 'unknown') for tc in response.tool_calls]}")
+
+    def _final_prompt(self, messages, tool_results):
+        # Get final response with search results - use the model WITHOUT tools to avoid recursion
+        return messages + tool_results + [
+            HumanMessage(content="Based on the search results above, provide the resource recommendations in the required JSON format with real, working URLs. Do not make any more tool calls.")
+        ]
+
+    def _web_results(self, state: CareerPlanningState, outcomes=()):
+        """Normalized URLs of this turn's web search results, prefetched or live; failed searches add none"""
+        prefetched = [entry.get("result") for entry in state.get("prefetched_search_results") or []]
+        return {normalize_url(r["url"]) for r in merge_search_results(prefetched + list(outcomes))}
+
+    def _process(self, state: CareerPlanningState, final_response, candidates=None, web_results: int = 0) -> Command:
+        """Parse the final resource recommendations and end the workflow
+
+        web_results is how many web search results the reply was built from; without any (index
+        only, no Tavily, or every search failed) the plan doesn't claim real-time results.
+        """
+        try:
+            # Handles bare JSON as well as JSON wrapped in a markdown fence
+            resources_data = self._parse_json(final_response)
+            if candidates:
+                self._fill_metadata(resources_data, candidates)
+        except ValueError:
             # Fallback with realistic resources
+            web_results = 0
             resources_data = {
                 "courses": [
                     {
@@ -237,13 +560,92 @@ Then provide specific, actionable resource recommendations with working URLs.
             }
         
         # Add search metadata to resources
-        resources_data["search_enabled"] = True
-        resources_data["last_updated"] = "Real-time web search results"
+        resources_data["search_enabled"] = web_results > 0
+        if web_results:
+            resources_data["last_updated"] = "Real-time web search results"
+        else:
+            resources_data["last_updated"] = "Local resource index" if candidates else "No web search results"
+        resources_data["search_mode"] = "presearch" if candidates is not None else "agentic"
         
         return Command(
             goto="__end__",
             update={
                 "resources": resources_data,
-                "messages": state['messages'] + [final_response]
+                # Consumed above; don't carry the search results in the state any further
+                "prefetched_search_results": None,
+                **self._reply_update(final_response, "resources")
             }
-        ) 
+        )
+
+    def _presearch(self, state: CareerPlanningState) -> Command[Literal["__end__"]]:
+        """Search with the prepared queries concurrently, then format with a single LLM call"""
+        queries, local = self._presearch_plan(state)
+        outcomes = self._run_concurrently(
+            [lambda query=query: self.search_client.invoke({"query": query}) for query in queries]
+        )
+        candidates = self._candidates(state, queries, outcomes, local)
+        final_response = self._invoke_model(self._presearch_messages(state, candidates))
+        web = self._web_results(state, outcomes)
+        return self._process(state, final_response, candidates, sum(normalize_url(c["url"]) in web for c in candidates))
+
+    async def _apresearch(self, state: CareerPlanningState) -> Command[Literal["__end__"]]:
+        queries, local = self._presearch_plan(state)
+        outcomes = await self._arun_concurrently(
+            [self.search_client.ainvoke({"query": query}) for query in queries]
+        )
+        candidates = self._candidates(state, queries, outcomes, local)
+        final_response = await self._ainvoke_model(self._presearch_messages(state, candidates))
+        web = self._web_results(state, outcomes)
+        return self._process(state, final_response, candidates, sum(normalize_url(c["url"]) in web for c in candidates))
+
+    def _uses_presearch(self) -> bool:
+        return self.search_mode == "presearch" and (self.search_tool is not None or self.resource_index is not None)
+
+    def __call__(self, state: CareerPlanningState) -> Command[Literal["__end__"]]:
+        if self._uses_presearch():
+            return self._presearch(state)
+        messages = self._build_messages(state)
+        
+        # First, get the model's response (may include tool calls); without search
+        # this is already the final answer, so it can take the structured path
+        try:
+            response = self._invoke_model(messages, model=self.model_with_tools if self.search_tool else None)
+            messages.append(response)
+            self._log_response(response)
+        except Exception as e:
+            print(f"❌ Error in model invocation: {str(e)}")
+            raise
+        
+        # Execute any tool calls
+        if hasattr(response, 'tool_calls') and response.tool_calls:
+            print(f"🔍 Executing {len(response.tool_calls)} tool calls...")
+            tool_results, outcomes = self._execute_tools(response.tool_calls)
+            final_response = self._invoke_model(self._final_prompt(messages, tool_results))
+        else:
+            print("ℹ️ No tool calls made, using direct response")
+            final_response, outcomes = response, []
+        
+        return self._process(state, final_response, web_results=len(self._web_results(state, outcomes)))
+
+    async def acall(self, state: CareerPlanningState) -> Command[Literal["__end__"]]:
+        if self._uses_presearch():
+            return await self._apresearch(state)
+        messages = self._build_messages(state)
+        
+        try:
+            response = await self._ainvoke_model(messages, model=self.model_with_tools if self.search_tool else None)
+            messages.append(response)
+            self._log_response(response)
+        except Exception as e:
+            print(f"❌ Error in model invocation: {str(e)}")
+            raise
+        
+        if hasattr(response, 'tool_calls') and response.tool_calls:
+            print(f"🔍 Executing {len(response.tool_calls)} tool calls...")
+            tool_results, outcomes = await self._aexecute_tools(response.tool_calls)
+            final_response = await self._ainvoke_model(self._final_prompt(messages, tool_results))
+        else:
+            print("ℹ️ No tool calls made, using direct response")
+            final_response, outcomes = response, []
+        
+        return self._process(state, final_response, web_results=len(self._web_results(state, outcomes)))
@@ -0,0 +1,74 @@
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict
+
+# Stems that signal each agent, with a weight for how strongly they point there.
+# Matching is by prefix, so "certif" covers certification/certificate/certified.
+ROUTING_LEXICON = {
+    "skills_agent": {
+        "skill": 1.0, "gap": 1.0, "abilit": 0.8, "competenc": 1.0, "strength": 0.8,
+        "weakness": 0.8, "proficien": 0.8, "learn": 0.4, "know": 0.3
+    },
+    "industry_agent": {
+        "industry": 1.0, "market": 1.0, "salar": 1.2, "demand": 1.0, "pay": 0.8,
+        "compan": 0.8, "hiring": 1.0, "trend": 0.8, "outlook": 1.0, "compensation": 1.2
+    },
+    "learning_agent": {
+        "timeline": 1.2, "phase": 1.0, "roadmap": 1.0, "path": 0.6, "step": 0.6,
+        "month": 0.8, "week": 0.6, "faster": 0.8, "schedule": 1.0, "milestone": 1.0, "plan": 0.4
+    },
+    "resources_agent": {
+        "course": 1.2, "resource": 1.0, "book": 1.0, "certif": 1.0, "tutorial": 1.0,
+        "bootcamp": 1.0, "platform": 0.8, "communit": 0.8, "video": 0.8, "link": 0.6
+    },
+}
+
+@dataclass
+class RoutingDecision:
+    agent: str
+    confidence: float
+    source: str
+    scores: Dict[str, float] = field(default_factory=dict)
+
+class KeywordRouter:
+    """Deterministic TF-IDF style scorer that handles clear-cut routing without the LLM"""
+
+    def __init__(self, lexicon: Dict[str, Dict[str, float]] = None, prior: float = 0.5,
+                 default_agent: str = "skills_agent"):
+        self.lexicon = lexicon or ROUTING_LEXICON
+        self.prior = prior
+        self.default_agent = default_agent
+        # Stems shared by several agents carry less signal
+        agent_count = len(self.lexicon)
+        document_frequency = {}
+        for stems in self.lexicon.values():
+            for stem in stems:
+                document_frequency[stem] = document_frequency.get(stem, 0) + 1
+        self.idf = {stem: math.log(1 + agent_count / df) / math.log(1 + agent_count) for stem, df in document_frequency.items()}
+
+    def score(self, message: str) -> Dict[str, float]:
+        tokens = re.findall(r"[a-z]+", (message or "").lower())
+        scores = {}
+        for agent, stems in self.lexicon.items():
+            total = 0.0
+            for stem, weight in stems.items():
+                hits = sum(1 for token in tokens if token.startswith(stem))
+                if hits:
+                    # Sublinear term frequency so repeating a word doesn't dominate
+                    total += weight * self.idf[stem] * (1 + math.log(hits))
+            scores[agent] = round(total, 3)
+        return scores
+
+    def classify(self, message: str, is_follow_up: bool = False) -> RoutingDecision:
+        """Pick an agent and report how sure we are (0-1)"""
+        if not is_follow_up:
+            # A new plan always starts the full pipeline at the skills agent
+            return RoutingDecision(self.default_agent, 1.0, "rules:new_plan")
+        scores = self.score(message)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_agent, best_score = ranked[0]
+        if best_score == 0:
+            return RoutingDecision(self.default_agent, 0.0, "rules:no_match", scores)
+        confidence = best_score / (sum(scores.values()) + self.prior)
+        return RoutingDecision(best_agent, round(confidence, 3), "rules", scores)
@@ -1,14 +1,22 @@
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langgraph.types import Command
 from typing import Literal
 import json
+import os
 
+from .base import BaseCareerAgent
 from ..models.state import CareerPlanningState
+from ..models.agent_outputs import SkillsAssessment
+from ..services.llm_cache import LLMResponseCache
+from ..services.skills_taxonomy import get_skills_taxonomy, mentioned_skills
 
-class SkillsAssessmentAgent:
-    def __init__(self, model: ChatOpenAI):
-        self.model = model
+class SkillsAssessmentAgent(BaseCareerAgent):
+    name = "skills_agent"
+    output_schema = SkillsAssessment
+
+    def __init__(self, model: ChatOpenAI, cache: LLMResponseCache = None):
+        super().__init__(model, cache)
         self.system_prompt = """You are a Skills Assessment Agent, an expert career mentor specializing in skill gap analysis.
 
 Your role:
@@ -25,24 +33,103 @@ Always respond in JSON format with:
     "strengths": ["list of transferable skills"],
     "priority_skills": ["top 3-5 skills to focus on first"]
 }"""
+        
+        # "personalize": known target roles get their gaps from the local taxonomy and the LLM
+        # only adjusts them to the user's background, "deterministic" never calls the LLM for
+        # known roles, "off" always runs the full LLM assessment
+        self.taxonomy_mode = os.getenv("SKILLS_TAXONOMY", "personalize").lower()
+        self.personalize_prompt = """You personalize a skills gap analysis computed for a career transition.
+
+Using only what the user says about themselves, respond in JSON format with:
+{
+    "already_has": ["skills from the gap list the user says they already have"],
+    "priority_skills": ["3-5 skills from the gap list to focus on first, given the user's background"]
+}
+Only use skill names exactly as they appear in the gap list."""
 
-    def __call__(self, state: CareerPlanningState) -> Command[Literal["industry_agent", "__end__"]]:
-        messages = [
+    def _build_messages(self, state: CareerPlanningState):
+        """Build the skills gap prompt from the roles and the user's query"""
+        user_message = self._user_message(state)
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=f"""
 Current Role: {state.get('current_role') or 'Not specified'}
 Target Role: {state.get('target_role') or 'Not specified'}
-User Query: {state['messages'][-1].content if state.get('messages') else 'No query'}
+User Query: {user_message or 'No query'}
 
 Please assess the skills gap between current and target roles.
 """)
         ]
-        
-        response = self.model.invoke(messages)
-        
+
+    def _baseline(self, state: CareerPlanningState):
+        """Taxonomy assessment when the target role is known, else None"""
+        if self.taxonomy_mode == "off":
+            return None
+        taxonomy = get_skills_taxonomy()
+        if not taxonomy.knows(state.get("target_role_id")):
+            return None
+        return taxonomy.assess(state.get("current_role_id"), state["target_role_id"])
+
+    def _needs_personalization(self, state: CareerPlanningState, baseline) -> bool:
+        """Ask the LLM only when the user's own background could change the gaps"""
+        if self.taxonomy_mode != "personalize":
+            return False
+        if not get_skills_taxonomy().knows(state.get("current_role_id")):
+            return True
+        return bool(mentioned_skills(self._user_message(state), baseline["skill_gaps"]))
+
+    def _personalize_messages(self, state: CareerPlanningState, baseline):
+        return [
+            SystemMessage(content=self.personalize_prompt),
+            HumanMessage(content=f"""
+Current Role: {state.get('current_role') or 'Not specified'}
+Target Role: {state.get('target_role')}
+User Query: {self._user_message(state) or 'No query'}
+Skill Gaps: {json.dumps(baseline['skill_gaps'])}
+""")
+        ]
+
+    def _personalized(self, baseline, response):
+        """Apply the LLM's adjustments, accepting only skills from the baseline gap list"""
         try:
-            skills_data = json.loads(response.content)
-        except:
+            adjustments = self._parse_json(response)
+        except ValueError:
+            return {**baseline, "source": "taxonomy"}
+        gaps = {skill.lower(): skill for skill in baseline["skill_gaps"]}
+        already_has = [gaps[s.lower()] for s in adjustments.get("already_has") or [] if isinstance(s, str) and s.lower() in gaps]
+        remaining = [skill for skill in baseline["skill_gaps"] if skill not in already_has]
+        priority = [gaps[s.lower()] for s in adjustments.get("priority_skills") or []
+                    if isinstance(s, str) and s.lower() in gaps and gaps[s.lower()] in remaining]
+        return {
+            **baseline,
+            "current_skills": baseline["current_skills"] + [s for s in already_has if s not in baseline["current_skills"]],
+            "skill_gaps": remaining,
+            "strengths": already_has + baseline["strengths"],
+            "priority_skills": priority or remaining[:4],
+            "source": "taxonomy+llm"
+        }
+
+    def _handoff(self, state: CareerPlanningState, skills_data, response) -> Command:
+        # In parallel mode the industry agent is already running alongside us
+        return Command(
+            goto=self._next_agent(state, "learning_agent" if self._is_parallel(state) else "industry_agent"),
+            update={
+                "skills_assessment": skills_data,
+                **self._reply_update(response, "skills_assessment")
+            }
+        )
+
+    def _from_taxonomy(self, baseline):
+        """The assessment and a stand-in reply message, without calling the LLM"""
+        skills_data = {**baseline, "source": "taxonomy"}
+        print(f"📐 Skills gaps from taxonomy: {skills_data['priority_skills']}")
+        return skills_data, AIMessage(content=json.dumps(skills_data), name=self.name)
+
+    def _process(self, state: CareerPlanningState, response) -> Command:
+        """Parse the skills assessment and hand off to the next agent"""
+        try:
+            skills_data = self._parse_json(response)
+        except ValueError:
             # Fallback if JSON parsing fails
             skills_data = {
                 "current_skills": ["Basic programming", "Communication"],
@@ -51,11 +138,25 @@ Please assess the skills gap between current and target roles.
                 "strengths": ["Communication", "Problem solving"],
                 "priority_skills": ["Leadership", "Data analysis", "Project management"]
             }
-        
-        return Command(
-            goto="industry_agent",
-            update={
-                "skills_assessment": skills_data,
-                "messages": state['messages'] + [response]
-            }
-        ) 
\ No newline at end of file
+        return self._handoff(state, skills_data, response)
+
+    def __call__(self, state: CareerPlanningState) -> Command[Literal["industry_agent", "learning_agent", "__end__"]]:
+        baseline = self._baseline(state)
+        if baseline is None:
+            response = self._invoke_model(self._build_messages(state))
+            return self._process(state, response)
+        if not self._needs_personalization(state, baseline):
+            return self._handoff(state, *self._from_taxonomy(baseline))
+        # The plain model, not the structured path: this reply is an adjustment, not a full assessment
+        response = self._invoke_model(self._personalize_messages(state, baseline), model=self.model)
+        return self._handoff(state, self._personalized(baseline, response), response)
+
+    async def acall(self, state: CareerPlanningState) -> Command[Literal["industry_agent", "learning_agent", "__end__"]]:
+        baseline = self._baseline(state)
+        if baseline is None:
+            response = await self._ainvoke_model(self._build_messages(state))
+            return self._process(state, response)
+        if not self._needs_personalization(state, baseline):
+            return self._handoff(state, *self._from_taxonomy(baseline))
+        response = await self._ainvoke_model(self._personalize_messages(state, baseline), model=self.model)
+        return self._handoff(state, self._personalized(baseline, response), response)
@@ -3,12 +3,34 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.types import Command
 from typing import Literal
 import json
+import os
 
+from .base import BaseCareerAgent
+from .router import KeywordRouter, RoutingDecision
 from ..models.state import CareerPlanningState
+from ..services.llm_cache import LLMResponseCache
 
-class CareerSupervisorAgent:
-    def __init__(self, model: ChatOpenAI):
-        self.model = model
+# Agents that become stale on a follow-up, by the agent the request is routed to first
+# (mirrors the decision logic in the system prompt)
+FOLLOW_UP_PLANS = {
+    "skills_agent": ["skills_agent", "learning_agent", "resources_agent"],
+    "industry_agent": ["industry_agent", "learning_agent", "resources_agent"],
+    "learning_agent": ["learning_agent", "resources_agent"],
+    "resources_agent": ["resources_agent"],
+}
+
+class CareerSupervisorAgent(BaseCareerAgent):
+    name = "supervisor"
+
+    def __init__(self, model: ChatOpenAI, cache: LLMResponseCache = None, router_mode: str = None,
+                 router_threshold: float = None):
+        super().__init__(model, cache)
+        
+        # "hybrid" answers confident cases locally and asks the LLM otherwise,
+        # "rules" never calls the LLM, "llm" always does (the original behaviour)
+        self.router = KeywordRouter()
+        self.router_mode = router_mode or os.getenv("SUPERVISOR_ROUTER", "hybrid")
+        self.router_threshold = router_threshold if router_threshold is not None else float(os.getenv("SUPERVISOR_ROUTER_THRESHOLD", "0.6"))
         self.system_prompt = """You are the Career Supervisor Agent, the orchestrator of a multi-agent career planning system.
 
 Your role:
@@ -32,14 +54,15 @@ Agent Decision Logic:
 Always respond with the agent name to route to first: skills_agent, industry_agent, learning_agent, or resources_agent.
 Consider the context and be efficient - don't re-run agents unless their output needs updating."""
 
-    def __call__(self, state: CareerPlanningState) -> Command[Literal["skills_agent", "industry_agent", "learning_agent", "resources_agent"]]:
-        current_message = state["messages"][-1].content.lower()
+    def _build_messages(self, state: CareerPlanningState):
+        """Build the routing prompt for the current request"""
+        current_message = self._user_message(state).lower()
         is_follow_up = state.get("is_follow_up", False)
         has_existing_path = bool(state.get("existing_learning_path"))
         conversation_history = state.get("conversation_history", [])
         
         # Analyze the user's request
-        messages = [
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=f"""
 CONTEXT:
@@ -57,29 +80,65 @@ Based on this context, which agent should handle this request first?
 Respond with ONLY the agent name: skills_agent, industry_agent, learning_agent, or resources_agent
 """)
         ]
-        
-        response = self.model.invoke(messages)
+
+    def _classify(self, state: CareerPlanningState) -> RoutingDecision:
+        return self.router.classify(self._user_message(state), bool(state.get("is_follow_up")))
+
+    def _use_rules(self, decision: RoutingDecision) -> bool:
+        if self.router_mode == "rules":
+            return True
+        return self.router_mode == "hybrid" and decision.confidence >= self.router_threshold
+
+    def _route(self, state: CareerPlanningState, response, decision: RoutingDecision) -> Command:
+        """Validate the model's routing decision and fall back to keyword scoring"""
         next_agent = response.content.strip().lower()
         
         # Validate and default
         valid_agents = ["skills_agent", "industry_agent", "learning_agent", "resources_agent"]
-        if next_agent not in valid_agents:
-            # Default logic based on keywords
-            if any(word in current_message for word in ["skill", "gap", "learn", "ability"]):
-                next_agent = "skills_agent"
-            elif any(word in current_message for word in ["industry", "market", "salary", "demand"]):
-                next_agent = "industry_agent"
-            elif any(word in current_message for word in ["timeline", "phase", "roadmap", "path", "step"]):
-                next_agent = "learning_agent"
-            elif any(word in current_message for word in ["course", "resource", "book", "certification"]):
-                next_agent = "resources_agent"
-            else:
-                next_agent = "skills_agent"  # Default start
+        if next_agent in valid_agents:
+            return self._command(state, RoutingDecision(next_agent, decision.confidence, "llm", decision.scores))
+        return self._command(state, decision)
+
+    def _command(self, state: CareerPlanningState, decision: RoutingDecision) -> Command:
+        next_agent = decision.agent
+        print(f"🧭 Routing to {next_agent} via {decision.source} "
+              f"(confidence={decision.confidence:.2f}, threshold={self.router_threshold}, scores={decision.scores})")
+        
+        update = {"next_agent": next_agent}
+        goto = next_agent
+        if self._is_incremental(state):
+            # Earlier outputs are already in the state: only re-run what this request makes stale
+            update["agents_to_run"] = FOLLOW_UP_PLANS[next_agent]
+            print(f"♻️ Incremental follow-up, re-running: {update['agents_to_run']}")
+        elif next_agent == "skills_agent" and self._is_parallel(state):
+            # In parallel mode a full pipeline fans out: industry research and the role-level
+            # resource searches don't need the skills assessment, so they run alongside it
+            # and all three join at the learning agent
+            goto = ["skills_agent", "industry_agent", "resources_prefetch"]
         
         return Command(
-            goto=next_agent,
-            update={"next_agent": next_agent}
+            goto=goto,
+            update=update
         )
+
+    def _is_incremental(self, state: CareerPlanningState) -> bool:
+        """A follow-up that was seeded with the previous plan's agent outputs"""
+        has_outputs = all(state.get(field) for field in ("skills_assessment", "industry_insights", "learning_path"))
+        return bool(state.get("is_follow_up")) and has_outputs
+
+    def __call__(self, state: CareerPlanningState) -> Command[Literal["skills_agent", "industry_agent", "learning_agent", "resources_agent"]]:
+        decision = self._classify(state)
+        if self._use_rules(decision):
+            return self._command(state, decision)
+        response = self._invoke_model(self._build_messages(state))
+        return self._route(state, response, decision)
+
+    async def acall(self, state: CareerPlanningState) -> Command[Literal["skills_agent", "industry_agent", "learning_agent", "resources_agent"]]:
+        decision = self._classify(state)
+        if self._use_rules(decision):
+            return self._command(state, decision)
+        response = await self._ainvoke_model(self._build_messages(state))
+        return self._route(state, response, decision)
     
     def _summarize_existing_plan(self, learning_path):
         """Create a brief summary of the existing learning path"""
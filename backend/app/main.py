@@ -2,14 +2,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import os
-import json # Added for JSON parsing
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Import OpenAI Agents SDK components
-from agents import Agent, Runner
+from agents import Agent, Runner, set_default_openai_client
+from openai import AsyncOpenAI
 import asyncio # Runner.run is often async
 
+from .sessions import create_session_store_from_env
+from ..services.context_budget import compact_history
+from ..services.http_clients import get_http_clients
+from ..services.llm_scheduler import get_llm_scheduler
+from ..services.structured_output import extract_json
+from ..services.telemetry import record_parse_failure
+
 # Load environment variables
 project_root = Path(__file__).resolve().parent.parent.parent
 dotenv_path = project_root / ".env"
@@ -90,6 +97,15 @@ When the user expresses negative emotions or doubts:
 
 Maintain a conversational, friendly tone while being professional and direct."""
 
+# Runner.run calls go through the shared keep-alive pool instead of the SDK's own client
+# (retries are left to the LLM scheduler when it is enabled)
+llm_scheduler = get_llm_scheduler()
+if os.getenv("OPENAI_API_KEY"):
+    set_default_openai_client(AsyncOpenAI(
+        http_client=get_http_clients().async_client(),
+        max_retries=0 if llm_scheduler else 2
+    ))
+
 # Initialize the Career Path Agent
 # The openai-agents SDK will use the OPENAI_API_KEY environment variable by default.
 # You might specify a model using model_config if needed, e.g., model_config={"model": "gpt-4o"}
@@ -98,8 +114,8 @@ career_path_agent = Agent(
     instructions=INITIAL_PROMPT
 )
 
-# In-memory session store for conversation history
-user_sessions = {} 
+# Bounded session store for conversation history (turn/token caps, idle TTL, LRU under a memory budget)
+session_store = create_session_store_from_env()
 
 class ChatMessage(BaseModel):
     message: str
@@ -113,20 +129,29 @@ async def get_agent_response(session_id: str, user_message: str):
     if not os.getenv("OPENAI_API_KEY"):
         return {"error": "OPENAI_API_KEY not found or not configured on the server."}
 
-    # Retrieve or initialize conversation history from user_sessions
+    # Retrieve or initialize conversation history from the session store
     # History for the agent should be a list of message dicts: {"role": "user/assistant", "content": "..."}
     # The system prompt is handled by the agent's instructions.
-    history = user_sessions.get(session_id, [])
+    # The store already trims it to the configured turn and token caps.
+    history = session_store.get_history(session_id)
     
-    # Construct messages for the agent run: history + current user message
-    messages_for_agent_run = history + [{"role": "user", "content": user_message}]
+    # Construct messages for the agent run: history (older turns summarized to fit the budget) + current user message
+    history_budget = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000"))
+    messages_for_agent_run = compact_history(history, history_budget) + [{"role": "user", "content": user_message}]
 
     try:
         # Use the Runner to execute the agent
         # The agent is passed as the first positional argument.
         # The input_data (messages) is passed as the second positional argument.
         # The agent's 'instructions' will serve as the system message.
-        agent_result = await Runner.run(career_path_agent, messages_for_agent_run)
+        if llm_scheduler:
+            agent_result = await llm_scheduler.arun(
+                lambda: Runner.run(career_path_agent, messages_for_agent_run),
+                messages_for_agent_run,
+                component=career_path_agent.name
+            )
+        else:
+            agent_result = await Runner.run(career_path_agent, messages_for_agent_run)
         full_response_text = agent_result.final_output
 
         if not isinstance(full_response_text, str):
@@ -134,37 +159,26 @@ async def get_agent_response(session_id: str, user_message: str):
             print(f"Unexpected agent output type: {type(full_response_text)}. Output: {full_response_text}")
             full_response_text = str(full_response_text) # Try to cast
 
-        # Update history in user_sessions
-        updated_history = history + [
-            {"role": "user", "content": user_message},
-            {"role": "assistant", "content": full_response_text} # Store the raw response
-        ]
-        user_sessions[session_id] = updated_history
+        # Update history in the session store
+        session_store.append_turn(session_id, user_message, full_response_text) # Store the raw response
 
         # Extract roadmap JSON (same logic as before)
         roadmap_json = None
         reply_text_for_user = full_response_text # Default to full text
 
         if "ROADMAP_DATA:" in full_response_text:
-            try:
-                parts = full_response_text.split("ROADMAP_DATA:", 1)
-                reply_text_for_user = parts[0].strip() # Text before ROADMAP_DATA
-                json_str_part = parts[1].strip()
-                
-                json_start = json_str_part.find('{')
-                json_end = json_str_part.rfind('}') + 1
-                if json_start != -1 and json_end > json_start:
-                    actual_json_str = json_str_part[json_start:json_end]
-                    roadmap_json = json.loads(actual_json_str)
-                else: # Malformed JSON signal or no JSON braces
-                    print(f"Could not find valid JSON structure in: {json_str_part}")
-                    # Keep reply_text_for_user as the part before ROADMAP_DATA, roadmap_json remains None
-            except json.JSONDecodeError as e:
-                print(f"JSONDecodeError: {e} - JSON part: {json_str_part}")
-                # Error in parsing, reply_text_for_user is already set, roadmap_json remains None
-            except Exception as e:
-                print(f"Error during JSON extraction: {e}")
-                # Fallback, roadmap_json remains None
+            parts = full_response_text.split("ROADMAP_DATA:", 1)
+            reply_text_for_user = parts[0].strip() # Text before ROADMAP_DATA
+            json_str_part = parts[1].strip()
+            
+            # raw_decode stops at the end of the object, so braces in any text after it don't matter
+            roadmap_json, trailing_text = extract_json(json_str_part)
+            if roadmap_json is None:
+                record_parse_failure(career_path_agent.name, "fallback")
+                print(f"Could not decode roadmap JSON in: {json_str_part}")
+                # Keep reply_text_for_user as the part before ROADMAP_DATA, roadmap_json remains None
+            elif trailing_text:
+                reply_text_for_user = f"{reply_text_for_user}\n\n{trailing_text}".strip()
 
         return {"reply": reply_text_for_user, "roadmap_data": roadmap_json}
 
@@ -185,9 +199,22 @@ async def chat_endpoint(chat_message: ChatMessage):
         
     return ChatResponse(reply=response_data["reply"], roadmap_data=response_data.get("roadmap_data"))
 
+@app.delete("/chat/{session_id}")
+async def end_session(session_id: str):
+    session_store.delete(session_id)
+    return {"deleted": session_id}
+
 @app.get("/")
 async def root():
-    return {"message": "CareerPath.AI Backend with OpenAI Agents is running!"}
+    return {
+        "message": "CareerPath.AI Backend with OpenAI Agents is running!",
+        "sessions": session_store.stats(),
+        "http_pool": get_http_clients().stats()
+    }
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await get_http_clients().aclose()
 
 # Example for running with uvicorn (optional, usually run from terminal)
 # if __name__ == "__main__":
@@ -0,0 +1,189 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from ..services.context_budget import count_tokens
+
+def _history_size(history) -> int:
+    return sum(len(message.get("content") or "") for message in history)
+
+class SessionLimits:
+    """Per-session and global caps shared by every session store backend"""
+
+    def __init__(self, max_turns: int = 20, max_tokens: int = 4000, idle_ttl: float = 3600,
+                 memory_budget_bytes: int = 50 * 1024 * 1024):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.idle_ttl = idle_ttl
+        self.memory_budget_bytes = memory_budget_bytes
+
+    def trim(self, history):
+        """Keep the most recent turns that fit the turn and token caps"""
+        history = history[-self.max_turns * 2:]
+        total = sum(count_tokens(message.get("content")) for message in history)
+        while history and total > self.max_tokens:
+            total -= count_tokens(history[0].get("content"))
+            history = history[1:]
+        # Never start the history on an assistant reply
+        while history and history[0].get("role") != "user":
+            history = history[1:]
+        return history
+
+class InMemorySessionStore:
+    """Process-local session store with LRU eviction under a global memory budget"""
+
+    def __init__(self, limits: SessionLimits):
+        self.limits = limits
+        self._sessions = OrderedDict()  # session_id -> (history, size, last_access)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get_history(self, session_id: str):
+        with self._lock:
+            self._evict_idle()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            history, size, _ = entry
+            self._sessions[session_id] = (history, size, time.time())
+            self._sessions.move_to_end(session_id)
+            return list(history)
+
+    def append_turn(self, session_id: str, user_message: str, assistant_message: str):
+        with self._lock:
+            history = self._sessions[session_id][0] if session_id in self._sessions else []
+            history = self.limits.trim(history + [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message}
+            ])
+            self._store(session_id, history)
+
+    def _store(self, session_id, history):
+        if session_id in self._sessions:
+            self._total_bytes -= self._sessions[session_id][1]
+        size = _history_size(history)
+        self._sessions[session_id] = (history, size, time.time())
+        self._sessions.move_to_end(session_id)
+        self._total_bytes += size
+        # Least recently used sessions go first when over the global budget
+        while self._total_bytes > self.limits.memory_budget_bytes and len(self._sessions) > 1:
+            _, (_, evicted_size, _) = self._sessions.popitem(last=False)
+            self._total_bytes -= evicted_size
+            self.evictions += 1
+
+    def _evict_idle(self):
+        cutoff = time.time() - self.limits.idle_ttl
+        for session_id in [sid for sid, (_, _, last_access) in self._sessions.items() if last_access < cutoff]:
+            self._total_bytes -= self._sessions.pop(session_id)[1]
+            self.evictions += 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry:
+                self._total_bytes -= entry[1]
+
+    def stats(self):
+        return {"backend": "memory", "sessions": len(self._sessions), "bytes": self._total_bytes, "evictions": self.evictions}
+
+class SQLiteSessionStore:
+    """Session store that survives restarts and can be shared by workers on one host"""
+
+    def __init__(self, limits: SessionLimits, path):
+        self.limits = limits
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, history TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions(last_access)")
+        self._conn.commit()
+        self.evictions = 0
+
+    def get_history(self, session_id: str):
+        with self._lock:
+            self._evict_idle()
+            row = self._conn.execute("SELECT history FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return []
+            self._conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (time.time(), session_id))
+            self._conn.commit()
+            return json.loads(row[0])
+
+    def append_turn(self, session_id: str, user_message: str, assistant_message: str):
+        with self._lock:
+            # BEGIN IMMEDIATE so two workers appending to one session don't lose a turn
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT history FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+                history = json.loads(row[0]) if row else []
+                history = self.limits.trim(history + [
+                    {"role": "user", "content": user_message},
+                    {"role": "assistant", "content": assistant_message}
+                ])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, history, size, last_access) VALUES (?, ?, ?, ?)",
+                    (session_id, json.dumps(history), _history_size(history), time.time())
+                )
+                self._evict_over_budget(session_id)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _evict_idle(self):
+        deleted = self._conn.execute(
+            "DELETE FROM sessions WHERE last_access < ?", (time.time() - self.limits.idle_ttl,)
+        ).rowcount
+        self.evictions += max(deleted, 0)
+        # Always end the DELETE's implicit transaction, or the next BEGIN IMMEDIATE fails
+        self._conn.commit()
+
+    def _evict_over_budget(self, keep: str):
+        """Delete least recently used sessions until under the budget; the one just written is kept"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM sessions").fetchone()[0]
+        while total > self.limits.memory_budget_bytes:
+            row = self._conn.execute(
+                "SELECT session_id, size FROM sessions WHERE session_id != ? ORDER BY last_access ASC LIMIT 1", (keep,)
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (row[0],))
+            total -= row[1]
+            self.evictions += 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        return {"backend": "sqlite", "path": self.path, "sessions": count, "bytes": total, "evictions": self.evictions}
+
+def create_session_store_from_env():
+    """Build the session store from SESSION_* environment variables"""
+    limits = SessionLimits(
+        max_turns=int(os.getenv("SESSION_MAX_TURNS", "20")),
+        max_tokens=int(os.getenv("SESSION_MAX_TOKENS", "4000")),
+        idle_ttl=float(os.getenv("SESSION_IDLE_TTL_SECONDS", "3600")),
+        memory_budget_bytes=int(os.getenv("SESSION_MEMORY_BUDGET_BYTES", str(50 * 1024 * 1024)))
+    )
+    backend = os.getenv("SESSION_STORE_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        default_path = Path(os.getenv("CAREERPATH_CACHE_DIR", ".cache")) / "sessions.sqlite3"
+        path = Path(os.getenv("SESSION_STORE_PATH", str(default_path)))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return SQLiteSessionStore(limits, path)
+    if backend == "memory":
+        return InMemorySessionStore(limits)
+    raise ValueError(f"Unknown session store backend: {backend}")
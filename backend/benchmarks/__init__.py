@@ -0,0 +1 @@
+# Offline Benchmarks Package 
\ No newline at end of file
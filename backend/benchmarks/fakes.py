@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from ..services.context_budget import count_message_tokens, count_tokens
+
+DEMO_QUERIES_PATH = Path(__file__).resolve().parents[2] / "demo_queries.md"
+
+def load_demo_queries(path=DEMO_QUERIES_PATH) -> List[str]:
+    """The sample queries from demo_queries.md, in file order"""
+    text = Path(path).read_text(encoding="utf-8")
+    return re.findall(r'\*\*Query\*\*:\s*"([^"]+)"', text)
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+def _pick(options, seed: int, count: int):
+    start = seed % len(options)
+    return [options[(start + i) % len(options)] for i in range(count)]
+
+SKILLS = [
+    "System Design", "Leadership", "Python", "Statistics", "Machine Learning", "Stakeholder Management",
+    "Cloud Architecture", "User Research", "Prototyping", "Data Analysis", "Communication", "Mentoring"
+]
+COMPANIES = ["Google", "Microsoft", "Amazon", "Stripe", "Shopify", "Atlassian", "Spotify", "Netflix"]
+
+def skills_payload(seed: int) -> dict:
+    gaps = _pick(SKILLS, seed, 4)
+    return {
+        "current_skills": _pick(SKILLS, seed + 5, 3),
+        "required_skills": gaps + ["Communication"],
+        "skill_gaps": gaps,
+        "strengths": _pick(SKILLS, seed + 7, 2),
+        "priority_skills": gaps[:3]
+    }
+
+def industry_payload(seed: int) -> dict:
+    low = 60000 + (seed % 5) * 10000
+    return {
+        "industry_overview": "Steady demand with a shift towards cloud and AI-assisted tooling.",
+        "market_demand": "High - most teams are hiring for this role",
+        "salary_range": {"min": low, "max": low + 70000, "currency": "USD"},
+        "growth_projection": f"{8 + seed % 10}% over the next five years",
+        "key_companies": _pick(COMPANIES, seed, 4),
+        "emerging_trends": ["AI tooling", "Platform engineering", "Remote-first teams"],
+        "job_opportunities": ["Individual contributor", "Team lead", "Consultant"]
+    }
+
+def learning_payload(seed: int) -> dict:
+    skills = _pick(SKILLS, seed, 6)
+    return {
+        "learning_phases": [
+            {"phase": "Foundation Building", "duration": "2 months", "skills": skills[:2], "description": "Cover the fundamentals"},
+            {"phase": "Skill Development", "duration": "3 months", "skills": skills[2:4], "description": "Build projects with the core skills"},
+            {"phase": "Career Transition", "duration": "2 months", "skills": skills[4:], "description": "Portfolio, networking and interviews"}
+        ],
+        "timeline": "7 months",
+        "milestones": ["First project shipped", "Portfolio complete", "First interviews"]
+    }
+
+def resources_payload(seed: int) -> dict:
+    skills = _pick(SKILLS, seed, 3)
+    return {
+        "courses": [
+            {"title": f"{skill} in Practice", "provider": "Coursera", "duration": "6 weeks", "level": "Intermediate",
+             "skills": [skill], "url": f"https://example.com/courses/{seed % 97}-{i}", "cost": "Paid"}
+            for i, skill in enumerate(skills)
+        ],
+        "certifications": [{"title": "Professional Certificate", "provider": "Example Org", "skills": skills[:1],
+                            "duration": "3 months", "cost": "$300"}],
+        "books": ["The Pragmatic Programmer by Hunt and Thomas"],
+        "practice_platforms": ["Exercism - Mentored practice"],
+        "communities": ["Local meetup - Monthly talks"],
+        "free_resources": ["Official documentation - Reference guides"]
+    }
+
+# Canned payload per agent, recognised by its system prompt
+AGENT_PAYLOADS = (
+    ("Skills Assessment Agent", skills_payload),
+    ("Industry Research Agent", industry_payload),
+    ("Learning Path Agent", learning_payload),
+    ("Resource Recommendation Agent", resources_payload),
+)
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model that answers each agent with a canned payload after a fixed delay
+
+    With a search tool bound, the resources agent's first turn requests one search so the
+    tool loop is exercised too.
+    """
+
+    latency: float = 0.05
+    model_name: str = "fake-chat"
+    temperature: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        kwargs.pop("tool_choice", None)
+        kwargs.pop("ls_structured_output_format", None)
+        return self.bind(tools=[getattr(tool, "name", None) or getattr(tool, "__name__", str(tool)) for tool in tools], **kwargs)
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, method: str = None, **kwargs):
+        # Every method is served through a tool call, like function calling
+        return super().with_structured_output(schema, include_raw=include_raw, **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tools=None) -> AIMessage:
+        system = next((m.content for m in messages if m.type == "system"), "")
+        prompt = "\n".join(m.content for m in messages if isinstance(m.content, str))
+        seed = _seed(prompt)
+        if "Career Supervisor Agent" in system:
+            content = "skills_agent"
+        else:
+            builder = next((b for marker, b in AGENT_PAYLOADS if marker in system), None)
+            if builder and tools and tools[0] != "tavily_search":
+                # Structured-output call: answer through the schema's tool
+                return self._with_usage(messages, AIMessage(content="", tool_calls=[{
+                    "name": tools[0], "args": builder(seed), "id": f"call_{seed:x}"
+                }]))
+            if tools and not any(isinstance(m, ToolMessage) for m in messages):
+                return self._with_usage(messages, AIMessage(content="", tool_calls=[{
+                    "name": tools[0], "args": {"query": prompt[-80:]}, "id": f"call_{seed:x}"
+                }]))
+            content = json.dumps(builder(seed)) if builder else "{}"
+        return self._with_usage(messages, AIMessage(content=content))
+
+    def _with_usage(self, messages, message: AIMessage) -> AIMessage:
+        prompt_tokens = count_message_tokens(messages)
+        completion_tokens = count_tokens(message.content)
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        return message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs.get("tools")))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs.get("tools")))])
+
+class SearchInput(BaseModel):
+    query: str = Field(description="Search query")
+
+class FakeSearchTool(BaseTool):
+    """Stand-in for TavilySearch returning Tavily-shaped results after a fixed delay"""
+
+    name: str = "tavily_search"
+    description: str = "Search the web for current courses, certifications and learning resources."
+    args_schema: Type[BaseModel] = SearchInput
+    latency: float = 0.2
+    max_results: int = 5
+
+    def _results(self, query: str) -> dict:
+        seed = _seed(query)
+        return {
+            "query": query,
+            "answer": f"Popular options for {query[:40]}",
+            "results": [
+                {"title": f"Result {i} for {query[:40]}", "url": f"https://example.com/{seed % 997}/{i}",
+                 "content": "Course overview, syllabus and pricing. " * 4, "score": round(1 - i / 10, 2)}
+                for i in range(self.max_results)
+            ],
+            "response_time": self.latency
+        }
+
+    def _run(self, query: str, run_manager: Optional[Any] = None) -> dict:
+        time.sleep(self.latency)
+        return self._results(query)
+
+    async def _arun(self, query: str, run_manager: Optional[Any] = None) -> dict:
+        await asyncio.sleep(self.latency)
+        return self._results(query)
@@ -0,0 +1,218 @@
+"""
+Offline throughput benchmark for the career planning graph and the HTTP API.
+
+Swaps in FakeChatModel and FakeSearchTool, so no OpenAI or Tavily calls are made, then
+drives plan_career / aplan_career or the FastAPI endpoints (in-process, over ASGI)
+at a fixed concurrency and reports latency percentiles, throughput and memory.
+
+    python -m backend.benchmarks.run --target graph --concurrency 8 --requests 200
+    python -m backend.benchmarks.run --target http --endpoint /api/chat --llm-latency 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import math
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from .fakes import FakeChatModel, FakeSearchTool, load_demo_queries
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(latencies, errors: int, wall_seconds: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0
+    }
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+def build_graph(args):
+    """A CareerPlanningGraph wired to the stub model and search tool"""
+    from ..agents.career_graph import CareerPlanningGraph
+    return CareerPlanningGraph(
+        "offline-benchmark",
+        use_async=not args.sync,
+        max_sync_workers=args.concurrency,
+        execution_mode=args.mode,
+        model=FakeChatModel(latency=args.llm_latency),
+        search_tool=FakeSearchTool(latency=args.search_latency)
+    )
+
+async def _drive(make_call, payloads, total: int, concurrency: int):
+    """Run `total` calls with at most `concurrency` in flight; return (latencies, errors, wall)"""
+    queue = asyncio.Queue()
+    for _, payload in zip(range(total), itertools.cycle(payloads)):
+        queue.put_nowait(payload)
+    latencies, errors = [], []
+
+    async def worker():
+        while not queue.empty():
+            payload = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                await make_call(payload)
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(str(e))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    if errors:
+        print(f"⚠️ {len(errors)} failed requests, first error: {errors[0]}")
+    return latencies, len(errors), wall
+
+def graph_call(graph, args):
+    if args.sync:
+        # Blocking plan_career on a thread pool, like a sync web worker would call it
+        executor = ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="bench")
+
+        async def call(query):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(executor, graph.plan_career, query)
+        return call
+
+    async def call(query):
+        await graph.aplan_career(query)
+    return call
+
+def http_call(client, endpoint: str):
+    async def call(query):
+        response = await client.post(endpoint, json={"message": query})
+        response.raise_for_status()
+        body = response.json()
+        # /api/chat reports failures in the body rather than the status code
+        if endpoint == "/api/chat" and body.get("data") is None:
+            raise RuntimeError(body.get("response", "empty response"))
+    return call
+
+async def run_benchmark(args) -> dict:
+    payloads = load_demo_queries(args.queries)
+    graph = build_graph(args)
+
+    if args.target == "http":
+        import httpx
+        from .. import main as server
+        server.career_graph = graph
+        # ASGITransport sends no lifespan events, so run the worker startup (stores, catalog) here
+        server.init_worker()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app),
+            base_url="http://benchmark",
+            timeout=None
+        )
+        make_call = http_call(client, args.endpoint)
+    else:
+        client = None
+        make_call = graph_call(graph, args)
+
+    try:
+        if args.warmup:
+            await _drive(make_call, payloads, args.warmup, args.concurrency)
+        if args.trace_memory:
+            tracemalloc.start()
+        latencies, errors, wall = await _drive(make_call, payloads, args.requests, args.concurrency)
+        report = summarize(latencies, errors, wall)
+        if args.trace_memory:
+            report["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+        report["max_rss_mb"] = _max_rss_mb()
+    finally:
+        if client is not None:
+            await client.aclose()
+        graph.close()
+
+    report["config"] = {
+        "target": args.target,
+        "endpoint": args.endpoint if args.target == "http" else ("plan_career" if args.sync else "aplan_career"),
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "llm_latency": args.llm_latency,
+        "search_latency": args.search_latency,
+        "caches": args.caches,
+        "queries": len(payloads)
+    }
+    return report
+
+def print_report(report: dict):
+    config = report["config"]
+    print("=" * 60)
+    print(f"📈 {config['endpoint']} ({config['mode']}), concurrency {config['concurrency']}, "
+          f"LLM {config['llm_latency']}s, search {config['search_latency']}s, caches {config['caches']}")
+    print("=" * 60)
+    print(f"requests:     {report['requests']} ({report['errors']} errors) in {report['wall_seconds']}s")
+    print(f"throughput:   {report['requests_per_second']} req/s")
+    print(f"latency:      p50 {report['p50_ms']}ms  p95 {report['p95_ms']}ms  p99 {report['p99_ms']}ms  max {report['max_ms']}ms")
+    memory = f"max RSS {report['max_rss_mb']}MB"
+    if "peak_traced_mb" in report:
+        memory += f", peak traced {report['peak_traced_mb']}MB"
+    print(f"memory:       {memory}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline CareerPath.AI benchmark with a stub LLM and search tool")
+    parser.add_argument("--target", choices=["graph", "http"], default="graph")
+    parser.add_argument("--endpoint", choices=["/api/career-plan", "/api/chat"], default="/api/career-plan")
+    parser.add_argument("--mode", choices=["sequential", "parallel"], default="sequential")
+    parser.add_argument("--sync", action="store_true", help="Drive the blocking plan_career instead of aplan_career")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=4, help="Unmeasured requests before the run")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per stub LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="Seconds per stub search")
+    parser.add_argument("--caches", action="store_true", help="Keep the LLM and search caches on (off by default so every request does full work)")
+    parser.add_argument("--queries", default=None, help="Markdown file with **Query**: \"...\" lines (default: demo_queries.md)")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report tracemalloc peak (slows the run)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the agents' console logging")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this file")
+    args = parser.parse_args(argv)
+    if args.queries is None:
+        from .fakes import DEMO_QUERIES_PATH
+        args.queries = DEMO_QUERIES_PATH
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.caches:
+        # Set before the graph reads its cache settings
+        os.environ["LLM_CACHE_BACKEND"] = "none"
+        os.environ["SEARCH_CACHE_BACKEND"] = "none"
+    # Stub plans link to made-up URLs; checking them would only add network traffic
+    os.environ.setdefault("LINK_CHECK", "off")
+    if args.verbose:
+        report = asyncio.run(run_benchmark(args))
+    else:
+        # The agents log every step; printing would dominate the measured time
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"💾 Report written to {args.json_path}")
+    return 0 if report["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Cold-start benchmark: import cost per module and time until a worker is ready.
+
+Imports each module in a fresh interpreter under `python -X importtime` and reports the
+wall time plus the slowest imports (cumulative) and the heaviest top-level packages
+(self time summed). With --serve it also starts uvicorn and polls /api/ready, timing
+when the port answers and when the worker reports ready (built and warmed up).
+
+    python -m backend.benchmarks.startup                              # import cost of backend.main
+    python -m backend.benchmarks.startup --module backend.agents.career_graph --top 25
+    python -m backend.benchmarks.startup --serve                      # + time to listening / ready
+    STARTUP_MODE=background python -m backend.benchmarks.startup --serve
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# "import time:       412 |       1873 |   langchain_core.messages"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+def measure_imports(module: str):
+    """(wall seconds, [(self_us, cumulative_us, depth, name)]) for importing a module in a fresh interpreter"""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else f"exit {process.returncode}"
+        raise RuntimeError(f"import {module} failed: {error}")
+    imports = []
+    for line in process.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return wall, imports
+
+def summarize_imports(module: str, repeat: int, top: int) -> dict:
+    runs = [measure_imports(module) for _ in range(repeat)]
+    # The fastest run is the one least disturbed by the rest of the machine
+    wall, imports = min(runs, key=lambda run: run[0])
+    packages = defaultdict(int)
+    for self_us, _, _, name in imports:
+        packages[name.split(".")[0]] += self_us
+    slowest = sorted(imports, key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "wall_seconds": round(wall, 3),
+        "imports": len(imports),
+        "import_seconds": round(sum(cumulative for _, cumulative, depth, _ in imports if depth == 0) / 1e6, 3),
+        "slowest": [{"module": name, "cumulative_ms": round(cumulative / 1000, 1)} for _, cumulative, _, name in slowest],
+        "packages": [
+            {"package": name, "self_ms": round(self_us / 1000, 1)}
+            for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ]
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_serve(timeout: float) -> dict:
+    """Seconds from spawning uvicorn until /api/ready first answers, and until it answers 200"""
+    port = _free_port()
+    env = dict(os.environ)
+    # Building the graph makes no API calls, so a placeholder key is enough to time startup
+    env.setdefault("OPENAI_API_KEY", "sk-startup-benchmark")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    listening = ready = None
+    body = None
+    try:
+        while time.perf_counter() - started < timeout and process.poll() is None:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/ready", timeout=1) as response:
+                    body = json.loads(response.read())
+                    listening = listening or time.perf_counter() - started
+                    ready = time.perf_counter() - started
+                    break
+            except urllib.error.HTTPError as e:
+                # 503: up but not ready yet
+                body = json.loads(e.read() or b"null")
+                listening = listening or time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {
+        "startup_mode": env.get("STARTUP_MODE", "eager"),
+        "listening_seconds": round(listening, 3) if listening is not None else None,
+        "ready_seconds": round(ready, 3) if ready is not None else None,
+        "warmup": (body or {}).get("warmup"),
+        "error": None if ready is not None else (body or {}).get("error") or "not ready before timeout"
+    }
+
+def print_report(report: dict):
+    for result in report["imports"]:
+        print("=" * 60)
+        print(f"📦 import {result['module']}: {result['wall_seconds']}s wall, "
+              f"{result['import_seconds']}s importing {result['imports']} modules")
+        print("=" * 60)
+        print("slowest imports (cumulative):")
+        for item in result["slowest"]:
+            print(f"   {item['cumulative_ms']:9.1f}ms  {item['module']}")
+        print("heaviest packages (self):")
+        for item in result["packages"]:
+            print(f"   {item['self_ms']:9.1f}ms  {item['package']}")
+    serve = report.get("serve")
+    if serve:
+        print("=" * 60)
+        print(f"🚀 uvicorn ({serve['startup_mode']}): listening after {serve['listening_seconds']}s, "
+              f"ready after {serve['ready_seconds']}s")
+        if serve["warmup"]:
+            print(f"   warmup: {serve['warmup']}")
+        if serve["error"]:
+            print(f"   ❌ {serve['error']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure CareerPath.AI import and startup time")
+    parser.add_argument("--module", action="append", default=None, help="Module to import (repeatable; default: backend.main)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the fastest is reported")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true", help="Also time uvicorn until /api/ready answers 200")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for readiness with --serve")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = {"imports": []}
+    failed = False
+    for module in args.module or ["backend.main"]:
+        try:
+            report["imports"].append(summarize_imports(module, args.repeat, args.top))
+        except RuntimeError as e:
+            print(f"❌ {str(e)}")
+            failed = True
+    if args.serve:
+        report["serve"] = measure_serve(args.timeout)
+        failed = failed or report["serve"]["ready_seconds"] is None
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.json_path}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Plan Catalog Batch Job 
\ No newline at end of file
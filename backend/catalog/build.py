@@ -0,0 +1,109 @@
+"""
+Batch job that precomputes career plans for popular role transitions.
+
+Runs the full agent graph for each (current_role, target_role) pair and publishes the
+outputs as a new catalog version, which servers with PLAN_CATALOG=serve pick up without
+a restart. Run it from cron to keep the catalog fresh:
+
+    python -m backend.catalog.build                       # every pair in pairs.json
+    python -m backend.catalog.build --stale-only          # only entries older than --max-age-days
+    python -m backend.catalog.build --offline             # stub LLM and search, for testing the pipeline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from ..services.plan_catalog import (
+    catalog_entry, catalog_key, default_catalog_dir, load_latest_catalog, publish_catalog, transition_message
+)
+
+DEFAULT_PAIRS_PATH = Path(__file__).resolve().parent / "pairs.json"
+
+def load_pairs(path):
+    with open(path, encoding="utf-8") as f:
+        return [tuple(pair) for pair in json.load(f)]
+
+def build_graph(offline: bool):
+    from ..agents.career_graph import CareerPlanningGraph, create_career_planning_graph
+    if offline:
+        os.environ.setdefault("LINK_CHECK", "off")
+        from ..benchmarks.fakes import FakeChatModel, FakeSearchTool
+        return CareerPlanningGraph("offline-catalog", model=FakeChatModel(latency=0), search_tool=FakeSearchTool(latency=0))
+    return create_career_planning_graph()
+
+async def build_entries(graph, pairs, concurrency: int):
+    """Plan every pair, at most `concurrency` at a time; failures are reported and skipped"""
+    semaphore = asyncio.Semaphore(concurrency)
+    entries, failures = {}, []
+
+    async def plan(current_role, target_role):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await graph.aplan_career(
+                    user_message=transition_message(current_role, target_role),
+                    current_role=current_role,
+                    target_role=target_role
+                )
+            except Exception as e:
+                failures.append((current_role, target_role, str(e)))
+                print(f"❌ {current_role} → {target_role}: {str(e)}")
+                return
+            entries[catalog_key(current_role, target_role)] = catalog_entry(current_role, target_role, result)
+            print(f"✅ {current_role} → {target_role} ({time.perf_counter() - started:.1f}s)")
+
+    await asyncio.gather(*(plan(current_role, target_role) for current_role, target_role in pairs))
+    return entries, failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute career plans for popular role transitions")
+    parser.add_argument("--pairs", default=str(DEFAULT_PAIRS_PATH), help="JSON list of [current_role, target_role] pairs")
+    parser.add_argument("--dir", default=None, help="Catalog directory (default: PLAN_CATALOG_DIR or .cache/plan_catalog)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--stale-only", action="store_true", help="Carry over entries younger than --max-age-days instead of re-planning them")
+    parser.add_argument("--max-age-days", type=float, default=7)
+    parser.add_argument("--keep-versions", type=int, default=3)
+    parser.add_argument("--offline", action="store_true", help="Use the benchmark stub LLM and search tool")
+    args = parser.parse_args(argv)
+
+    directory = Path(args.dir) if args.dir else default_catalog_dir()
+    pairs = load_pairs(args.pairs)
+
+    # Carry fresh entries over from the current version when only refreshing stale ones
+    carried = {}
+    if args.stale_only:
+        previous = load_latest_catalog(directory) or {"entries": {}}
+        cutoff = time.time() - args.max_age_days * 24 * 3600
+        wanted = {catalog_key(*pair) for pair in pairs}
+        carried = {
+            key: entry for key, entry in previous["entries"].items()
+            if key in wanted and entry.get("built_at", 0) >= cutoff
+        }
+    todo = [pair for pair in pairs if catalog_key(*pair) not in carried]
+    print(f"📚 Planning {len(todo)} transitions ({len(carried)} still fresh)")
+
+    graph = build_graph(args.offline)
+    try:
+        entries, failures = asyncio.run(build_entries(graph, todo, args.concurrency))
+    finally:
+        graph.close()
+
+    # Keep the previous entry for a pair that failed this time rather than dropping it
+    if failures:
+        previous = load_latest_catalog(directory) or {"entries": {}}
+        for current_role, target_role, _ in failures:
+            key = catalog_key(current_role, target_role)
+            if key in previous["entries"]:
+                carried[key] = previous["entries"][key]
+
+    version = publish_catalog(directory, {**carried, **entries}, keep_versions=args.keep_versions)
+    print(f"💾 Published plan catalog v{version}: {len(carried) + len(entries)} transitions, {len(failures)} failures")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Builds the local resource index the resources agent searches before going to the web.
+
+Indexes the curated list in data/resources.json plus every course, certification, book,
+community and practice page the search result cache has seen, and saves it where servers
+load it from on startup (RESOURCE_INDEX_PATH). Run it after the plan catalog build so the
+searches that build made are harvested too:
+
+    python -m backend.catalog.resources                    # curated list + search cache
+    python -m backend.catalog.resources --curated-only     # ignore the search cache
+    python -m backend.catalog.resources --query "docker"   # try a query against the result
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from ..services.resource_index import CURATED_RESOURCES_PATH, build_resource_index, default_index_path
+from ..services.search_cache import create_search_cache_from_env
+from ..services.skills_taxonomy import get_skills_taxonomy
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the local learning resource index")
+    parser.add_argument("--curated", default=str(CURATED_RESOURCES_PATH), help="Curated resources JSON")
+    parser.add_argument("--out", default=None, help="Index file (default: RESOURCE_INDEX_PATH or .cache/resource_index.json.gz)")
+    parser.add_argument("--curated-only", action="store_true", help="Don't harvest the search result cache")
+    parser.add_argument("--query", action="append", default=[], help="Print the top matches for a query after building")
+    args = parser.parse_args(argv)
+
+    store = None if args.curated_only else create_search_cache_from_env()
+    # Harvested results are tagged with every taxonomy skill they mention
+    skills = sorted({skill for skills in get_skills_taxonomy().roles.values() for skill in skills})
+
+    started = time.perf_counter()
+    index = build_resource_index(args.curated, search_store=store, skills=skills)
+    path = Path(args.out) if args.out else default_index_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index.save(path)
+    print(f"💾 Saved resource index to {path} in {time.perf_counter() - started:.2f}s: {index.stats()}")
+
+    for query in args.query:
+        print(f"🔎 {query}")
+        for score, doc in index.search(query):
+            print(f"   {score:5.2f}  {doc['title']} ({doc.get('provider')}, {doc.get('kind')})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
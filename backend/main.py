@@ -1,13 +1,22 @@
 import os
+import json
+import time
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 from dotenv import load_dotenv
 
-from .agents.career_graph import create_career_planning_graph
-from .models.state import UserQuery, CareerPlanResponse
+from .services.plan_store import ConversationPlanStore, create_plan_store_from_env
+from .services.plan_catalog import create_plan_catalog_from_env
+from .services.roles import get_role_index
+from .services.http_clients import get_http_clients
+from .services.llm_scheduler import get_llm_scheduler
+from .services.telemetry import record_http_pool, record_request, registry, start_trace
+from .models.api import UserQuery, CareerPlanResponse
 
 # Set up logging for uvicorn - this is crucial for seeing logs in terminal
 logger = logging.getLogger('uvicorn.error')
@@ -32,18 +41,95 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the multi-agent system
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """Per-endpoint latency histogram for /api/metrics"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, so path parameters don't explode cardinality
+        route = request.scope.get("route")
+        handler = request.scope.get("endpoint")
+        endpoint = getattr(route, "path", None) or getattr(handler, "__name__", "unmatched")
+        record_request(endpoint, time.perf_counter() - started, status)
+
+# Per-worker state, built at startup rather than import time so nothing (threads, SQLite
+# connections, HTTP pools) is created in a parent process and inherited by forked workers
 career_graph = None
-try:
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        logger.error("❌ OPENAI_API_KEY not found in environment variables")
-        logger.info("🔧 Please set your OPENAI_API_KEY environment variable")
+# Per-conversation agent outputs, so follow-ups only re-run the stale agents
+plan_store = None
+# Precomputed plans for popular transitions, built by `python -m backend.catalog.build`
+plan_catalog = None
+init_error = None
+# Seconds per warmup step, set once the graph is built and warm; /api/ready waits for it
+warmup_timings = None
+# "background" starts listening before the agent stack is imported and built, with /api/ready
+# answering 503 until it is; "eager" (default) finishes all of it before accepting connections
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+init_task = None
+
+def init_worker():
+    """Build this worker's agent graph and stores; anything already set (e.g. by a benchmark) is kept"""
+    global career_graph, plan_store, plan_catalog, init_error
+    if plan_store is None:
+        plan_store = create_plan_store_from_env()
+    if plan_catalog is None:
+        plan_catalog = create_plan_catalog_from_env()
+    if career_graph is not None:
+        warm_up_worker()
+        return
+    try:
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not openai_api_key:
+            init_error = "OPENAI_API_KEY not configured"
+            logger.error("❌ OPENAI_API_KEY not found in environment variables")
+            logger.info("🔧 Please set your OPENAI_API_KEY environment variable")
+        else:
+            # LangChain, LangGraph and the OpenAI SDK are imported here rather than at module
+            # import, so the server process starts (and answers probes) without them
+            from .agents.career_graph import create_career_planning_graph
+            career_graph = create_career_planning_graph(openai_api_key)
+            init_error = None
+            logger.info(f"✅ Multi-agent career planning system initialized in worker {os.getpid()}")
+            warm_up_worker()
+    except Exception as e:
+        init_error = str(e)
+        logger.error(f"❌ Failed to initialize career planning system: {str(e)}")
+
+    # Worker-local stores make workers non-interchangeable: a follow-up landing on
+    # another worker would not find the conversation's plan
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 and plan_store and plan_store.stats().get("backend") == "memory":
+        logger.warning("⚠️ PLAN_STORE_BACKEND=memory with several workers; use sqlite so workers share conversations")
+
+def warm_up_worker():
+    """Build the agents, search tool, tokenizer and indexes before the first request needs them"""
+    global warmup_timings, init_error
+    if warmup_timings is not None:
+        return
+    try:
+        warmup_timings = career_graph.warmup()
+        logger.info(f"🔥 Worker {os.getpid()} warmed up: {warmup_timings}")
+    except Exception as e:
+        init_error = f"Warmup failed: {str(e)}"
+        logger.error(f"❌ Warmup failed: {str(e)}")
+
+@app.on_event("startup")
+async def start_worker():
+    global init_task
+    if STARTUP_MODE == "background":
+        init_task = asyncio.create_task(asyncio.to_thread(init_worker))
     else:
-        career_graph = create_career_planning_graph(openai_api_key)
-        logger.info("✅ Multi-agent career planning system initialized successfully!")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize career planning system: {str(e)}")
+        await asyncio.to_thread(init_worker)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await get_http_clients().aclose()
+    if career_graph is not None and career_graph.link_checker is not None:
+        await asyncio.to_thread(career_graph.link_checker.close)
 
 @app.get("/")
 async def root():
@@ -68,8 +154,42 @@ async def health_check():
             "learning_agent": True,
             "resources_agent": True
         },
-        "openai_configured": bool(os.getenv("OPENAI_API_KEY"))
+        "openai_configured": bool(os.getenv("OPENAI_API_KEY")),
+        "caches": career_graph.cache_stats() if career_graph else None,
+        "plan_catalog": plan_catalog.stats() if plan_catalog else None,
+        "http_pool": get_http_clients().stats(),
+        "llm_scheduler": get_llm_scheduler().stats() if get_llm_scheduler() else None
+    }
+
+@app.get("/api/ready")
+async def readiness():
+    """Readiness probe: 200 once this worker's graph is built and its stores answer, 503 until then"""
+    checks = {"career_graph": career_graph is not None, "warmed_up": warmup_timings is not None}
+    probes = {
+        "plan_store": plan_store.stats if plan_store else None,
+        "caches": career_graph.cache_stats if career_graph else None
     }
+    for name, probe in probes.items():
+        if probe is None:
+            continue
+        try:
+            probe()
+            checks[name] = True
+        except Exception as e:
+            logger.error(f"❌ Readiness check {name} failed: {str(e)}")
+            checks[name] = False
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "worker": os.getpid(), "checks": checks, "warmup": warmup_timings,
+                 "error": None if ready else init_error}
+    )
+
+@app.get("/api/metrics")
+async def metrics():
+    """Latency, token and cache metrics in Prometheus text format"""
+    record_http_pool(get_http_clients().stats())
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 # Chat message model for the simple chat endpoint
 class ChatMessage(BaseModel):
@@ -77,6 +197,8 @@ class ChatMessage(BaseModel):
     conversation_history: Optional[list] = []
     current_learning_path: Optional[dict] = None
     is_follow_up: Optional[bool] = False
+    conversation_id: Optional[str] = None
+    include_timings: Optional[bool] = False
 
 @app.post("/api/chat")
 async def chat(chat_message: ChatMessage):
@@ -97,13 +219,27 @@ async def chat(chat_message: ChatMessage):
     try:
         logger.info("🤖 Processing request with multi-agent system...")
         
+        # Resume from the conversation's previous plan when we still have it
+        conversation_id = chat_message.conversation_id or ConversationPlanStore.new_conversation_id()
+        previous_outputs = None
+        if plan_store and chat_message.is_follow_up:
+            previous_outputs = plan_store.get(chat_message.conversation_id)
+        logger.info(f"♻️ Conversation {conversation_id}: reusing previous outputs={bool(previous_outputs)}")
+        
         # Pass conversation context to the career planning system
-        result = career_graph.plan_career(
-            user_message=chat_message.message,
-            conversation_history=chat_message.conversation_history,
-            existing_learning_path=chat_message.current_learning_path,
-            is_follow_up=chat_message.is_follow_up
-        )
+        with start_trace() as trace:
+            result = await career_graph.aplan_career(
+                user_message=chat_message.message,
+                conversation_history=chat_message.conversation_history,
+                existing_learning_path=chat_message.current_learning_path,
+                is_follow_up=chat_message.is_follow_up,
+                previous_outputs=previous_outputs
+            )
+        if chat_message.include_timings:
+            result["trace"] = trace.summary()
+        
+        if plan_store:
+            plan_store.save(conversation_id, result)
         
         logger.info("✅ Career plan generated successfully")
         logger.debug(f"📊 Response contains learning path: {bool(result.get('learning_path'))}")
@@ -113,7 +249,8 @@ async def chat(chat_message: ChatMessage):
         response_data = {
             "response": result["message"],
             "mermaid_chart": result.get("mermaid_chart"),
-            "data": result
+            "data": result,
+            "conversation_id": conversation_id
         }
         
         print("=" * 80)
@@ -142,23 +279,87 @@ async def chat(chat_message: ChatMessage):
             "data": None
         }
 
+def _sse(event: str, payload) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+@app.post("/api/chat/stream")
+async def chat_stream(chat_message: ChatMessage):
+    """Stream the career plan as server-sent events while the agents run"""
+    logger.info(f"📡 Streaming chat request: {chat_message.message[:100]}...")
+    
+    conversation_id = chat_message.conversation_id or ConversationPlanStore.new_conversation_id()
+    previous_outputs = None
+    if plan_store and chat_message.is_follow_up:
+        previous_outputs = plan_store.get(chat_message.conversation_id)
+    
+    async def event_stream():
+        yield _sse("start", {"conversation_id": conversation_id, "reusing_previous_outputs": bool(previous_outputs)})
+        if not career_graph:
+            yield _sse("error", {"message": "Sorry, the career planning system is not available. Please check the OpenAI API key configuration."})
+            return
+        try:
+            with start_trace() as trace:
+                async for event, payload in career_graph.astream_plan(
+                    user_message=chat_message.message,
+                    conversation_history=chat_message.conversation_history,
+                    existing_learning_path=chat_message.current_learning_path,
+                    is_follow_up=chat_message.is_follow_up,
+                    previous_outputs=previous_outputs
+                ):
+                    if event == "summary" and plan_store:
+                        plan_store.save(conversation_id, payload)
+                    yield _sse(event, payload)
+            done = {"conversation_id": conversation_id}
+            if chat_message.include_timings:
+                done["trace"] = trace.summary()
+            yield _sse("done", done)
+        except Exception as e:
+            logger.error(f"❌ Error in streaming chat endpoint: {str(e)}")
+            yield _sse("error", {"message": f"I encountered an error while processing your request: {str(e)}"})
+    
+    # X-Accel-Buffering stops reverse proxies from holding events back
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/career-plan", response_model=dict)
 async def create_career_plan(query: UserQuery):
     """Generate a comprehensive career plan using multi-agent system"""
     logger.info(f"🎯 Career plan request: {query.message[:100]}...")
     logger.debug(f"📍 Current role: {query.current_role}, Target role: {query.target_role}")
     
+    # Popular transitions are answered from the precomputed catalog without any LLM call
+    if plan_catalog:
+        current, target = get_role_index().resolve(query.message, query.current_role, query.target_role)
+        cached_plan = plan_catalog.lookup(
+            query.current_role or (current.text if current else None),
+            query.target_role or (target.text if target else None)
+        )
+        if cached_plan:
+            logger.info(f"📚 Served from plan catalog: {cached_plan['catalog']['transition']}")
+            return {
+                "success": True,
+                "data": cached_plan
+            }
+    
     if not career_graph:
         logger.error("❌ Career planning system not initialized")
         raise HTTPException(status_code=500, detail="Career planning system not available")
     
     try:
         logger.info("🚀 Starting multi-agent career planning process...")
-        result = career_graph.plan_career(
-            user_message=query.message,
-            current_role=query.current_role,
-            target_role=query.target_role
-        )
+        with start_trace() as trace:
+            result = await career_graph.aplan_career(
+                user_message=query.message,
+                current_role=query.current_role,
+                target_role=query.target_role,
+                execution_mode=query.execution_mode
+            )
+        if query.include_timings:
+            result["trace"] = trace.summary()
         
         logger.info("✅ Career plan generated successfully")
         logger.debug(f"📊 Mermaid chart length: {len(result.get('mermaid_chart', ''))}")
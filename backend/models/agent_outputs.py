@@ -0,0 +1,65 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# Output schemas for structured-output mode, mirroring the JSON each agent's system prompt asks for
+
+class SkillsAssessment(BaseModel):
+    """Skill gap analysis between the current and target role"""
+    current_skills: List[str] = Field(description="Skills the user already has")
+    required_skills: List[str] = Field(description="Skills needed for the target role")
+    skill_gaps: List[str] = Field(description="Required skills the user is missing")
+    strengths: List[str] = Field(description="Transferable skills")
+    priority_skills: List[str] = Field(description="Top 3-5 skills to focus on first")
+
+class SalaryRange(BaseModel):
+    min: int
+    max: int
+    currency: str = "USD"
+
+class IndustryInsights(BaseModel):
+    """Market research for the target role"""
+    industry_overview: str
+    market_demand: str = Field(description="High/Medium/Low with explanation")
+    salary_range: SalaryRange
+    growth_projection: str = Field(description="Percentage growth expected")
+    key_companies: List[str]
+    emerging_trends: List[str]
+    job_opportunities: List[str]
+
+class LearningPhase(BaseModel):
+    phase: str
+    duration: str
+    skills: List[str]
+    description: str
+
+class LearningPath(BaseModel):
+    """A new or modified learning roadmap"""
+    learning_phases: List[LearningPhase]
+    timeline: str
+    milestones: List[str]
+    changes_made: Optional[str] = Field(default=None, description="Summary of what was modified, for follow-ups")
+
+class Course(BaseModel):
+    title: str
+    provider: str
+    duration: Optional[str] = None
+    level: Optional[str] = Field(default=None, description="Beginner/Intermediate/Advanced")
+    skills: List[str] = []
+    url: Optional[str] = None
+    cost: Optional[str] = Field(default=None, description="Free/Paid")
+
+class Certification(BaseModel):
+    title: str
+    provider: str
+    skills: List[str] = []
+    duration: Optional[str] = None
+    cost: Optional[str] = None
+
+class ResourceRecommendations(BaseModel):
+    """Courses, certifications and other resources matched to the learning path"""
+    courses: List[Course]
+    certifications: List[Certification]
+    books: List[str] = Field(description="Book Title by Author")
+    practice_platforms: List[str] = Field(description="Platform Name - Description")
+    communities: List[str] = Field(description="Community Name - Description")
+    free_resources: List[str] = Field(description="Resource Name - Description")
@@ -0,0 +1,16 @@
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+
+class UserQuery(BaseModel):
+    message: str
+    current_role: Optional[str] = None
+    target_role: Optional[str] = None
+    execution_mode: Optional[Literal["sequential", "parallel"]] = None
+    include_timings: Optional[bool] = False
+
+class CareerPlanResponse(BaseModel):
+    message: str
+    mermaid_chart: Optional[str] = None
+    skills_gap: Optional[List[str]] = None
+    recommended_resources: Optional[List[Dict]] = None
@@ -1,16 +1,46 @@
+import os
 from typing import Dict, List, Optional, Literal, Annotated, Any
-from pydantic import BaseModel
 from langgraph.graph.message import add_messages
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 from typing_extensions import TypedDict
 
+def merge_timings(left: Optional[Dict[str, float]], right: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Reducer that lets concurrently running nodes each report their wall time"""
+    merged = dict(left or {})
+    for node, seconds in (right or {}).items():
+        merged[node] = merged.get(node, 0.0) + seconds
+    return merged
+
+def merge_agent_metadata(left: Optional[Dict[str, Dict[str, Any]]], right: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Reducer for per-agent reply metadata; an agent that runs again replaces its entry"""
+    return {**(left or {}), **(right or {})}
+
+# Messages kept in the state; older agent replies are dropped, the latest user message never is
+MAX_STATE_MESSAGES = int(os.getenv("STATE_MAX_MESSAGES", "8"))
+
+def add_messages_capped(left, right, limit: int = None):
+    """add_messages, then trim to the newest `limit` messages (keeping the latest user message)"""
+    merged = add_messages(left, right)
+    limit = limit or MAX_STATE_MESSAGES
+    if len(merged) <= limit:
+        return merged
+    keep = merged[-limit:]
+    latest_user = next((message for message in reversed(merged) if isinstance(message, HumanMessage)), None)
+    if latest_user is not None and not any(message is latest_user for message in keep):
+        keep = [latest_user] + keep[1:]
+    return keep
+
 class CareerPlanningState(TypedDict):
     """State for the career planning multi-agent system"""
     
-    # Core conversation
-    messages: List[BaseMessage]
+    # Core conversation (reducer so parallel agents can append without clobbering each other).
+    # Agents append compact replies, not raw model output, and the list is capped
+    messages: Annotated[List[BaseMessage], add_messages_capped]
     current_role: Optional[str]
     target_role: Optional[str]
+    # Canonical role IDs from the role index (None for roles it doesn't know)
+    current_role_id: Optional[str]
+    target_role_id: Optional[str]
     
     # Context for follow-up conversations
     conversation_history: Optional[List[Dict[str, str]]]
@@ -23,15 +53,16 @@ class CareerPlanningState(TypedDict):
     learning_path: Optional[Dict[str, Any]]
     resources: Optional[Dict[str, Any]]
     mermaid_chart: Optional[str]
+    
+    # Execution metadata
+    agents_to_run: Optional[List[str]]
+    execution_mode: Optional[Literal["sequential", "parallel"]]
+    prefetched_search_results: Optional[List[Dict[str, Any]]]
+    node_timings: Annotated[Dict[str, float], merge_timings]
+    # Per-agent reply metadata (model, token usage, finish reason) that used to ride along
+    # on the raw messages
+    agent_metadata: Annotated[Dict[str, Dict[str, Any]], merge_agent_metadata]
     next_agent: Optional[Literal["skills_agent", "industry_agent", "learning_agent", "resources_agent", "__end__"]] = None
 
-class UserQuery(BaseModel):
-    message: str
-    current_role: Optional[str] = None
-    target_role: Optional[str] = None
-
-class CareerPlanResponse(BaseModel):
-    message: str
-    mermaid_chart: Optional[str] = None
-    skills_gap: Optional[List[str]] = None
-    recommended_resources: Optional[List[Dict]] = None 
\ No newline at end of file
+# Request/response models live in api.py so the web app can import them without LangGraph
+from .api import CareerPlanResponse, UserQuery  # noqa: E402,F401
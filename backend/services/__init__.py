@@ -0,0 +1 @@
+# Shared Services Package 
\ No newline at end of file
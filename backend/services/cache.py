@@ -0,0 +1,274 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+def default_cache_path(filename: str) -> Path:
+    """Resolve a cache file under CAREERPATH_CACHE_DIR (default: ./.cache)"""
+    cache_dir = Path(os.getenv("CAREERPATH_CACHE_DIR", ".cache"))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / filename
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    expires_at: Optional[float] = None
+
+    def is_expired(self, now: float = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, counter: str, amount: int = 1):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+class LRUCache:
+    """In-process LRU tier with optional TTL and a max entry count"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, key: str, include_expired: bool = False) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.record("misses")
+                return None
+            if entry.is_expired() and not include_expired:
+                del self._entries[key]
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return None
+            self._entries.move_to_end(key)
+            self.stats.record("hits")
+            return entry
+
+    def get(self, key: str):
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set(self, key: str, value, ttl: float = None, stored_at: float = None):
+        ttl = ttl if ttl is not None else self.ttl
+        stored_at = stored_at or time.time()
+        entry = CacheEntry(value, stored_at, stored_at + ttl if ttl else None)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.record("evictions")
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self):
+        """Snapshot of (key, entry) pairs, expired ones included; doesn't touch LRU order"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def describe(self):
+        return {"backend": "memory", "entries": len(self), "max_entries": self.max_entries, **self.stats.as_dict()}
+
+class SQLiteCache:
+    """On-disk tier that survives restarts; values must be JSON serializable"""
+
+    def __init__(self, path, max_entries: int = 10000, max_bytes: int = None, ttl: float = None,
+                 table: str = "cache"):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.table = table
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed_at)")
+        self._conn.commit()
+
+    def get_entry(self, key: str, include_expired: bool = False) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, stored_at, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.record("misses")
+                return None
+            entry = CacheEntry(json.loads(row[0]), row[1], row[2])
+            if entry.is_expired(now) and not include_expired:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats.record("hits")
+            return entry
+
+    def get(self, key: str):
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set(self, key: str, value, ttl: float = None, stored_at: float = None):
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.time()
+        stored_at = stored_at or now
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, stored_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), stored_at, stored_at + ttl if ttl else None, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired rows, then least recently used rows until under the size limits"""
+        expired = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+        ).rowcount
+        if expired > 0:
+            self.stats.record("expirations", expired)
+        count, total_bytes = self._conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        while count > self.max_entries or (self.max_bytes and total_bytes > self.max_bytes):
+            row = self._conn.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (row[0],))
+            self.stats.record("evictions")
+            count -= 1
+            total_bytes -= row[1]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def entries(self):
+        """(key, entry) pairs for every stored row, expired ones included; doesn't touch LRU order"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT key, value, stored_at, expires_at FROM {self.table}").fetchall()
+        return [(key, CacheEntry(json.loads(value), stored_at, expires_at)) for key, value, stored_at, expires_at in rows]
+
+    def describe(self):
+        return {"backend": "sqlite", "path": self.path, "entries": len(self), "max_entries": self.max_entries, **self.stats.as_dict()}
+
+class TieredCache:
+    """Memory tier in front of a disk tier; disk hits are promoted into memory"""
+
+    def __init__(self, memory: LRUCache, disk: SQLiteCache):
+        self.memory = memory
+        self.disk = disk
+
+    def get_entry(self, key: str, include_expired: bool = False) -> Optional[CacheEntry]:
+        entry = self.memory.get_entry(key, include_expired)
+        if entry is not None:
+            return entry
+        entry = self.disk.get_entry(key, include_expired)
+        if entry is not None and not entry.is_expired():
+            # The full TTL from the original stored_at, so the copy expires when the disk entry does
+            ttl = entry.expires_at - entry.stored_at if entry.expires_at else None
+            self.memory.set(key, entry.value, ttl=ttl, stored_at=entry.stored_at)
+        return entry
+
+    def get(self, key: str):
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set(self, key: str, value, ttl: float = None, stored_at: float = None):
+        self.memory.set(key, value, ttl, stored_at)
+        self.disk.set(key, value, ttl, stored_at)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def __len__(self):
+        return len(self.disk)
+
+    def entries(self):
+        return self.disk.entries()
+
+    def describe(self):
+        return {"backend": "tiered", "memory": self.memory.describe(), "disk": self.disk.describe()}
+
+def create_cache(backend: str, filename: str, max_entries: int, ttl: float = None,
+                 max_bytes: int = None, memory_entries: int = None, table: str = "cache"):
+    """Build a cache tier by name: none, memory, sqlite or tiered"""
+    backend = (backend or "none").lower()
+    if backend in ("none", "off", "false"):
+        return None
+    if backend == "memory":
+        return LRUCache(max_entries=max_entries, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteCache(default_cache_path(filename), max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, table=table)
+    if backend == "tiered":
+        return TieredCache(
+            LRUCache(max_entries=memory_entries or min(max_entries, 1024), ttl=ttl),
+            SQLiteCache(default_cache_path(filename), max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, table=table)
+        )
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken ships with langchain-openai, but counting still works without it
+    tiktoken = None
+
+_ENCODING = None
+
+def _encoding():
+    global _ENCODING
+    if _ENCODING is None and tiktoken is not None:
+        try:
+            _ENCODING = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _ENCODING = False
+    return _ENCODING or None
+
+def count_tokens(text) -> int:
+    """Count tokens with tiktoken when available, else estimate ~4 characters per token"""
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = json.dumps(text, separators=(",", ":"), default=str)
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, len(text) // 4)
+
+def count_message_tokens(messages) -> int:
+    """Tokens for a list of LangChain messages or role/content dicts, with per-message overhead"""
+    total = 0
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else message.content
+        total += count_tokens(content) + 4
+    return total
+
+def select_fields(data, fields):
+    """Keep only the fields an agent actually reads"""
+    if not isinstance(data, dict) or not fields:
+        return data
+    return {field: data[field] for field in fields if data.get(field) not in (None, "", [], {})}
+
+def compact_json(data, fields=None) -> str:
+    """Serialize state for a prompt without indentation or unused fields"""
+    return json.dumps(select_fields(data, fields), separators=(",", ":"), ensure_ascii=False, default=str)
+
+TRUNCATION_MARKER = " …[truncated]"
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, marking the cut"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens]) + TRUNCATION_MARKER
+    return text[:max_tokens * 4] + TRUNCATION_MARKER
+
+def _first_sentence(text: str, max_chars: int = 160) -> str:
+    sentence = re.split(r"(?<=[.!?])\s", (text or "").strip(), maxsplit=1)[0]
+    return sentence[:max_chars]
+
+def compact_history(history, max_tokens: int):
+    """Keep the most recent turns verbatim and fold older ones into one short summary message"""
+    if count_message_tokens(history) <= max_tokens:
+        return history
+
+    recent = []
+    used = 0
+    for message in reversed(history):
+        cost = count_message_tokens([message])
+        if recent and used + cost > max_tokens * 3 // 4:
+            break
+        recent.insert(0, message)
+        used += cost
+
+    older = history[:len(history) - len(recent)]
+    if not older:
+        return recent
+    summary_lines = [f"{m.get('role', 'user')}: {_first_sentence(m.get('content'))}" for m in older]
+    summary = truncate_text(
+        "Summary of earlier conversation:\n" + "\n".join(summary_lines),
+        max(max_tokens - used, 32)
+    )
+    # Keep the summary in a user turn so role alternation stays valid for the chat API
+    return [{"role": "user", "content": summary}] + recent
+
+def fit_messages(messages, max_tokens: int, min_tokens: int = 64):
+    """Trim non-system messages, largest first, until the prompt fits the token budget
+
+    No message is cut below min_tokens and system messages are never touched, so a prompt
+    whose system messages alone exceed the budget still comes back over it.
+    """
+    total = count_message_tokens(messages)
+    if total <= max_tokens:
+        return messages
+    fitted = list(messages)
+    candidates = {i for i, m in enumerate(fitted) if m.type != "system" and isinstance(m.content, str)}
+    while total > max_tokens and candidates:
+        largest = max(candidates, key=lambda i: count_tokens(fitted[i].content))
+        size = count_tokens(fitted[largest].content)
+        keep = size - (total - max_tokens) - count_tokens(TRUNCATION_MARKER)
+        trimmed = truncate_text(fitted[largest].content, max(keep, min_tokens))
+        if count_tokens(trimmed) >= size:
+            # Already at the floor (the truncation marker costs a few tokens); try the next one
+            candidates.discard(largest)
+            continue
+        fitted[largest] = fitted[largest].model_copy(update={"content": trimmed})
+        total = count_message_tokens(fitted)
+    return fitted
+
+def agent_token_budget() -> int:
+    return int(os.getenv("AGENT_TOKEN_BUDGET", "8000"))
@@ -0,0 +1,117 @@
+import os
+import threading
+
+import httpx
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install "httpx[http2]")"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _pool_stats(client):
+    """Connection counts read from httpcore's pool; empty when the client was never used or httpcore changed"""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", None) or [])
+    requests = list(getattr(pool, "_requests", None) or [])
+    try:
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+            "active": sum(1 for c in connections if not c.is_idle() and not c.is_closed()),
+            "http2": sum(1 for c in connections if "HTTP/2" in c.info()),
+            "queued": sum(1 for r in requests if r.is_queued())
+        }
+    except AttributeError:
+        return {"connections": len(connections)}
+
+class SharedHttpClients:
+    """One sync and one async httpx client per process, so OpenAI and Tavily calls reuse
+    keep-alive connections (and TLS sessions) instead of opening new ones per call
+
+    The async client binds its connections to the event loop that first uses it, i.e. the
+    server's loop; code running its own loops should build its own client.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, keepalive_expiry: float = 30,
+                 timeout: float = 60, connect_timeout: float = 10, http2: bool = None):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.http2 = http2_available() if http2 is None else http2
+        self.requests = {"sync": 0, "async": 0}
+        self._sync = None
+        self._async = None
+        self._lock = threading.Lock()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _settings(self):
+        return {"limits": self.limits, "timeout": self.timeout, "http2": self.http2}
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync is None:
+                self._sync = httpx.Client(
+                    event_hooks={"request": [lambda request: self._count("sync")]},
+                    **self._settings()
+                )
+            return self._sync
+
+    def async_client(self) -> httpx.AsyncClient:
+        async def count(request):
+            self._count("async")
+
+        with self._lock:
+            if self._async is None:
+                self._async = httpx.AsyncClient(event_hooks={"request": [count]}, **self._settings())
+            return self._async
+
+    def stats(self):
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry_seconds": self.limits.keepalive_expiry,
+            "requests": dict(self.requests),
+            "sync": _pool_stats(self._sync) if self._sync is not None else None,
+            "async": _pool_stats(self._async) if self._async is not None else None
+        }
+
+    async def aclose(self):
+        if self._async is not None:
+            await self._async.aclose()
+            self._async = None
+        if self._sync is not None:
+            self._sync.close()
+            self._sync = None
+
+def create_http_clients_from_env() -> SharedHttpClients:
+    """Pool limits from HTTP_* environment variables; HTTP2=auto uses HTTP/2 when h2 is installed"""
+    http2 = os.getenv("HTTP2", "auto").lower()
+    if http2 == "true" and not http2_available():
+        print("⚠️ HTTP2=true but the h2 package is not installed, using HTTP/1.1")
+    return SharedHttpClients(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")),
+        timeout=float(os.getenv("HTTP_TIMEOUT_SECONDS", "60")),
+        connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10")),
+        http2=None if http2 == "auto" else (http2 == "true" and http2_available())
+    )
+
+_HTTP_CLIENTS = None
+
+def get_http_clients() -> SharedHttpClients:
+    """The process-wide clients, created on first use"""
+    global _HTTP_CLIENTS
+    if _HTTP_CLIENTS is None:
+        _HTTP_CLIENTS = create_http_clients_from_env()
+    return _HTTP_CLIENTS
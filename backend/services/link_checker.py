@@ -0,0 +1,287 @@
+import asyncio
+import ipaddress
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from .cache import LRUCache, create_cache
+from .resource_search import domain_of, normalize_url
+from .telemetry import record_link_check
+
+# Resource sections whose entries carry a URL the summary renders as a link
+LINKED_SECTIONS = ("courses", "certifications")
+
+# Servers that refuse HEAD (or refuse it to bots) are asked again with a GET whose body is never read
+HEAD_REFUSED = (403, 405, 501)
+
+# 401/403/429/5xx mean the page may well exist but wouldn't tell us; re-check these soon
+UNKNOWN_TTL = 3600
+
+USER_AGENT = "CareerPath.AI link checker"
+
+# What a URL that can't even be parsed (e.g. mangled by the model) is recorded as
+INVALID_URL = {"status": "dead", "error": "InvalidURL"}
+
+class BlockedAddress(Exception):
+    """A link (or a redirect it led to) resolves to an address the checker must not contact"""
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    return ip.is_global and not ip.is_multicast
+
+def classify(status_code: int) -> str:
+    if status_code < 400:
+        return "ok"
+    if status_code in (404, 410):
+        return "dead"
+    return "unknown"
+
+def _link_key(url: str):
+    """Cache key for a URL, or None when it can't be parsed (bad IPv6 host, port out of range)"""
+    try:
+        urlsplit(url).port
+        return normalize_url(url)
+    except ValueError:
+        return None
+
+class LinkChecker:
+    """Verifies resource URLs in the background and remembers which ones are dead
+
+    Checks run on a private event loop thread, so neither the sync nor the async request path
+    ever waits on them: a plan is served with what the cache knows, and URLs it doesn't know
+    yet are queued so later plans recommending them can demote or drop the dead ones.
+    """
+
+    def __init__(self, store=None, mode: str = "demote", concurrency: int = 8, per_domain: int = 2,
+                 domain_interval: float = 1.0, timeout: float = 5.0, ttl: float = 24 * 3600,
+                 max_pending: int = 1000, transport=None, allow_private: bool = False):
+        self.store = store if store is not None else LRUCache(max_entries=10000)
+        self.mode = mode
+        self.concurrency = concurrency
+        self.per_domain = per_domain
+        self.domain_interval = domain_interval
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self.transport = transport  # tests mount a stub transport here
+        # URLs come from model output, so loopback, private, link-local (cloud metadata) and
+        # reserved addresses are never contacted; only the local stub server tests allow them
+        self.allow_private = allow_private
+        self.counts = {"ok": 0, "dead": 0, "unknown": 0, "demoted": 0, "dropped": 0, "skipped": 0}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._global = None
+        self._domain_slots = {}  # domain -> semaphore limiting concurrent requests to it
+        self._next_at = {}  # domain -> monotonic time its next request may start
+
+    # --- background loop ---
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="link-checker", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _http_client(self) -> httpx.AsyncClient:
+        # Built on the checker's own loop; the shared pool's async client belongs to the server's
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                transport=self.transport,
+                # Runs before the first request and before every redirect hop
+                event_hooks={"request": [] if self.allow_private else [self._refuse_private]}
+            )
+            self._global = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def _refuse_private(self, request: httpx.Request):
+        """Raise BlockedAddress when the request's host resolves to a non-public address"""
+        host = request.url.host
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, request.url.port or 443)
+        except OSError:
+            return  # unresolvable: the request fails on its own with a ConnectError
+        blocked = [info[4][0] for info in infos if not _is_public(info[4][0])]
+        if blocked:
+            raise BlockedAddress(f"{host} resolves to {blocked[0]}")
+
+    async def _wait_turn(self, domain: str):
+        """Sleep until this domain's next request slot; slots are reserved up front, so waiters stay spaced out"""
+        now = time.monotonic()
+        start = max(now, self._next_at.get(domain, 0.0))
+        self._next_at[domain] = start + self.domain_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _probe(self, url: str) -> dict:
+        client = self._http_client()
+        try:
+            response = await client.head(url)
+            if response.status_code in HEAD_REFUSED:
+                async with client.stream("GET", url) as response:
+                    pass
+        except BlockedAddress:
+            return {"status": "unknown", "error": "private_address"}
+        except httpx.TimeoutException:
+            return {"status": "unknown", "error": "timeout"}
+        except httpx.ConnectError as e:
+            # A DNS or egress outage on this worker looks exactly like a dead host, and dead
+            # results are shared with every worker for the whole TTL, so don't call it dead
+            return {"status": "unknown", "error": type(e).__name__}
+        except (httpx.UnsupportedProtocol, httpx.TooManyRedirects, httpx.InvalidURL) as e:
+            return {"status": "dead", "error": type(e).__name__}
+        except httpx.HTTPError as e:
+            return {"status": "unknown", "error": type(e).__name__}
+        result = {"status": classify(response.status_code), "code": response.status_code}
+        if normalize_url(str(response.url)) != normalize_url(url):
+            result["final_url"] = str(response.url)
+        return result
+
+    async def check(self, url: str) -> dict:
+        """HEAD one URL within the global and per-domain limits, and cache the outcome"""
+        key = _link_key(url)
+        if key is None:
+            return dict(INVALID_URL)
+        try:
+            domain = domain_of(url)
+            self._http_client()
+            semaphore = self._domain_slots.setdefault(domain, asyncio.Semaphore(self.per_domain))
+            async with semaphore:
+                await self._wait_turn(domain)
+                async with self._global:
+                    started = time.perf_counter()
+                    result = await self._probe(url)
+                    record_link_check(result["status"], time.perf_counter() - started)
+            result["checked_at"] = time.time()
+            self.store.set(key, result, ttl=self.ttl if result["status"] != "unknown" else min(self.ttl, UNKNOWN_TTL))
+            with self._lock:
+                self.counts[result["status"]] += 1
+            return result
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    async def check_many(self, urls):
+        return await asyncio.gather(*(self.check(url) for url in urls))
+
+    # --- request path (never blocks) ---
+
+    def status(self, url: str):
+        """The cached check for a URL, or None when it hasn't been checked (or the check expired)"""
+        if not url:
+            return None
+        key = _link_key(url)
+        return self.store.get(key) if key is not None else dict(INVALID_URL)
+
+    def submit(self, urls) -> int:
+        """Queue unchecked URLs for the background loop; returns how many were queued"""
+        queued = []
+        with self._lock:
+            for url in urls:
+                key = _link_key(url)
+                if key is None or not url.startswith(("http://", "https://")) or key in self._pending:
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    self.counts["skipped"] += 1
+                    continue
+                self._pending.add(key)
+                queued.append(url)
+        if queued:
+            asyncio.run_coroutine_threadsafe(self.check_many(queued), self._ensure_loop())
+        return len(queued)
+
+    def review(self, resources: dict) -> dict:
+        """Resources with known-dead links demoted to the end of their section (or dropped)
+
+        Links not checked yet are kept as they are and queued for checking.
+        """
+        if not resources or self.mode == "off":
+            return resources
+        reviewed, unchecked, dead = dict(resources), [], 0
+        for section in LINKED_SECTIONS:
+            items = resources.get(section)
+            if not isinstance(items, list):
+                continue
+            kept, demoted = [], []
+            for item in items:
+                url = item.get("url") if isinstance(item, dict) else None
+                status = self.status(url) if url else {"status": "ok"}
+                if status is None:
+                    unchecked.append(url)
+                elif status["status"] == "dead":
+                    dead += 1
+                    if self.mode == "demote":
+                        demoted.append({**item, "link_status": "dead"})
+                    continue
+                kept.append(item)
+            reviewed[section] = kept + demoted
+        if dead:
+            reviewed["dead_links"] = dead
+            with self._lock:
+                self.counts["demoted" if self.mode == "demote" else "dropped"] += dead
+        self.submit(unchecked)
+        return reviewed
+
+    def stats(self):
+        with self._lock:
+            return {"mode": self.mode, "pending": len(self._pending), "domains": len(self._domain_slots), **self.counts}
+
+    def close(self, timeout: float = 5.0):
+        """Close the HTTP client and stop the loop thread; queued checks are abandoned"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result(timeout)
+            except Exception:
+                pass
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        loop.close()
+
+def create_link_checker_from_env():
+    """Build the link checker from LINK_CHECK_* environment variables; None when LINK_CHECK=off"""
+    mode = os.getenv("LINK_CHECK", "demote").lower()
+    if mode not in ("demote", "drop"):
+        return None
+    ttl = float(os.getenv("LINK_CHECK_TTL_HOURS", "24")) * 3600
+    return LinkChecker(
+        store=create_cache(
+            backend=os.getenv("LINK_CHECK_BACKEND", "sqlite"),
+            filename="link_status.sqlite3",
+            max_entries=int(os.getenv("LINK_CHECK_MAX_ENTRIES", "20000")),
+            ttl=ttl,
+            table="link_status"
+        ),
+        mode=mode,
+        concurrency=int(os.getenv("LINK_CHECK_CONCURRENCY", "8")),
+        per_domain=int(os.getenv("LINK_CHECK_PER_DOMAIN", "2")),
+        domain_interval=float(os.getenv("LINK_CHECK_DOMAIN_INTERVAL_SECONDS", "1.0")),
+        timeout=float(os.getenv("LINK_CHECK_TIMEOUT_SECONDS", "5")),
+        ttl=ttl
+    )
+
+_LINK_CHECKER = None
+_LINK_CHECKER_LOADED = False
+
+def get_link_checker():
+    """The process-wide link checker (None when disabled), created on first use"""
+    global _LINK_CHECKER, _LINK_CHECKER_LOADED
+    if not _LINK_CHECKER_LOADED:
+        _LINK_CHECKER_LOADED = True
+        _LINK_CHECKER = create_link_checker_from_env()
+    return _LINK_CHECKER
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import re
+
+from langchain_core.messages import BaseMessage, SystemMessage, message_to_dict, messages_from_dict
+
+from .cache import create_cache
+
+def _normalize_text(text) -> str:
+    """Collapse whitespace so cosmetic prompt differences don't split cache entries"""
+    if not isinstance(text, str):
+        text = json.dumps(text, sort_keys=True)
+    return re.sub(r"\s+", " ", text).strip()
+
+def model_identity(model) -> dict:
+    """Describe everything about the model that changes its output: name, temperature, bound tools"""
+    bound_kwargs = getattr(model, "kwargs", None) or {}
+    base = getattr(model, "bound", model)
+    tools = [
+        tool.get("function", {}).get("name") or tool.get("name")
+        for tool in bound_kwargs.get("tools", [])
+        if isinstance(tool, dict)
+    ]
+    return {
+        "model": getattr(base, "model_name", None) or type(base).__name__,
+        "temperature": getattr(base, "temperature", None),
+        "tools": sorted(filter(None, tools))
+    }
+
+class LLMResponseCache:
+    """Content-addressed cache of chat model responses keyed on model, system prompt and messages"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def make_key(self, model, messages, variant: str = None) -> str:
+        system_prompt = "\n".join(_normalize_text(m.content) for m in messages if isinstance(m, SystemMessage))
+        conversation = [
+            {
+                "type": m.type,
+                "content": _normalize_text(m.content),
+                "tool_calls": [{"name": tc.get("name"), "args": tc.get("args")} for tc in getattr(m, "tool_calls", None) or []],
+                "tool_call_id": getattr(m, "tool_call_id", None)
+            }
+            for m in messages if isinstance(m, BaseMessage) and not isinstance(m, SystemMessage)
+        ]
+        key_fields = {"model": model_identity(model), "system": system_prompt, "messages": conversation}
+        if variant:
+            key_fields["variant"] = variant
+        payload = json.dumps(
+            key_fields,
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, model, messages, variant: str = None):
+        """Return the cached response message, or None on a miss; variant separates e.g. structured replies"""
+        cached = self.store.get(self.make_key(model, messages, variant))
+        if cached is None:
+            return None
+        response = messages_from_dict([cached])[0]
+        response.response_metadata = {**(response.response_metadata or {}), "cache_hit": True}
+        return response
+
+    def save(self, model, messages, response, variant: str = None):
+        self.store.set(self.make_key(model, messages, variant), message_to_dict(response))
+
+    def stats(self):
+        return self.store.describe()
+
+def create_llm_cache_from_env():
+    """Build the LLM response cache from LLM_CACHE_* environment variables"""
+    store = create_cache(
+        backend=os.getenv("LLM_CACHE_BACKEND", "memory"),
+        filename="llm_cache.sqlite3",
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+        ttl=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+        max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(100 * 1024 * 1024))),
+        memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256")),
+        table="llm_responses"
+    )
+    return LLMResponseCache(store) if store is not None else None
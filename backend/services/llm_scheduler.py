@@ -0,0 +1,354 @@
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from .context_budget import count_message_tokens
+from .telemetry import record_retry
+
+# Statuses worth retrying: rate limits, overload and transient server errors
+RETRYABLE_STATUSES = (408, 409, 429, 500, 502, 503, 504, 529)
+# Of those, the ones that mean "send less": they also shrink the concurrency cap
+OVERLOAD_STATUSES = (429, 503, 529)
+# Connection-level failures have no status code; matched by class name so no SDK import is needed
+RETRYABLE_ERRORS = ("APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout", "ConnectTimeout")
+
+class SchedulerTimeout(TimeoutError):
+    """The call could not be admitted (or retried) before its deadline"""
+
+class TokenBucket:
+    """Refills at rate_per_minute up to capacity; reservations may go into debt and report the wait"""
+
+    def __init__(self, rate_per_minute: float, capacity: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, max_wait: float = None) -> float:
+        """Take amount now and return how long to wait before using it; None (nothing taken) if over max_wait"""
+        with self._lock:
+            self._refill(time.monotonic())
+            # A request larger than the burst size still goes through, it just waits for a full bucket
+            amount = min(amount, self.capacity)
+            wait = max(0.0, (amount - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= amount
+            return wait
+
+    def adjust(self, amount: float):
+        """Correct an earlier reservation (negative gives tokens back)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+class _Waiter:
+    __slots__ = ("wake", "granted", "cancelled")
+
+    def __init__(self, wake):
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+
+class LLMScheduler:
+    """Process-wide admission control for chat model calls
+
+    - RPM and TPM token buckets keep us under the account's rate limits
+    - an AIMD cap on concurrent calls grows by one per window of successes and halves on a 429
+    - callers wait in a queue ordered by deadline, so bursts queue instead of failing
+    - retryable errors back off with full jitter, or for as long as Retry-After says
+
+    Sync (thread) and async callers share the same queue.
+    """
+
+    def __init__(self, requests_per_minute: float = 500, tokens_per_minute: float = 200000,
+                 burst_seconds: float = 10, initial_concurrency: int = 8, min_concurrency: int = 1,
+                 max_concurrency: int = 32, max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_max: float = 20, deadline: float = 120, expected_output_tokens: int = 600):
+        self.rpm = TokenBucket(requests_per_minute, max(1.0, requests_per_minute / 60 * burst_seconds))
+        self.tpm = TokenBucket(tokens_per_minute, max(1.0, tokens_per_minute / 60 * burst_seconds))
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.expected_output_tokens = expected_output_tokens
+        self.in_flight = 0
+        self.queued_peak = 0
+        self.completed = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self._queue = []  # (deadline, seq, waiter)
+        self._seq = itertools.count()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    # Concurrency slots
+
+    def _try_admit(self, deadline: float, wake):
+        """A slot right away (None), or a queued waiter to wait on"""
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._queue:
+                self.in_flight += 1
+                return None
+            waiter = _Waiter(wake)
+            heapq.heappush(self._queue, (deadline, next(self._seq), waiter))
+            self.queued_peak = max(self.queued_peak, len(self._queue))
+            return waiter
+
+    def _grant_locked(self):
+        # Earliest deadline first
+        while self._queue and self.in_flight < int(self.limit):
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self.in_flight += 1
+            waiter.granted = True
+            try:
+                waiter.wake()
+            except RuntimeError:
+                # The waiter's event loop is gone; hand the slot to the next one
+                self.in_flight -= 1
+                waiter.granted = False
+                waiter.cancelled = True
+
+    def _abandon(self, waiter, timed_out: bool = True) -> bool:
+        """Give up waiting; True when the slot was granted in the meantime (and is now ours)"""
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiter.cancelled = True
+            self.timeouts += timed_out
+            return False
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._grant_locked()
+
+    def _acquire(self, deadline: float):
+        event = threading.Event()
+        waiter = self._try_admit(deadline, event.set)
+        if waiter is None:
+            return
+        if not event.wait(max(0.0, deadline - time.monotonic())) and not self._abandon(waiter):
+            raise SchedulerTimeout("LLM queue deadline exceeded")
+
+    async def _aacquire(self, deadline: float):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._try_admit(deadline, wake)
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                raise SchedulerTimeout("LLM queue deadline exceeded") from None
+        except asyncio.CancelledError:
+            if self._abandon(waiter, timed_out=False):
+                self._release()
+            raise
+
+    # AIMD
+
+    def _on_success(self):
+        with self._lock:
+            self.completed += 1
+            # Additive increase: about one more slot per `limit` successful calls
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / max(self.limit, 1.0))
+            self._grant_locked()
+
+    def _on_overload(self):
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            # Calls that were already in flight fail together; count that as one signal
+            if now - self._last_decrease >= 1.0:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self._last_decrease = now
+
+    # Rate limits
+
+    def _estimate_tokens(self, messages) -> int:
+        try:
+            return count_message_tokens(messages) + self.expected_output_tokens
+        except (AttributeError, TypeError):
+            return self.expected_output_tokens
+
+    def _reserve(self, tokens: int, deadline: float) -> float:
+        """Wait needed for one request of `tokens`; raises when it would pass the deadline"""
+        remaining = deadline - time.monotonic()
+        request_wait = self.rpm.reserve(1, max_wait=remaining)
+        if request_wait is None:
+            raise SchedulerTimeout("LLM requests-per-minute budget exhausted until after the deadline")
+        token_wait = self.tpm.reserve(tokens, max_wait=remaining)
+        if token_wait is None:
+            self.rpm.adjust(-1)
+            raise SchedulerTimeout("LLM tokens-per-minute budget exhausted until after the deadline")
+        return max(request_wait, token_wait)
+
+    def _settle(self, estimated: int, result):
+        usage = usage_of(result)
+        if usage and usage.get("total_tokens"):
+            self.tpm.adjust(usage["total_tokens"] - estimated)
+
+    # Retries
+
+    def _backoff(self, error, attempt: int, deadline: float):
+        """Seconds to wait before retrying, or None when the error is final or time is up"""
+        status = error_status(error)
+        if status not in RETRYABLE_STATUSES and type(error).__name__ not in RETRYABLE_ERRORS:
+            return None
+        if status in OVERLOAD_STATUSES:
+            self._on_overload()
+        if attempt >= self.max_retries:
+            return None
+        delay = retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def run(self, call, messages=None, component: str = "llm"):
+        """Run a blocking model call under the scheduler's limits"""
+        deadline = time.monotonic() + self.deadline
+        tokens = self._estimate_tokens(messages or [])
+        for attempt in itertools.count():
+            self._acquire(deadline)
+            try:
+                wait = self._reserve(tokens, deadline)
+                if wait:
+                    time.sleep(wait)
+                result = call()
+            except Exception as e:
+                self._release()
+                delay = self._backoff(e, attempt, deadline)
+                if delay is None:
+                    raise
+                record_retry(component, f"llm_{error_status(e) or type(e).__name__}")
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._release()
+                raise
+            self._release()
+            self._on_success()
+            self._settle(tokens, result)
+            return result
+
+    async def arun(self, call, messages=None, component: str = "llm"):
+        """Await a model call (a coroutine factory) under the scheduler's limits"""
+        deadline = time.monotonic() + self.deadline
+        tokens = self._estimate_tokens(messages or [])
+        for attempt in itertools.count():
+            await self._aacquire(deadline)
+            try:
+                wait = self._reserve(tokens, deadline)
+                if wait:
+                    await asyncio.sleep(wait)
+                result = await call()
+            except Exception as e:
+                self._release()
+                delay = self._backoff(e, attempt, deadline)
+                if delay is None:
+                    raise
+                record_retry(component, f"llm_{error_status(e) or type(e).__name__}")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self._release()
+                raise
+            self._release()
+            self._on_success()
+            self._settle(tokens, result)
+            return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": sum(1 for _, _, waiter in self._queue if not waiter.cancelled),
+                "queued_peak": self.queued_peak,
+                "completed": self.completed,
+                "throttled": self.throttled,
+                "deadline_exceeded": self.timeouts,
+                "rpm_available": round(self.rpm.tokens, 1),
+                "tpm_available": round(self.tpm.tokens)
+            }
+
+def usage_of(result):
+    """usage_metadata of a chat reply, or of the raw reply inside a structured-output result"""
+    if isinstance(result, dict):
+        result = result.get("raw")
+    return getattr(result, "usage_metadata", None)
+
+def error_status(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+def retry_after(error):
+    """Seconds from the Retry-After (or OpenAI's retry-after-ms) header, if the error carries one"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def create_llm_scheduler_from_env():
+    """Build the scheduler from LLM_* environment variables; None when LLM_SCHEDULER=off"""
+    if os.getenv("LLM_SCHEDULER", "on").lower() in ("off", "false"):
+        return None
+    # The rate limits are per account; each worker process takes its share
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    return LLMScheduler(
+        requests_per_minute=float(os.getenv("LLM_RPM", "500")) / workers,
+        tokens_per_minute=float(os.getenv("LLM_TPM", "200000")) / workers,
+        burst_seconds=float(os.getenv("LLM_BURST_SECONDS", "10")),
+        initial_concurrency=int(os.getenv("LLM_INITIAL_CONCURRENCY", "8")),
+        min_concurrency=int(os.getenv("LLM_MIN_CONCURRENCY", "1")),
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "32")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
+        deadline=float(os.getenv("LLM_DEADLINE_SECONDS", "120"))
+    )
+
+_SCHEDULER = None
+_SCHEDULER_LOADED = False
+
+def get_llm_scheduler():
+    """The process-wide scheduler (None when disabled), created on first use"""
+    global _SCHEDULER, _SCHEDULER_LOADED
+    if not _SCHEDULER_LOADED:
+        _SCHEDULER = create_llm_scheduler_from_env()
+        _SCHEDULER_LOADED = True
+    return _SCHEDULER
@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from .cache import default_cache_path
+from .plan_store import PLAN_FIELDS
+from .roles import role_key
+
+# Bump when the entry layout changes; servers ignore catalogs written with another schema
+# (2: transitions keyed on canonical role IDs)
+CATALOG_SCHEMA = 2
+
+# What a catalog entry keeps from a plan_career result
+CATALOG_FIELDS = ("message",) + PLAN_FIELDS
+
+LATEST_POINTER = "LATEST"
+
+def catalog_key(current_role: str, target_role: str) -> str:
+    """Canonical role IDs when the roles are known, so "Sr. SWE" and "Senior Software Engineer" share an entry"""
+    return f"{role_key(current_role)} -> {role_key(target_role)}"
+
+def transition_message(current_role: str, target_role: str) -> str:
+    """The query the batch job plans each transition with"""
+    return (f"I'm a {current_role}. I want to become a {target_role}. "
+            f"What skills do I need and what's the best learning path?")
+
+class PlanCatalog:
+    """Read side of the on-disk catalog of precomputed plans, reloaded when a new version is published"""
+
+    def __init__(self, directory, match_threshold: float = 0.93, max_age: float = None,
+                 reload_interval: float = 60):
+        self.directory = Path(directory)
+        self.match_threshold = match_threshold
+        self.max_age = max_age
+        self.reload_interval = reload_interval
+        self.version = None
+        self.built_at = None
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Load the version LATEST points to; returns whether a new version was loaded"""
+        catalog = load_latest_catalog(self.directory)
+        self._checked_at = time.time()
+        if catalog is None or catalog["version"] == self.version:
+            return False
+        with self._lock:
+            self.version = catalog["version"]
+            self.built_at = catalog.get("built_at")
+            self.entries = catalog["entries"]
+        print(f"📚 Loaded plan catalog v{self.version} with {len(self.entries)} transitions")
+        return True
+
+    def _maybe_reload(self):
+        if time.time() - self._checked_at >= self.reload_interval:
+            self.reload()
+
+    def _fresh(self, entry) -> bool:
+        return self.max_age is None or time.time() - entry.get("built_at", 0) <= self.max_age
+
+    def _match(self, current: str, target: str):
+        """Exact transition first, else the closest one whose roles are both above the similarity threshold
+
+        Known roles already arrive as canonical IDs; the fuzzy pass is for roles outside the index.
+        """
+        key = f"{current} -> {target}"
+        if key in self.entries:
+            return key, 1.0
+        best_key, best_score = None, 0.0
+        for candidate in self.entries:
+            candidate_current, _, candidate_target = candidate.partition(" -> ")
+            # Score each side separately, so "product manager" can't stand in for "project manager"
+            # just because the rest of the transition matches
+            score = min(
+                SequenceMatcher(None, current, candidate_current).ratio(),
+                SequenceMatcher(None, target, candidate_target).ratio()
+            )
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_score >= self.match_threshold:
+            return best_key, best_score
+        return None, best_score
+
+    def lookup(self, current_role: str, target_role: str):
+        """The precomputed plan for this transition, or None"""
+        if not current_role or not target_role:
+            return None
+        self._maybe_reload()
+        with self._lock:
+            key, score = self._match(role_key(current_role), role_key(target_role))
+            entry = self.entries.get(key) if key else None
+        if entry is None or not self._fresh(entry):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {
+            **entry["plan"],
+            "catalog": {"version": self.version, "transition": key, "score": round(score, 3), "built_at": entry["built_at"]}
+        }
+
+    def stats(self):
+        return {
+            "directory": str(self.directory),
+            "version": self.version,
+            "transitions": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+def load_latest_catalog(directory):
+    """The catalog LATEST points to, or None when there is none (or it has another schema)"""
+    directory = Path(directory)
+    pointer = directory / LATEST_POINTER
+    if not pointer.exists():
+        return None
+    try:
+        catalog = json.loads((directory / pointer.read_text().strip()).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Could not read plan catalog: {str(e)}")
+        return None
+    if catalog.get("schema") != CATALOG_SCHEMA:
+        print(f"⚠️ Ignoring plan catalog with schema {catalog.get('schema')} (expected {CATALOG_SCHEMA})")
+        return None
+    return catalog
+
+def publish_catalog(directory, entries: dict, keep_versions: int = 3) -> int:
+    """Write a new catalog version and atomically point LATEST at it; returns the version number"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    previous = load_latest_catalog(directory)
+    version = (previous["version"] + 1) if previous else 1
+    filename = f"catalog-v{version:04d}.json"
+    catalog = {"schema": CATALOG_SCHEMA, "version": version, "built_at": time.time(), "entries": entries}
+
+    tmp = directory / f".{filename}.tmp"
+    tmp.write_text(json.dumps(catalog, ensure_ascii=False, default=str), encoding="utf-8")
+    os.replace(tmp, directory / filename)
+    pointer_tmp = directory / f".{LATEST_POINTER}.tmp"
+    pointer_tmp.write_text(filename)
+    os.replace(pointer_tmp, directory / LATEST_POINTER)
+
+    # Keep a few old versions around for rollback (point LATEST back at one)
+    for old in sorted(directory.glob("catalog-v*.json"))[:-keep_versions]:
+        old.unlink()
+    return version
+
+def catalog_entry(current_role: str, target_role: str, result: dict) -> dict:
+    return {
+        "current_role": current_role,
+        "target_role": target_role,
+        "built_at": time.time(),
+        "plan": {field: result.get(field) for field in CATALOG_FIELDS}
+    }
+
+def default_catalog_dir() -> Path:
+    return Path(os.getenv("PLAN_CATALOG_DIR", str(default_cache_path("plan_catalog"))))
+
+def create_plan_catalog_from_env():
+    """Serve precomputed plans when PLAN_CATALOG=serve; None otherwise"""
+    if os.getenv("PLAN_CATALOG", "off").lower() != "serve":
+        return None
+    max_age_days = float(os.getenv("PLAN_CATALOG_MAX_AGE_DAYS", "30"))
+    return PlanCatalog(
+        default_catalog_dir(),
+        match_threshold=float(os.getenv("PLAN_CATALOG_MATCH_THRESHOLD", "0.93")),
+        max_age=max_age_days * 24 * 3600 if max_age_days > 0 else None,
+        reload_interval=float(os.getenv("PLAN_CATALOG_RELOAD_SECONDS", "60"))
+    )
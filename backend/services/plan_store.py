@@ -0,0 +1,48 @@
+import os
+import uuid
+
+from .cache import create_cache
+
+# Agent outputs worth carrying between turns of the same conversation
+PLAN_FIELDS = (
+    "skills_assessment", "industry_insights", "learning_path", "resources",
+    "mermaid_chart", "current_role", "target_role"
+)
+
+class ConversationPlanStore:
+    """Server-side memory of each conversation's latest agent outputs"""
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def new_conversation_id() -> str:
+        return uuid.uuid4().hex
+
+    def get(self, conversation_id: str):
+        if not conversation_id:
+            return None
+        return self.store.get(conversation_id)
+
+    def save(self, conversation_id: str, result: dict):
+        """Keep the latest value of each field, so a partial re-plan doesn't erase earlier outputs"""
+        previous = self.get(conversation_id) or {}
+        outputs = {
+            field: result.get(field) if result.get(field) else previous.get(field)
+            for field in PLAN_FIELDS
+        }
+        self.store.set(conversation_id, outputs)
+
+    def stats(self):
+        return self.store.describe()
+
+def create_plan_store_from_env():
+    """Build the conversation plan store from PLAN_STORE_* environment variables"""
+    store = create_cache(
+        backend=os.getenv("PLAN_STORE_BACKEND", "memory"),
+        filename="plan_store.sqlite3",
+        max_entries=int(os.getenv("PLAN_STORE_MAX_CONVERSATIONS", "2000")),
+        ttl=float(os.getenv("PLAN_STORE_TTL_SECONDS", str(24 * 3600))),
+        table="conversation_plans"
+    )
+    return ConversationPlanStore(store) if store is not None else None
@@ -0,0 +1,220 @@
+import gzip
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from .cache import default_cache_path
+from .resource_search import extract_metadata, normalize_url
+from .skills_taxonomy import mentioned_skills
+
+CURATED_RESOURCES_PATH = Path(__file__).resolve().parents[1] / "data" / "resources.json"
+
+# Bump when the on-disk layout changes; older files are rebuilt from the curated list
+INDEX_SCHEMA = 1
+
+# Term weight per field: a skill match says more about a resource than a word in its title
+FIELD_WEIGHTS = {"skills": 3, "title": 2, "provider": 1}
+
+# Kinds worth keeping from harvested search results; unclassified pages (blogs, listicles) are skipped
+HARVEST_KINDS = ("course", "certification", "book", "community", "practice", "free")
+
+STOPWORDS = frozenset(
+    "a an and the of for to in on with by at from or best top course courses online learn "
+    "tutorial tutorials guide free certification certifications 2023 2024 2025".split()
+)
+
+def tokenize(text: str):
+    return [token for token in re.findall(r"[a-z0-9+#]+", (text or "").lower()) if token not in STOPWORDS]
+
+class ResourceIndex:
+    """BM25 inverted index over curated and harvested learning resources (title, skills, provider)
+
+    Documents are dicts with url, title, provider, kind, skills and optional cost, duration,
+    level and description; "updated_at" is set for harvested ones so they can go stale.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = []  # doc id -> document, None once replaced
+        self.postings = defaultdict(dict)  # term -> {doc id: weighted term frequency}
+        self.lengths = {}
+        self._by_url = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._by_url)
+
+    @staticmethod
+    def _terms(doc) -> Counter:
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = doc.get(field)
+            text = " ".join(value) if isinstance(value, list) else value
+            for token in tokenize(text):
+                terms[token] += weight
+        return terms
+
+    def _remove(self, doc_id: int):
+        for term in self._terms(self.docs[doc_id]):
+            self.postings[term].pop(doc_id, None)
+        self._total_length -= self.lengths.pop(doc_id)
+        self.docs[doc_id] = None
+
+    def add(self, doc: dict) -> bool:
+        """Index a resource; an existing entry for the same URL is replaced unless it is curated"""
+        key = normalize_url(doc.get("url"))
+        if not key or not doc.get("title"):
+            return False
+        with self._lock:
+            existing = self._by_url.get(key)
+            if existing is not None:
+                if self.docs[existing].get("source") == "curated" and doc.get("source") != "curated":
+                    return False
+                self._remove(existing)
+            doc_id = len(self.docs)
+            self.docs.append(doc)
+            terms = self._terms(doc)
+            for term, frequency in terms.items():
+                self.postings[term][doc_id] = frequency
+            self.lengths[doc_id] = sum(terms.values())
+            self._total_length += self.lengths[doc_id]
+            self._by_url[key] = doc_id
+            return True
+
+    def add_search_results(self, outcome, skills=(), now: float = None) -> int:
+        """Harvest the classifiable results of one Tavily-shaped search outcome; returns how many were added"""
+        if not isinstance(outcome, dict):
+            return 0
+        added = 0
+        for result in outcome.get("results") or []:
+            metadata = extract_metadata(result)
+            if metadata.get("kind") not in HARVEST_KINDS:
+                continue
+            text = f"{result.get('title') or ''} {result.get('content') or ''}"
+            doc = {
+                "url": result.get("url"),
+                "title": result.get("title"),
+                "provider": metadata.get("provider") or metadata.get("domain"),
+                "kind": metadata["kind"],
+                "skills": mentioned_skills(text, skills),
+                "description": (result.get("content") or "")[:300],
+                **{field: metadata[field] for field in ("cost", "duration", "level") if field in metadata},
+                "source": "search",
+                "updated_at": now or time.time()
+            }
+            added += self.add(doc)
+        return added
+
+    def search(self, query: str, limit: int = 5, kinds=None):
+        """(score, document) pairs for the best BM25 matches"""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._by_url)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+            scores = defaultdict(float)
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for doc_id, score in ranked:
+                doc = self.docs[doc_id]
+                if kinds and doc.get("kind") not in kinds:
+                    continue
+                results.append((score, doc))
+                if len(results) >= limit:
+                    break
+            return results
+
+    @staticmethod
+    def is_fresh(doc, max_age: float = None) -> bool:
+        """Curated entries never go stale; harvested ones after max_age seconds"""
+        return max_age is None or doc.get("updated_at") is None or time.time() - doc["updated_at"] <= max_age
+
+    def stats(self):
+        with self._lock:
+            sources = Counter(doc.get("source") for doc in self.docs if doc is not None)
+            return {"resources": len(self._by_url), "terms": len(self.postings), **dict(sources)}
+
+    def save(self, path):
+        """Write docs and postings as gzipped JSON, atomically"""
+        path = Path(path)
+        with self._lock:
+            live = [doc_id for doc_id, doc in enumerate(self.docs) if doc is not None]
+            renumber = {doc_id: i for i, doc_id in enumerate(live)}
+            payload = {
+                "schema": INDEX_SCHEMA,
+                "built_at": time.time(),
+                "docs": [self.docs[doc_id] for doc_id in live],
+                "postings": {
+                    term: [[renumber[doc_id], frequency] for doc_id, frequency in postings.items()]
+                    for term, postings in self.postings.items() if postings
+                }
+            }
+        tmp = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved index without re-tokenizing; None when missing or written with another schema"""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if payload.get("schema") != INDEX_SCHEMA:
+            return None
+        index = cls()
+        index.docs = payload["docs"]
+        for term, postings in payload["postings"].items():
+            for doc_id, frequency in postings:
+                index.postings[term][doc_id] = frequency
+                index.lengths[doc_id] = index.lengths.get(doc_id, 0) + frequency
+        index._total_length = sum(index.lengths.values())
+        index._by_url = {normalize_url(doc["url"]): doc_id for doc_id, doc in enumerate(index.docs)}
+        return index
+
+def load_curated_resources(path=CURATED_RESOURCES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [{**resource, "source": "curated"} for resource in json.load(f)["resources"]]
+
+def build_resource_index(curated_path=CURATED_RESOURCES_PATH, search_store=None, skills=()) -> ResourceIndex:
+    """Curated resources plus whatever the search result cache holds"""
+    index = ResourceIndex()
+    for resource in load_curated_resources(curated_path):
+        index.add(resource)
+    if search_store is not None and hasattr(search_store, "entries"):
+        for _, entry in search_store.entries():
+            index.add_search_results(entry.value, skills, now=entry.stored_at)
+    return index
+
+def default_index_path() -> Path:
+    return Path(os.getenv("RESOURCE_INDEX_PATH", str(default_cache_path("resource_index.json.gz"))))
+
+_RESOURCE_INDEX = None
+_RESOURCE_INDEX_LOADED = False
+
+def get_resource_index():
+    """The process-wide index (None when RESOURCE_INDEX=off): the saved one, else the curated list"""
+    global _RESOURCE_INDEX, _RESOURCE_INDEX_LOADED
+    if not _RESOURCE_INDEX_LOADED:
+        _RESOURCE_INDEX_LOADED = True
+        if os.getenv("RESOURCE_INDEX", "fill").lower() != "off":
+            _RESOURCE_INDEX = ResourceIndex.load(default_index_path()) or build_resource_index()
+    return _RESOURCE_INDEX
@@ -0,0 +1,121 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Domain -> provider name, for metadata the LLM doesn't need to infer
+PROVIDERS = {
+    "coursera.org": "Coursera", "udemy.com": "Udemy", "edx.org": "edX", "pluralsight.com": "Pluralsight",
+    "udacity.com": "Udacity", "educative.io": "Educative", "datacamp.com": "DataCamp",
+    "codecademy.com": "Codecademy", "linkedin.com": "LinkedIn Learning", "freecodecamp.org": "freeCodeCamp",
+    "khanacademy.org": "Khan Academy", "ocw.mit.edu": "MIT OpenCourseWare", "youtube.com": "YouTube",
+    "github.com": "GitHub", "aws.amazon.com": "AWS", "cloud.google.com": "Google Cloud",
+    "learn.microsoft.com": "Microsoft Learn", "grow.google": "Google", "kaggle.com": "Kaggle",
+    "leetcode.com": "LeetCode", "hackerrank.com": "HackerRank", "exercism.org": "Exercism",
+    "frontendmasters.com": "Frontend Masters", "oreilly.com": "O'Reilly", "skillshare.com": "Skillshare",
+    "meetup.com": "Meetup", "reddit.com": "Reddit", "pmi.org": "PMI", "scrum.org": "Scrum.org",
+    "interaction-design.org": "Interaction Design Foundation", "nngroup.com": "Nielsen Norman Group"
+}
+
+# Resource kind by domain; titles refine it below
+KIND_BY_DOMAIN = {
+    "meetup.com": "community", "reddit.com": "community", "discord.com": "community", "slack.com": "community",
+    "kaggle.com": "practice", "leetcode.com": "practice", "hackerrank.com": "practice", "exercism.org": "practice",
+    "youtube.com": "free", "github.com": "free", "freecodecamp.org": "free", "khanacademy.org": "free",
+    "ocw.mit.edu": "free", "oreilly.com": "book", "amazon.com": "book", "goodreads.com": "book"
+}
+
+# Query parameters that only track the click, so URLs differing in them are the same page
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|ref|referrer|source|fbclid|gclid|mc_cid|mc_eid|trk)$", re.I)
+
+_DURATION = re.compile(r"\b(\d+(?:\s*-\s*\d+)?)\s*(hours?|hrs?|days?|weeks?|months?)\b", re.I)
+_PRICE = re.compile(r"(?:US)?\$\s?\d[\d,]*(?:\.\d{2})?")
+_LEVEL = re.compile(r"\b(beginner|intermediate|advanced)\b", re.I)
+_FREE = re.compile(r"\b(free|no cost|audit for free)\b", re.I)
+
+def normalize_url(url: str) -> str:
+    """Dedup key for a URL: lowercase host without www, no fragment, tracking params or trailing slash"""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    host = host[4:] if host.startswith("www.") else host
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)))
+    return urlunsplit((parts.scheme.lower() or "https", host, parts.path.rstrip("/"), query, ""))
+
+def domain_of(url: str) -> str:
+    host = urlsplit(url or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+def _lookup_domain(table: dict, domain: str):
+    """Match a domain or any parent domain ("de.coursera.org" -> "coursera.org")"""
+    labels = domain.split(".")
+    for i in range(len(labels) - 1):
+        value = table.get(".".join(labels[i:]))
+        if value:
+            return value
+    return None
+
+def extract_metadata(result: dict) -> dict:
+    """Provider, kind, cost, duration and level read from the URL, title and snippet; only fields found"""
+    url = result.get("url") or ""
+    domain = domain_of(url)
+    title = result.get("title") or ""
+    text = f"{title} {result.get('content') or ''}"
+    metadata = {"domain": domain}
+
+    provider = _lookup_domain(PROVIDERS, domain)
+    if provider:
+        metadata["provider"] = provider
+    kind = _lookup_domain(KIND_BY_DOMAIN, domain)
+    if re.search(r"\bcertif(?:ication|icate|ied)\b", title, re.I):
+        kind = "certification"
+    elif kind is None and re.search(r"\b(course|bootcamp|specialization|nanodegree|program)\b", title, re.I):
+        kind = "course"
+    if kind:
+        metadata["kind"] = kind
+
+    price = _PRICE.search(text)
+    if price:
+        metadata["cost"] = price.group(0).replace(" ", "")
+    elif _FREE.search(text) or kind == "free":
+        metadata["cost"] = "Free"
+    duration = _DURATION.search(text)
+    if duration:
+        amount = re.sub(r"\s+", "", duration.group(1))
+        metadata["duration"] = f"{amount} {duration.group(2).lower()}"
+    level = _LEVEL.search(text)
+    if level:
+        metadata["level"] = level.group(1).capitalize()
+    return metadata
+
+def merge_search_results(outcomes):
+    """Flatten search outcomes into one entry per URL, remembering how many queries found it"""
+    merged = {}
+    for outcome in outcomes:
+        if not isinstance(outcome, dict):
+            continue
+        for result in outcome.get("results") or []:
+            if not result.get("url"):
+                continue
+            key = normalize_url(result["url"])
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = {**result, "hits": 1}
+            else:
+                entry["hits"] += 1
+                if (result.get("score") or 0) > (entry.get("score") or 0):
+                    merged[key] = {**result, "hits": entry["hits"]}
+    return list(merged.values())
+
+def rank_results(results, skills=(), limit: int = 12):
+    """Order by search score, boosted for results several queries agreed on and for skill mentions"""
+    skill_patterns = [re.compile(rf"\b{re.escape(skill)}\b", re.I) for skill in skills if skill]
+
+    def score(result):
+        text = f"{result.get('title') or ''} {result.get('content') or ''}"
+        skill_hits = sum(1 for pattern in skill_patterns if pattern.search(text))
+        known_provider = _lookup_domain(PROVIDERS, domain_of(result.get("url"))) is not None
+        return ((result.get("score") or 0)
+                + 0.15 * (result.get("hits", 1) - 1)
+                + 0.05 * min(skill_hits, 3)
+                + (0.05 if known_provider else 0))
+
+    ranked = sorted(results, key=score, reverse=True)[:limit]
+    return [{**result, "rank_score": round(score(result), 3)} for result in ranked]
@@ -0,0 +1,225 @@
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+ROLES_PATH = Path(__file__).resolve().parents[1] / "data" / "roles.json"
+
+ROLE_ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "swe": "software engineer", "sde": "software engineer",
+    "eng": "engineer", "dev": "developer", "pm": "product manager", "ds": "data scientist",
+    "ml": "machine learning", "mgr": "manager"
+}
+
+# Filler around a role in free text ("a", "the", "with 3 years of experience")
+_LEADING_FILLER = re.compile(r"^(?:an?|the|my|some|kind of|sort of)\s+")
+_TRAILING_FILLER = re.compile(
+    r"\s+(?:with|for|at|in|who|and|but|because|since|so|after|from|to|that|looking|trying|interested|hoping|planning)\b.*$"
+)
+
+# Seniority and level words: a match must not drop one ("senior product manager" is not "product manager")
+LEVEL_WORDS = frozenset({
+    "intern", "trainee", "junior", "associate", "senior", "staff", "principal", "lead", "manager",
+    "director", "head", "chief", "vp", "executive"
+})
+
+# Phrases that introduce the user's current and target roles
+CURRENT_ROLE_PATTERNS = [
+    re.compile(r"\b(?:i'?m|i am|i work as|working as|i've been|i have been|i was|currently)\s+(?:an?\s+)?(?P<role>[^.,;!?]+)", re.I),
+    re.compile(r"\b(?:background in|experience as|work in|working in)\s+(?:an?\s+)?(?P<role>[^.,;!?]+)", re.I),
+]
+TARGET_ROLE_PATTERNS = [
+    re.compile(r"\b(?:become|becoming|be|transition(?:ing)?|move|moving|switch(?:ing)?|pivot(?:ing)?|get|getting)\s+(?:in)?to\s+(?:an?\s+)?(?P<role>[^.,;!?]+)", re.I),
+    re.compile(r"\b(?:become|becoming)\s+(?:an?\s+)?(?P<role>[^.,;!?]+)", re.I),
+    re.compile(r"\b(?:path to|career in|role as|job as)\s+(?:an?\s+)?(?P<role>[^.,;!?]+)", re.I),
+]
+
+# "from X to Y" names both roles at once ("switch from teacher to data analyst")
+TRANSITION_PATTERNS = [
+    re.compile(r"\bfrom\s+(?:an?\s+)?(?P<current>[^.,;!?]+?)\s+(?:in)?to\s+(?:an?\s+)?(?P<target>[^.,;!?]+)", re.I),
+]
+
+def normalize_role(role: str) -> str:
+    """Lowercase, strip punctuation and expand common abbreviations ("Sr. SWE" -> "senior software engineer")"""
+    words = re.sub(r"[^a-z0-9+#]+", " ", (role or "").lower()).split()
+    return " ".join(ROLE_ABBREVIATIONS.get(word, word) for word in words)
+
+def _stem(token: str) -> str:
+    return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+def _ngrams(text: str, n: int = 3):
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+def _dice(a: set, b: set) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+def _matched_tokens(query_tokens, alias_tokens) -> int:
+    """How many query tokens appear in the alias, or nearly do (typos, plurals)"""
+    return sum(1 for token in query_tokens if token in alias_tokens or (len(token) > 3 and any(
+        len(other) > 3 and _dice(_ngrams(token, 2), _ngrams(other, 2)) >= 0.75 for other in alias_tokens
+    )))
+
+def _token_score(query_tokens, alias_tokens) -> float:
+    """Token-set overlap where a token also matches a near-identical one (typos, plurals)"""
+    matched = _matched_tokens(query_tokens, alias_tokens)
+    return 2 * matched / (len(query_tokens) + len(alias_tokens)) if query_tokens and alias_tokens else 0.0
+
+def _levels(tokens) -> set:
+    return LEVEL_WORDS.intersection(tokens)
+
+@dataclass
+class CanonicalRole:
+    id: str
+    name: str
+    score: float
+    source: str  # "alias", "fuzzy" or "message"
+    text: str = None  # the user's own wording it was matched from; prompts keep this, not the name
+
+class RoleIndex:
+    """Alias table plus a character-trigram index that maps free-text roles to canonical role IDs"""
+
+    def __init__(self, roles, threshold: float = 0.75):
+        self.threshold = threshold
+        self.names = {}
+        self.aliases = {}  # normalized alias -> role id
+        for role in roles:
+            self.names[role["id"]] = role["name"]
+            for alias in [role["name"], role["id"].replace("_", " "), *role.get("aliases", [])]:
+                self.aliases.setdefault(normalize_role(alias), role["id"])
+
+        self._alias_grams = {}
+        self._alias_tokens = {}
+        self._postings = defaultdict(set)
+        for alias in self.aliases:
+            grams = _ngrams(alias)
+            self._alias_grams[alias] = grams
+            self._alias_tokens[alias] = {_stem(token) for token in alias.split()}
+            for gram in grams:
+                self._postings[gram].add(alias)
+        # Longest first, so "senior software engineer" wins over "software engineer" inside a sentence
+        self._aliases_by_length = sorted(self.aliases, key=len, reverse=True)
+
+    @classmethod
+    def load(cls, path=ROLES_PATH, threshold: float = 0.75):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), threshold)
+
+    def _role(self, role_id: str, score: float, source: str, text: str) -> CanonicalRole:
+        return CanonicalRole(role_id, self.names[role_id], round(score, 3), source, text)
+
+    @staticmethod
+    def _strip_filler(text: str) -> str:
+        return _TRAILING_FILLER.sub("", _LEADING_FILLER.sub("", normalize_role(text)))
+
+    @staticmethod
+    def _role_text(phrase: str) -> str:
+        """The role as the user wrote it in a message phrase, without the filler around it"""
+        text = re.sub(_TRAILING_FILLER.pattern, "", phrase.strip(), flags=re.I)
+        return re.sub(_LEADING_FILLER.pattern, "", text, flags=re.I).strip()
+
+    def canonicalize(self, text: str):
+        """The canonical role for a role name, or None when nothing is close enough"""
+        query = self._strip_filler(text)
+        if not query:
+            return None
+        if query in self.aliases:
+            return self._role(self.aliases[query], 1.0, "alias", text)
+
+        grams = _ngrams(query)
+        tokens = {_stem(token) for token in query.split()}
+        levels = _levels(tokens)
+        candidates = set()
+        for gram in grams:
+            candidates |= self._postings.get(gram, set())
+        best_alias, best_score = None, 0.0
+        for alias in candidates:
+            alias_tokens = self._alias_tokens[alias]
+            # Every word has to be accounted for, so a fuzzy match never drops a seniority level
+            # or a qualifier ("staff data engineer" is not "staff engineer")
+            if not levels <= alias_tokens or _matched_tokens(tokens, alias_tokens) < len(tokens):
+                continue
+            # Character overlap catches typos; token overlap keeps "ux designer" away from "ui designer"
+            score = 0.6 * _dice(grams, self._alias_grams[alias]) + 0.4 * _token_score(tokens, self._alias_tokens[alias])
+            if score > best_score:
+                best_alias, best_score = alias, score
+        if best_alias is None or best_score < self.threshold:
+            return None
+        return self._role(self.aliases[best_alias], best_score, "fuzzy", text)
+
+    def _find_in_phrase(self, phrase: str):
+        """The longest alias that appears as whole words in a phrase, else a fuzzy match of the phrase
+
+        An alias missing a level word the phrase has ("product manager" in "senior product
+        manager") doesn't count.
+        """
+        stripped = self._strip_filler(phrase)
+        normalized, levels, text = f" {stripped} ", _levels(stripped.split()), self._role_text(phrase)
+        for alias in self._aliases_by_length:
+            if f" {alias} " in normalized and levels <= self._alias_tokens[alias]:
+                return self._role(self.aliases[alias], 1.0, "message", text)
+        match = self.canonicalize(phrase)
+        if match:
+            match.source, match.text = "message", text
+        return match
+
+    def extract_roles(self, message: str):
+        """(current, target) canonical roles mentioned in a message, each None when not found"""
+        found = {}
+        for pattern in TRANSITION_PATTERNS:
+            for match in pattern.finditer(message or ""):
+                current, target = self._find_in_phrase(match.group("current")), self._find_in_phrase(match.group("target"))
+                if current and target:
+                    found = {"current": current, "target": target}
+                    break
+            if found:
+                break
+        for side, patterns in (("current", CURRENT_ROLE_PATTERNS), ("target", TARGET_ROLE_PATTERNS)):
+            for pattern in patterns:
+                if side in found:
+                    break
+                for match in pattern.finditer(message or ""):
+                    role = self._find_in_phrase(match.group("role"))
+                    if role:
+                        found[side] = role
+                        break
+        current, target = found.get("current"), found.get("target")
+        # Both patterns can land on the same phrase ("I'm trying to become a tech lead")
+        if current and target and current.id == target.id:
+            current = None
+        return current, target
+
+    def resolve(self, message: str = None, current_role: str = None, target_role: str = None):
+        """Canonical (current, target) roles: given roles are canonicalized, missing ones come from the message"""
+        current = self.canonicalize(current_role) if current_role else None
+        target = self.canonicalize(target_role) if target_role else None
+        if message and (not current_role or not target_role):
+            from_message = self.extract_roles(message)
+            current = current or (None if current_role else from_message[0])
+            target = target or (None if target_role else from_message[1])
+        return current, target
+
+def role_id(role: str, index: RoleIndex = None):
+    """Canonical role ID, or None when the role is missing or not a known one"""
+    if not role:
+        return None
+    match = (index or get_role_index()).canonicalize(role)
+    return match.id if match else None
+
+def role_key(role: str, index: RoleIndex = None) -> str:
+    """Canonical role ID when the role is known, else its normalized text; for cache keys"""
+    return role_id(role, index) or normalize_role(role)
+
+_ROLE_INDEX = None
+
+def get_role_index() -> RoleIndex:
+    """The process-wide role index, loaded on first use"""
+    global _ROLE_INDEX
+    if _ROLE_INDEX is None:
+        _ROLE_INDEX = RoleIndex.load(
+            os.getenv("ROLE_INDEX_PATH", str(ROLES_PATH)),
+            threshold=float(os.getenv("ROLE_MATCH_THRESHOLD", "0.75"))
+        )
+    return _ROLE_INDEX
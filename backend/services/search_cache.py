@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import CacheStats, create_cache
+from .telemetry import record_search
+
+# Tool settings that change what a search returns, so they belong in the cache key
+TOOL_CONFIG_FIELDS = (
+    "max_results", "search_depth", "include_answer", "include_raw_content",
+    "topic", "include_domains", "exclude_domains", "time_range"
+)
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", (query or "").lower()).strip()
+
+class CachedSearchTool:
+    """Wraps a search tool with a TTL cache and optional stale-while-revalidate refresh
+
+    With store=None every call goes straight to the tool; calls are traced either way.
+    """
+
+    def __init__(self, tool, store, ttl: float, stale_ttl: float = 0, refresh_workers: int = 2):
+        self.tool = tool
+        self.store = store
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = tool.name
+        self.stats = CacheStats()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="search-refresh") if stale_ttl else None
+
+    def _normalize_args(self, args):
+        if isinstance(args, str):
+            args = {"query": args}
+        return {**args, "query": normalize_query(args.get("query", ""))}
+
+    def make_key(self, args) -> str:
+        config = {field: getattr(self.tool, field, None) for field in TOOL_CONFIG_FIELDS}
+        payload = json.dumps(
+            {"tool": self.name, "config": config, "args": self._normalize_args(args)},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key):
+        """Return (result, is_stale); entries live in the store for ttl + stale_ttl"""
+        if self.store is None:
+            return None, False
+        entry = self.store.get_entry(key)
+        if entry is None:
+            self.stats.record("misses")
+            return None, False
+        self.stats.record("hits")
+        # Without a stale window an entry past ttl (at the boundary, or from a store with its own
+        # TTL) is simply served; there is nothing to refresh it with
+        return entry.value, self.stale_ttl > 0 and entry.age > self.ttl
+
+    def _save(self, key, result):
+        if self.store is None:
+            return
+        self.store.set(key, result, ttl=self.ttl + self.stale_ttl)
+
+    def _schedule_refresh(self, key, args):
+        """Refresh a stale entry in the background, at most once per key at a time"""
+        if self._refresh_executor is None:
+            return
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._save(key, self.tool.invoke(args))
+            except Exception as e:
+                print(f"⚠️ Background search refresh failed: {str(e)}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(refresh)
+
+    def _cache_flag(self, hit: bool):
+        return None if self.store is None else hit
+
+    def invoke(self, args):
+        started = time.perf_counter()
+        key = self.make_key(args)
+        result, is_stale = self._lookup(key)
+        if result is not None:
+            if is_stale:
+                self._schedule_refresh(key, args)
+            record_search(time.perf_counter() - started, cache_hit=True)
+            return result
+        try:
+            result = self.tool.invoke(args)
+        except Exception as e:
+            record_search(time.perf_counter() - started, self._cache_flag(False), error=str(e))
+            raise
+        record_search(time.perf_counter() - started, self._cache_flag(False))
+        self._save(key, result)
+        return result
+
+    async def ainvoke(self, args):
+        started = time.perf_counter()
+        key = self.make_key(args)
+        result, is_stale = self._lookup(key)
+        if result is not None:
+            if is_stale:
+                self._schedule_refresh(key, args)
+            record_search(time.perf_counter() - started, cache_hit=True)
+            return result
+        try:
+            result = await self.tool.ainvoke(args)
+        except Exception as e:
+            record_search(time.perf_counter() - started, self._cache_flag(False), error=str(e))
+            raise
+        record_search(time.perf_counter() - started, self._cache_flag(False))
+        self._save(key, result)
+        return result
+
+    def describe(self):
+        return {
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale_ttl,
+            "refreshing": len(self._refreshing),
+            **self.stats.as_dict(),
+            "store": self.store.describe() if self.store is not None else {"backend": "none"}
+        }
+
+def create_search_cache_from_env():
+    """Build the search result store from SEARCH_CACHE_* environment variables"""
+    return create_cache(
+        backend=os.getenv("SEARCH_CACHE_BACKEND", "sqlite"),
+        filename="search_cache.sqlite3",
+        max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")),
+        max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+        table="search_results"
+    )
+
+def wrap_search_tool(tool, store):
+    """Put the (possibly disabled) cache and tracing in front of a search tool"""
+    if tool is None:
+        return None
+    return CachedSearchTool(
+        tool,
+        store,
+        ttl=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+        stale_ttl=float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "0"))
+    )
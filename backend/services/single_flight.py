@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution whose result they all share"""
+
+    def __init__(self):
+        self._tasks = {}  # key -> asyncio task, for coroutine callers
+        self._calls = {}  # key -> _Call, for blocking callers
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    async def run(self, key: str, factory):
+        """Await factory() once per key; returns (result, shared) where shared means another caller ran it"""
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self.followers += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+
+            def forget(finished):
+                if self._tasks.get(key) is finished:
+                    del self._tasks[key]
+                # Retrieve the exception so it isn't reported as unhandled when every caller went away
+                if not finished.cancelled():
+                    finished.exception()
+
+            task.add_done_callback(forget)
+        # Shielded, so one caller disconnecting doesn't cancel the work the others are waiting on
+        return await asyncio.shield(task), shared
+
+    def run_sync(self, key: str, func):
+        """Blocking variant of run for callers on worker threads"""
+        with self._lock:
+            call = self._calls.get(key)
+            shared = call is not None
+            if shared:
+                self.followers += 1
+            else:
+                self.leaders += 1
+                call = self._calls[key] = _Call()
+
+        if shared:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        return {
+            "in_flight": len(self._tasks) + len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.followers
+        }
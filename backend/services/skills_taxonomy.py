@@ -0,0 +1,68 @@
+import json
+import os
+import re
+from pathlib import Path
+
+TAXONOMY_PATH = Path(__file__).resolve().parents[1] / "data" / "skills_taxonomy.json"
+
+def normalize_skill(skill: str) -> str:
+    return re.sub(r"[^a-z0-9+#]+", " ", (skill or "").lower()).strip()
+
+class SkillsTaxonomy:
+    """Canonical role ID -> required skills (most important first), with set-based gap analysis"""
+
+    def __init__(self, roles: dict, version: int = None):
+        self.version = version
+        self.roles = {role_id: list(skills) for role_id, skills in roles.items()}
+        self._skill_sets = {
+            role_id: frozenset(normalize_skill(skill) for skill in skills)
+            for role_id, skills in self.roles.items()
+        }
+
+    @classmethod
+    def load(cls, path=TAXONOMY_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["roles"], data.get("version"))
+
+    def knows(self, role_id: str) -> bool:
+        return role_id in self.roles
+
+    def required_skills(self, role_id: str):
+        return list(self.roles.get(role_id, []))
+
+    def assess(self, current_role_id: str, target_role_id: str, priority_count: int = 4) -> dict:
+        """Skills assessment in the agent's output format, computed from the taxonomy alone"""
+        current = self.roles.get(current_role_id, [])
+        current_set = self._skill_sets.get(current_role_id, frozenset())
+        required = self.roles[target_role_id]
+        target_set = self._skill_sets[target_role_id]
+
+        # Keep the taxonomy's priority order while using set membership for the comparison
+        skill_gaps = [skill for skill in required if normalize_skill(skill) not in current_set]
+        overlap = [skill for skill in required if normalize_skill(skill) in current_set]
+        transferable = [skill for skill in current if normalize_skill(skill) not in target_set]
+        return {
+            "current_skills": current,
+            "required_skills": required,
+            "skill_gaps": skill_gaps,
+            "strengths": overlap + transferable[:max(0, 3 - len(overlap))],
+            "priority_skills": skill_gaps[:priority_count]
+        }
+
+    def stats(self):
+        return {"version": self.version, "roles": len(self.roles)}
+
+def mentioned_skills(message: str, skills) -> list:
+    """Skills from the list that the message names as whole words"""
+    text = f" {normalize_skill(message)} "
+    return [skill for skill in skills if normalize_skill(skill) and f" {normalize_skill(skill)} " in text]
+
+_TAXONOMY = None
+
+def get_skills_taxonomy() -> SkillsTaxonomy:
+    """The process-wide taxonomy, loaded on first use"""
+    global _TAXONOMY
+    if _TAXONOMY is None:
+        _TAXONOMY = SkillsTaxonomy.load(os.getenv("SKILLS_TAXONOMY_PATH", str(TAXONOMY_PATH)))
+    return _TAXONOMY
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+
+STRUCTURED_OUTPUT_METHODS = ("json_schema", "function_calling", "json_mode")
+
+_DECODER = json.JSONDecoder()
+
+# A ``` fenced block: language tag, then the body up to the closing fence
+_FENCE = re.compile(r"```([\w+-]*)[^\S\n]*\n?(.*?)```", re.S)
+
+def structured_output_method():
+    """The with_structured_output method selected by STRUCTURED_OUTPUT, or None when it is off"""
+    value = os.getenv("STRUCTURED_OUTPUT", "off").lower()
+    if value in ("", "off", "false", "0", "none"):
+        return None
+    if value in ("on", "true", "1"):
+        return "json_schema"
+    if value not in STRUCTURED_OUTPUT_METHODS:
+        raise ValueError(f"Unknown structured output method: {value}")
+    return value
+
+def _decode_first(text: str, start: int = 0, stop: int = None):
+    """(value, end) for the first '{' in text[start:stop] that starts a decodable object, else (None, None)"""
+    position = text.find("{", start, stop)
+    while position != -1:
+        try:
+            return _DECODER.raw_decode(text, position)
+        except json.JSONDecodeError:
+            position = text.find("{", position + 1, stop)
+    return None, None
+
+def extract_json(text):
+    """Decode the JSON object in a model reply, skipping any leading prose or ``` fence
+
+    A ```json (or untagged) fenced block is tried first; otherwise every '{' in the text is
+    tried in turn, so prose like "use {braces}" or a later fenced example doesn't hide the
+    object. Returns (value, rest) where rest is the text after the object (and its fence),
+    or (None, text) when there is no decodable object.
+    """
+    if not isinstance(text, str):
+        return None, text
+    for fence in _FENCE.finditer(text):
+        if fence.group(1).lower() in ("", "json"):
+            value, end = _decode_first(text, fence.start(2), fence.end(2))
+            if end is not None:
+                return value, text[fence.end():].strip()
+    value, end = _decode_first(text)
+    if end is None:
+        return None, text
+    rest = text[end:].lstrip()
+    if rest.startswith("```"):
+        rest = rest[3:]
+    return value, rest.strip()
+
+def describe_raw_output(raw) -> str:
+    """The text of a failed structured reply, whether it came back as content or as tool call arguments"""
+    if raw is None:
+        return ""
+    if isinstance(raw.content, str) and raw.content:
+        return raw.content
+    tool_calls = getattr(raw, "tool_calls", None) or []
+    if tool_calls:
+        return json.dumps([call.get("args") for call in tool_calls], default=str)
+    invalid = getattr(raw, "invalid_tool_calls", None) or []
+    return "\n".join(str(call.get("args")) for call in invalid)
@@ -0,0 +1,235 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_text(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label set"""
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{_label_text(key + (('le', bound),))} {count}")
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', '+Inf'),))} {series['count']}")
+                lines.append(f"{self.name}_sum{_label_text(key)} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{_label_text(key)} {series['count']}")
+        return lines
+
+class Counter:
+    """Monotonic counter, one series per label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels):
+        """Copy a total that is counted elsewhere (e.g. by the HTTP clients) when metrics are scraped"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.append(f"{self.name}{_label_text(key)} {value}")
+        return lines
+
+class Gauge:
+    """Point-in-time value, one series per label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.append(f"{self.name}{_label_text(key)} {value}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def histogram(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        metric = Counter(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        metric = Gauge(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+REQUEST_SECONDS = registry.histogram("careerpath_request_seconds", "HTTP request latency by endpoint")
+NODE_SECONDS = registry.histogram("careerpath_node_seconds", "LangGraph node wall time")
+LLM_SECONDS = registry.histogram("careerpath_llm_seconds", "Chat model call latency by agent")
+SEARCH_SECONDS = registry.histogram("careerpath_search_seconds", "Web search latency")
+LLM_TOKENS = registry.counter("careerpath_llm_tokens_total", "Prompt and completion tokens by agent")
+CACHE_REQUESTS = registry.counter("careerpath_cache_requests_total", "Cache lookups by cache and result")
+RETRIES = registry.counter("careerpath_retries_total", "Retried calls by component")
+COALESCED = registry.counter("careerpath_coalesced_requests_total", "Plan requests served by an identical in-flight request")
+PARSE_FAILURES = registry.counter("careerpath_parse_failures_total", "Agent replies that failed to parse, by agent and stage")
+HTTP_POOL_CONNECTIONS = registry.gauge("careerpath_http_pool_connections", "Shared HTTP pool connections by client and state")
+LINK_CHECKS = registry.histogram("careerpath_link_check_seconds", "Background resource link checks by outcome")
+ABANDONED_CALLS = registry.counter("careerpath_abandoned_calls_total", "Pool calls given up on while still running, by component")
+HTTP_REQUESTS = registry.counter("careerpath_http_requests_total", "Requests sent through the shared HTTP clients")
+
+class RequestTrace:
+    """Spans recorded while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span: dict):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self):
+        with self._lock:
+            spans = list(self.spans)
+        llm_spans = [s for s in spans if s["kind"] == "llm"]
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 3),
+            "prompt_tokens": sum(s.get("prompt_tokens") or 0 for s in llm_spans),
+            "completion_tokens": sum(s.get("completion_tokens") or 0 for s in llm_spans),
+            "llm_calls": len(llm_spans),
+            "cache_hits": sum(1 for s in spans if s.get("cache_hit")),
+            "retries": sum(s.get("retries") or 0 for s in spans),
+            "spans": spans
+        }
+
+_current_trace = contextvars.ContextVar("careerpath_trace", default=None)
+
+@contextmanager
+def start_trace():
+    """Collect spans for the current request; contextvars carry the trace into tasks and copied contexts"""
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+def current_trace():
+    return _current_trace.get()
+
+def _add_span(kind: str, name: str, seconds: float, **attributes):
+    trace = current_trace()
+    if trace is not None:
+        trace.add({"kind": kind, "name": name, "seconds": round(seconds, 4), **{k: v for k, v in attributes.items() if v is not None}})
+
+def record_node(node: str, seconds: float):
+    NODE_SECONDS.observe(seconds, node=node)
+    _add_span("node", node, seconds)
+
+def record_llm_call(agent: str, seconds: float, response=None, cache_hit: bool = False):
+    usage = getattr(response, "usage_metadata", None) or {}
+    prompt_tokens = usage.get("input_tokens")
+    completion_tokens = usage.get("output_tokens")
+    LLM_SECONDS.observe(seconds, agent=agent, cache="hit" if cache_hit else "miss")
+    CACHE_REQUESTS.inc(cache="llm", result="hit" if cache_hit else "miss")
+    if cache_hit:
+        # Cached responses carry the original usage, but cost nothing this time
+        prompt_tokens = completion_tokens = None
+    else:
+        LLM_TOKENS.inc(prompt_tokens or 0, agent=agent, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens or 0, agent=agent, kind="completion")
+    _add_span("llm", agent, seconds, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cache_hit=cache_hit)
+
+def record_search(seconds: float, cache_hit: bool = None, error: str = None):
+    SEARCH_SECONDS.observe(seconds, cache="none" if cache_hit is None else ("hit" if cache_hit else "miss"))
+    if cache_hit is not None:
+        CACHE_REQUESTS.inc(cache="search", result="hit" if cache_hit else "miss")
+    _add_span("search", "tavily", seconds, cache_hit=cache_hit, error=error)
+
+def record_retry(component: str, reason: str = None):
+    RETRIES.inc(component=component)
+    _add_span("retry", component, 0.0, retries=1, reason=reason)
+
+def record_abandoned(component: str, seconds: float):
+    """A pool call stopped being waited for; its thread stays busy until the call returns on its own"""
+    ABANDONED_CALLS.inc(component=component)
+    _add_span("abandoned", component, seconds)
+
+def record_parse_failure(agent: str, stage: str):
+    """stage: structured (first attempt), repair (the retry too) or fallback (hard-coded data used)"""
+    PARSE_FAILURES.inc(agent=agent, stage=stage)
+    _add_span("parse_failure", agent, 0.0, stage=stage)
+
+def record_coalesced():
+    COALESCED.inc()
+    _add_span("coalesced", "plan", 0.0)
+
+def record_request(endpoint: str, seconds: float, status: int):
+    REQUEST_SECONDS.observe(seconds, endpoint=endpoint, status=status)
+
+def record_http_pool(stats: dict):
+    """Copy SharedHttpClients.stats() into the pool gauges and request counter; called when metrics are scraped"""
+    for client in ("sync", "async"):
+        HTTP_REQUESTS.set_total(stats["requests"][client], client=client)
+        for state, value in (stats.get(client) or {}).items():
+            HTTP_POOL_CONNECTIONS.set(value, client=client, state=state)
+
+def record_link_check(status: str, seconds: float):
+    LINK_CHECKS.observe(seconds, status=status)
@@ -0,0 +1,69 @@
+import os
+from typing import Any, Optional, Type
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field, SecretStr
+
+from .http_clients import get_http_clients
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+class TavilySearchInput(BaseModel):
+    query: str = Field(description="Search query to look up")
+
+class PooledTavilySearch(BaseTool):
+    """Tavily search over the shared httpx clients; returns the same result dict as TavilySearch"""
+
+    name: str = "tavily_search"
+    description: str = (
+        "A search engine optimized for comprehensive, accurate, and trusted results. "
+        "Useful for finding current courses, certifications and learning resources."
+    )
+    args_schema: Type[BaseModel] = TavilySearchInput
+    api_key: SecretStr
+    max_results: int = 5
+    search_depth: str = "advanced"
+    include_answer: bool = True
+    include_raw_content: bool = False
+    # Seconds per request; None keeps the shared clients' timeout
+    timeout: Optional[float] = None
+
+    def _request(self, query: str):
+        request = {
+            "url": TAVILY_SEARCH_URL,
+            "headers": {"Authorization": f"Bearer {self.api_key.get_secret_value()}"},
+            "json": {
+                "query": query,
+                "max_results": self.max_results,
+                "search_depth": self.search_depth,
+                "include_answer": self.include_answer,
+                "include_raw_content": self.include_raw_content
+            }
+        }
+        if self.timeout:
+            request["timeout"] = self.timeout
+        return request
+
+    def _run(self, query: str, run_manager: Optional[Any] = None) -> dict:
+        response = get_http_clients().sync_client().post(**self._request(query))
+        response.raise_for_status()
+        return response.json()
+
+    async def _arun(self, query: str, run_manager: Optional[Any] = None) -> dict:
+        response = await get_http_clients().async_client().post(**self._request(query))
+        response.raise_for_status()
+        return response.json()
+
+def create_search_tool_from_env():
+    """The Tavily tool, or None without TAVILY_API_KEY; TAVILY_CLIENT=langchain uses langchain-tavily's own client"""
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        return None
+    settings = {"max_results": 5, "search_depth": "advanced", "include_answer": True, "include_raw_content": False}
+    if os.getenv("TAVILY_CLIENT", "pooled").lower() == "langchain":
+        from langchain_tavily import TavilySearch
+        return TavilySearch(**settings)
+    # A search the resources agent stopped waiting for still holds a pool thread until it ends,
+    # so by default it ends when the agent gives up on it rather than at the shared 60s timeout
+    timeout = float(os.getenv("TAVILY_TIMEOUT_SECONDS", os.getenv("RESOURCES_TOOL_TIMEOUT_SECONDS", "20")))
+    return PooledTavilySearch(api_key=api_key, timeout=timeout or None, **settings)
@@ -11,6 +11,7 @@ function App() {
   const [isLoading, setIsLoading] = useState(false);
   const [currentLearningPath, setCurrentLearningPath] = useState(null);
   const [currentResources, setCurrentResources] = useState(null);
+  const [conversationId, setConversationId] = useState(null);
   const [backendStatus, setBackendStatus] = useState('unknown');
   const [error, setError] = useState(null);
 
@@ -57,7 +58,8 @@ function App() {
       const contextData = {
         conversation_history: conversationHistory,
         current_learning_path: currentLearningPath,
-        is_follow_up: messages.length > 0 // True if this isn't the first message
+        is_follow_up: messages.length > 0, // True if this isn't the first message
+        conversation_id: conversationId // Lets the backend reuse the previous plan's agent outputs
       };
       
       console.log('🧠 FRONTEND: Sending context:', {
@@ -70,6 +72,10 @@ function App() {
       const response = await careerAPI.chat(message, contextData);
       
       console.log('📦 FRONTEND: Received API response:', response);
+      
+      if (response.conversation_id) {
+        setConversationId(response.conversation_id);
+      }
       console.log('🗺️ FRONTEND: Learning path in response:', response.data?.learning_path);
       
       // Add AI response to chat
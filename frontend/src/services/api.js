@@ -54,7 +54,8 @@ export const careerAPI = {
         ...(context && {
           conversation_history: context.conversation_history,
           current_learning_path: context.current_learning_path,
-          is_follow_up: context.is_follow_up
+          is_follow_up: context.is_follow_up,
+          conversation_id: context.conversation_id
         })
       };
 
@@ -92,6 +93,58 @@ export const careerAPI = {
     }
   },
 
+  // Streaming chat: calls onEvent(event, data) for start, node, token, summary, done and error events
+  async chatStream(message, context = null, onEvent = () => {}) {
+    const requestBody = {
+      message: message,
+      ...(context && {
+        conversation_history: context.conversation_history,
+        current_learning_path: context.current_learning_path,
+        is_follow_up: context.is_follow_up,
+        conversation_id: context.conversation_id
+      })
+    };
+
+    const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(requestBody)
+    });
+
+    if (!response.ok) {
+      const errorText = await response.text();
+      throw new Error(`HTTP ${response.status}: ${errorText}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Server-sent events are separated by a blank line
+      const events = buffer.split('\n\n');
+      buffer = events.pop();
+      for (const rawEvent of events) {
+        const eventLine = rawEvent.split('\n').find(line => line.startsWith('event: '));
+        const dataLine = rawEvent.split('\n').find(line => line.startsWith('data: '));
+        if (!eventLine || !dataLine) continue;
+        const event = eventLine.slice(7);
+        const data = JSON.parse(dataLine.slice(6));
+        if (event === 'summary') summary = data;
+        onEvent(event, data);
+      }
+    }
+
+    return summary;
+  },
+
   // Full career planning
   async createCareerPlan(currentRole, targetRole, message) {
     try {
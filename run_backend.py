@@ -1,37 +1,83 @@
 #!/usr/bin/env python3
 """
 Simple CareerPath.AI Backend Runner
+
+    python run_backend.py                      # one worker, like before
+    python run_backend.py --workers 4          # four uvicorn worker processes
+    python run_backend.py --workers 0          # one worker per CPU core
+    python run_backend.py --server gunicorn    # gunicorn managing uvicorn workers
 """
 
+import argparse
 import os
+import shutil
 import sys
-import subprocess
 
-def main():
+APP = "backend.main:app"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the CareerPath.AI backend")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="Worker processes; 0 means one per CPU core (default: WEB_CONCURRENCY or 1)")
+    parser.add_argument("--server", choices=("uvicorn", "gunicorn"), default="uvicorn",
+                        help="Process manager for multiple workers (gunicorn restarts crashed workers)")
+    parser.add_argument("--reload", action="store_true", help="Reload on code changes (single worker only)")
+    return parser.parse_args(argv)
+
+def shared_store_defaults(workers: int):
+    """Stores that default to process memory move to SQLite, so any worker can serve any request"""
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    if workers > 1:
+        os.environ.setdefault("PLAN_STORE_BACKEND", "sqlite")
+        os.environ.setdefault("SESSION_STORE_BACKEND", "sqlite")
+
+def main(argv=None):
+    args = parse_args(argv)
     print("🚀 Starting CareerPath.AI Backend...")
-    
+
     # Check if OpenAI API key is set
     if not os.getenv("OPENAI_API_KEY"):
         print("❌ OPENAI_API_KEY environment variable is not set!")
         print("Please set it using: export OPENAI_API_KEY=your_api_key_here")
         return 1
-    
+
+    workers = args.workers or os.cpu_count() or 1
+    if args.reload and workers > 1:
+        print("⚠️ --reload runs a single worker")
+        workers = 1
+    shared_store_defaults(workers)
+
     print("✅ OpenAI API Key found")
-    print("🌐 Starting backend at http://localhost:8000")
-    print("📖 API docs will be at http://localhost:8000/docs")
+    print(f"🌐 Starting backend at http://localhost:{args.port} with {workers} worker(s)")
+    print(f"📖 API docs will be at http://localhost:{args.port}/docs")
+    print(f"🩺 Readiness probe at http://localhost:{args.port}/api/ready")
     print("Press Ctrl+C to stop")
     print("-" * 50)
-    
+
+    # Run from the project root so the backend package imports resolve
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
     try:
-        # Change to backend directory and run main.py
-        os.chdir("backend")
-        subprocess.run([sys.executable, "main.py"])
+        if args.server == "gunicorn" and workers > 1:
+            gunicorn = shutil.which("gunicorn")
+            if gunicorn is None:
+                print("❌ gunicorn is not installed (pip install gunicorn), or use --server uvicorn")
+                return 1
+            # Each worker imports the app itself (no --preload), so graphs are built per worker
+            os.execv(gunicorn, [
+                gunicorn, APP, "--worker-class", "uvicorn.workers.UvicornWorker",
+                "--workers", str(workers), "--bind", f"{args.host}:{args.port}"
+            ])
+        import uvicorn
+        uvicorn.run(APP, host=args.host, port=args.port, workers=workers, reload=args.reload)
     except KeyboardInterrupt:
         print("\n👋 Backend stopped")
         return 0
     except Exception as e:
         print(f"❌ Error: {e}")
         return 1
+    return 0
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Tests for the cache tiers
+
+    python -m pytest test_cache.py
+"""
+
+import time
+
+from backend.services.cache import LRUCache, SQLiteCache, TieredCache
+
+def test_promoted_entry_keeps_disk_expiry(tmp_path):
+    disk = SQLiteCache(tmp_path / "cache.sqlite3", ttl=100)
+    cache = TieredCache(LRUCache(ttl=100), disk)
+    # Written 60s ago with a 100s TTL: 40s left
+    disk.set("key", {"answer": 42}, stored_at=time.time() - 60)
+    stored = disk.get_entry("key")
+
+    assert cache.get("key") == {"answer": 42}
+    promoted = cache.memory.get_entry("key")
+    assert promoted is not None and not promoted.is_expired()
+    assert promoted.expires_at == stored.expires_at
+
+    # Served from memory now, without another disk read
+    disk_hits = disk.stats.hits
+    assert cache.get("key") == {"answer": 42}
+    assert disk.stats.hits == disk_hits
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for prompt token budgeting
+
+    python -m pytest test_context_budget.py
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from backend.services.context_budget import count_message_tokens, count_tokens, fit_messages
+
+def words(n: int) -> str:
+    return " ".join(f"word{i}" for i in range(n))
+
+def test_several_large_messages_are_trimmed_until_the_prompt_fits():
+    messages = [
+        SystemMessage(content="You are a career planning agent."),
+        HumanMessage(content=words(1500)),
+        AIMessage(content=words(1200)),
+        HumanMessage(content=words(1000))
+    ]
+    fitted = fit_messages(messages, 1000)
+    assert count_message_tokens(fitted) <= 1000
+    assert fitted[0] is messages[0]
+    assert all(message.type == original.type for message, original in zip(fitted, messages))
+
+def test_prompt_within_budget_is_unchanged():
+    messages = [SystemMessage(content="system"), HumanMessage(content="hello")]
+    assert fit_messages(messages, 1000) is messages
+
+def test_system_messages_and_the_floor_are_a_best_effort_limit():
+    messages = [SystemMessage(content=words(500)), HumanMessage(content=words(500))]
+    fitted = fit_messages(messages, 200, min_tokens=64)
+    # The system prompt is never cut and the user message stops at the floor
+    assert fitted[0].content == messages[0].content
+    assert count_tokens(fitted[1].content) <= 64 + 8
+    assert count_message_tokens(fitted) > 200
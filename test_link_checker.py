@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for background resource link checking, against a local stub HTTP server
+
+    python -m pytest test_link_checker.py
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+
+from backend.services.cache import LRUCache
+from backend.services.link_checker import LinkChecker
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/ok, /missing, /gone, /no-head (405 to HEAD), /moved (301 to /ok), /slow?delay=seconds"""
+
+    def _respond(self, head: bool):
+        path = urlsplit(self.path).path
+        server = self.server
+        with server.lock:
+            server.log.append((path, self.command, time.monotonic()))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if path == "/slow":
+                time.sleep(float(parse_qs(urlsplit(self.path).query).get("delay", ["0.2"])[0]))
+            if path == "/moved":
+                self.send_response(301)
+                self.send_header("Location", "/ok")
+            elif path in ("/ok", "/slow") or (path == "/no-head" and not head):
+                self.send_response(200)
+            elif path == "/no-head":
+                self.send_response(405)
+            elif path == "/gone":
+                self.send_response(410)
+            else:
+                self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def do_GET(self):
+        self._respond(head=False)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    for proxy in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
+        monkeypatch.delenv(proxy, raising=False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.log = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_checker(**kwargs):
+    # The stub server listens on loopback, which checkers refuse to contact by default
+    settings = {"store": LRUCache(), "concurrency": 8, "per_domain": 8, "domain_interval": 0, "timeout": 2,
+                "allow_private": True}
+    return LinkChecker(**{**settings, **kwargs})
+
+def test_classifies_links(stub_server):
+    checker = make_checker()
+    paths = ["/ok", "/missing", "/gone", "/no-head", "/moved"]
+    results = asyncio.run(checker.check_many([stub_server.url + path for path in paths]))
+    statuses = {path: result["status"] for path, result in zip(paths, results)}
+    assert statuses == {"/ok": "ok", "/missing": "dead", "/gone": "dead", "/no-head": "ok", "/moved": "ok"}
+    assert results[4]["final_url"] == stub_server.url + "/ok"
+    # HEAD first, then a GET only where HEAD was refused
+    methods = {(path, method) for path, method, _ in stub_server.log}
+    assert ("/no-head", "GET") in methods
+    assert ("/ok", "GET") not in methods
+
+def test_unreachable_and_slow_links(stub_server):
+    checker = make_checker(timeout=0.2)
+    closed = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    refused_url = f"http://127.0.0.1:{closed.server_address[1]}/ok"
+    closed.server_close()
+    refused, slow = asyncio.run(checker.check_many([refused_url, stub_server.url + "/slow?delay=1"]))
+    # Refused connections look the same as a network outage on our side, so they aren't proof of a dead link
+    assert refused == {**refused, "status": "unknown", "error": "ConnectError"}
+    assert slow == {**slow, "status": "unknown", "error": "timeout"}
+
+def test_malformed_urls_are_dead_without_raising(stub_server):
+    checker = make_checker()
+    bad_port, bad_ipv6 = "http://127.0.0.1:99999/ok", "http://[::1/ok"
+    results = asyncio.run(checker.check_many([bad_port, bad_ipv6, "http://bad\x00host/ok"]))
+    assert [result["status"] for result in results] == ["dead", "dead", "dead"]
+    assert checker.status(bad_ipv6)["status"] == "dead"
+    assert checker.submit([bad_ipv6]) == 0
+
+def test_private_addresses_are_not_probed(stub_server):
+    checker = make_checker(allow_private=False)
+    results = asyncio.run(checker.check_many([stub_server.url + "/ok", "http://localhost:1/ok", "http://169.254.169.254/"]))
+    assert [(result["status"], result["error"]) for result in results] == [("unknown", "private_address")] * 3
+    assert stub_server.log == []
+
+def test_redirects_to_private_addresses_are_not_followed():
+    requested = []
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(302, headers={"Location": "http://169.254.169.254/latest/meta-data/"})
+    checker = make_checker(allow_private=False, transport=httpx.MockTransport(handler))
+    result = asyncio.run(checker.check("http://93.184.216.34/moved"))
+    assert (result["status"], result["error"]) == ("unknown", "private_address")
+    assert requested == ["http://93.184.216.34/moved"]
+
+def test_bounded_concurrency(stub_server):
+    checker = make_checker(concurrency=2)
+    urls = [f"{stub_server.url}/slow?delay=0.1&n={i}" for i in range(6)]
+    asyncio.run(checker.check_many(urls))
+    assert stub_server.max_in_flight == 2
+
+def test_per_domain_politeness(stub_server):
+    checker = make_checker(per_domain=1, domain_interval=0.15)
+    asyncio.run(checker.check_many([f"{stub_server.url}/ok?n={i}" for i in range(4)]))
+    starts = sorted(started for _, _, started in stub_server.log)
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert len(starts) == 4
+    assert min(gaps) >= 0.14
+
+def test_results_expire(stub_server):
+    checker = make_checker(ttl=0.2)
+    url = stub_server.url + "/missing"
+    asyncio.run(checker.check(url))
+    assert checker.status(url)["status"] == "dead"
+    time.sleep(0.25)
+    assert checker.status(url) is None
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "background checks did not finish"
+        time.sleep(0.02)
+
+@pytest.mark.parametrize("mode", ["demote", "drop"])
+def test_review_demotes_dead_links_on_later_requests(stub_server, mode):
+    checker = make_checker(mode=mode)
+    resources = {
+        "courses": [
+            {"title": "Gone", "url": stub_server.url + "/gone"},
+            {"title": "Fine", "url": stub_server.url + "/ok"},
+            {"title": "No link"}
+        ],
+        "books": ["A Book"]
+    }
+    try:
+        # Unchecked links are served as they are and checked in the background
+        first = checker.review(resources)
+        assert [course["title"] for course in first["courses"]] == ["Gone", "Fine", "No link"]
+        wait_for(lambda: checker.stats()["pending"] == 0 and checker.status(stub_server.url + "/gone"))
+
+        second = checker.review(resources)
+        expected = ["Fine", "No link", "Gone"] if mode == "demote" else ["Fine", "No link"]
+        assert [course["title"] for course in second["courses"]] == expected
+        assert second["dead_links"] == 1
+        assert second["books"] == ["A Book"]
+        if mode == "demote":
+            assert second["courses"][-1]["link_status"] == "dead"
+        # Checked links aren't requested again while their result is cached
+        assert len([entry for entry in stub_server.log if entry[0] == "/gone"]) == 1
+    finally:
+        checker.close()
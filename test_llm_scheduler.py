@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for LLM call admission control: concurrency cap, rate limits, retries and deadlines
+
+    python -m pytest test_llm_scheduler.py
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.llm_scheduler import LLMScheduler, SchedulerTimeout, TokenBucket
+
+class StatusError(Exception):
+    """Looks like an SDK HTTP error: a status code and a response with headers"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+class Tracker:
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self.lock:
+            self.active -= 1
+
+    def call(self):
+        self._enter()
+        time.sleep(self.seconds)
+        self._exit()
+        return "reply"
+
+    async def acall(self):
+        self._enter()
+        await asyncio.sleep(self.seconds)
+        self._exit()
+        return "reply"
+
+def make_scheduler(**kwargs):
+    settings = {"requests_per_minute": 60000, "tokens_per_minute": 10 ** 8, "initial_concurrency": 2,
+                "max_concurrency": 2, "backoff_base": 0.01, "deadline": 5}
+    return LLMScheduler(**{**settings, **kwargs})
+
+def test_threads_queue_behind_the_concurrency_cap():
+    scheduler, tracker = make_scheduler(), Tracker()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda _: scheduler.run(tracker.call), range(6)))
+    assert results == ["reply"] * 6
+    assert tracker.peak == 2
+    assert scheduler.stats()["completed"] == 6
+    assert scheduler.stats()["in_flight"] == 0
+
+def test_async_callers_queue_behind_the_concurrency_cap():
+    scheduler, tracker = make_scheduler(), Tracker()
+
+    async def main():
+        return await asyncio.gather(*(scheduler.arun(tracker.acall) for _ in range(6)))
+
+    assert asyncio.run(main()) == ["reply"] * 6
+    assert tracker.peak == 2
+    assert scheduler.stats()["queued_peak"] >= 4
+
+def test_rate_limit_retries_after_the_server_says_and_halves_concurrency():
+    scheduler = make_scheduler(initial_concurrency=4, max_concurrency=8)
+    attempts = []
+
+    def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise StatusError(429, {"retry-after-ms": "150"})
+        return "reply"
+
+    assert scheduler.run(call) == "reply"
+    assert attempts[1] - attempts[0] >= 0.14
+    stats = scheduler.stats()
+    assert stats["throttled"] == 1
+    # Halved to 2, then one success adds back 1/limit
+    assert stats["concurrency_limit"] == 2.5
+
+def test_final_errors_are_not_retried():
+    scheduler, attempts = make_scheduler(), []
+
+    def call():
+        attempts.append(1)
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        scheduler.run(call)
+    assert len(attempts) == 1
+    assert scheduler.stats()["in_flight"] == 0
+
+def test_retries_stop_at_max_retries():
+    scheduler, attempts = make_scheduler(max_retries=2), []
+
+    def call():
+        attempts.append(1)
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        scheduler.run(call)
+    assert len(attempts) == 3
+
+def test_waiting_past_the_deadline_raises():
+    scheduler = make_scheduler(initial_concurrency=1, max_concurrency=1, deadline=0.1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        slow = pool.submit(scheduler.run, Tracker(0.4).call)
+        time.sleep(0.02)
+        queued = pool.submit(scheduler.run, Tracker(0).call)
+        with pytest.raises(SchedulerTimeout):
+            queued.result()
+        assert slow.result() == "reply"
+    assert scheduler.stats()["deadline_exceeded"] == 1
+
+def test_requests_per_minute_budget_spaces_out_calls():
+    # 600 RPM with a 0.1s burst: one request up front, then one every 0.1s
+    scheduler = make_scheduler(requests_per_minute=600, burst_seconds=0.1)
+    started = time.monotonic()
+    for _ in range(3):
+        scheduler.run(lambda: "reply")
+    assert time.monotonic() - started >= 0.18
+
+def test_token_bucket_reservations():
+    bucket = TokenBucket(rate_per_minute=600, capacity=10)
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.02)
+    # Would need another 0.5s on top of the debt: refused without taking anything
+    assert bucket.reserve(5, max_wait=0.6) is None
+    bucket.adjust(-10)
+    assert bucket.reserve(5) == pytest.approx(0.0, abs=0.02)
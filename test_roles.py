@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for free-text role canonicalization
+
+    python -m pytest test_roles.py
+"""
+
+from backend.services.roles import get_role_index, role_id, role_key
+
+def roles_in(message):
+    current, target = get_role_index().extract_roles(message)
+    return (current.id if current else None, target.id if target else None)
+
+def test_from_to_names_both_roles():
+    assert roles_in("I want to switch from teacher to data analyst") == ("teacher", "data_analyst")
+    assert roles_in("How do I move from a QA engineer into a DevOps engineer role?") == ("qa_engineer", "devops_engineer")
+
+def test_single_role_phrases_still_work():
+    assert roles_in("I'm a nurse and want to become a UX designer") == ("nurse", "ux_designer")
+    assert roles_in("Help me go from here to there, I'm a teacher") == ("teacher", None)
+
+def test_unknown_roles_have_no_id_but_keep_a_cache_key():
+    assert role_id("Sr. SWE") == "senior_software_engineer"
+    assert role_id("Underwater Basket Weaver") is None
+    assert role_id("") is None
+    assert role_key("Underwater Basket Weaver") == "underwater basket weaver"
+
+def test_seniority_and_qualifiers_are_not_dropped():
+    for role in ("Senior Product Manager", "Senior Data Scientist", "Data Science Manager",
+                 "Software Engineering Intern", "Staff Data Engineer"):
+        assert role_id(role) is None, role
+    assert role_id("Senior Software Engineers") == "senior_software_engineer"
+    assert role_id("product manger") == "product_manager"
+
+def test_aliases_do_not_merge_different_jobs():
+    for role in ("accountant", "scrum master", "program manager", "vp of engineering", "ux researcher"):
+        assert role_id(role) is None, role
+
+def test_promotion_keeps_the_current_role():
+    current, target = get_role_index().resolve("I'm a product manager and want to become a senior product manager")
+    assert current.id == "product_manager"
+    assert target is None
+
+def test_roles_from_a_message_keep_the_users_wording():
+    current, target = get_role_index().resolve("I'm a Sr SWE with 5 years of experience and want to become an ML Engineer")
+    assert (current.id, current.text) == ("senior_software_engineer", "Sr SWE")
+    assert (target.id, target.text) == ("machine_learning_engineer", "ML Engineer")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the supervisor's local keyword router
+
+    python -m pytest test_router.py
+"""
+
+import pytest
+
+from backend.agents.router import KeywordRouter
+
+# SUPERVISOR_ROUTER_THRESHOLD's default: at or above it, hybrid mode skips the LLM
+THRESHOLD = 0.6
+
+@pytest.fixture
+def router():
+    return KeywordRouter()
+
+def test_new_plans_always_start_at_skills(router):
+    decision = router.classify("What salaries can I expect?", is_follow_up=False)
+    assert (decision.agent, decision.confidence, decision.source) == ("skills_agent", 1.0, "rules:new_plan")
+
+@pytest.mark.parametrize("message, agent", [
+    ("What salaries and hiring demand can I expect in this market?", "industry_agent"),
+    ("Can you recommend courses and books for this?", "resources_agent"),
+    ("Can you make the timeline faster, maybe 6 months?", "learning_agent"),
+    ("What skills am I missing?", "skills_agent"),
+])
+def test_clear_follow_ups_are_routed_without_the_llm(router, message, agent):
+    decision = router.classify(message, is_follow_up=True)
+    assert decision.agent == agent
+    assert decision.confidence >= THRESHOLD
+
+def test_mixed_follow_ups_are_left_to_the_llm(router):
+    decision = router.classify("What courses fit my skill gaps and timeline?", is_follow_up=True)
+    assert decision.confidence < THRESHOLD
+    assert decision.scores["resources_agent"] > 0 and decision.scores["learning_agent"] > 0
+
+def test_follow_ups_without_any_signal_have_zero_confidence(router):
+    decision = router.classify("Tell me more", is_follow_up=True)
+    assert (decision.agent, decision.confidence, decision.source) == ("skills_agent", 0.0, "rules:no_match")
+
+def test_repeating_a_word_counts_sublinearly(router):
+    once = router.score("salary")["industry_agent"]
+    assert once < router.score("salary salary salary")["industry_agent"] < 3 * once
+
+def test_stems_shared_by_several_agents_weigh_less():
+    router = KeywordRouter({"a": {"plan": 1.0, "shared": 1.0}, "b": {"shared": 1.0}})
+    assert router.score("plan")["a"] > router.score("shared")["a"]
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the search result cache
+
+    python -m pytest test_search_cache.py
+"""
+
+import time
+
+from backend.services.cache import LRUCache
+from backend.services.search_cache import CachedSearchTool
+
+class CountingTool:
+    name = "stub_search"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, args):
+        self.calls += 1
+        return {"results": [{"url": "https://example.com", "title": args["query"]}]}
+
+def test_entry_past_ttl_without_stale_window_is_served():
+    tool = CountingTool()
+    # The store keeps entries longer than the wrapper's TTL
+    store = LRUCache(ttl=3600)
+    cached = CachedSearchTool(tool, store, ttl=10, stale_ttl=0)
+    store.set(cached.make_key({"query": "python"}), {"results": []}, ttl=3600, stored_at=time.time() - 60)
+
+    assert cached.invoke({"query": "python"}) == {"results": []}
+    assert tool.calls == 0
+    assert cached.describe()["refreshing"] == 0
+
+def test_stale_entry_is_refreshed_in_background():
+    tool = CountingTool()
+    store = LRUCache()
+    cached = CachedSearchTool(tool, store, ttl=10, stale_ttl=60)
+    key = cached.make_key({"query": "python"})
+    store.set(key, {"results": []}, ttl=70, stored_at=time.time() - 30)
+
+    assert cached.invoke({"query": "python"}) == {"results": []}
+    deadline = time.monotonic() + 5
+    while store.get(key) == {"results": []}:
+        assert time.monotonic() < deadline, "stale entry was not refreshed"
+        time.sleep(0.01)
+    assert tool.calls == 1
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the Agents SDK session stores (in-memory and SQLite)
+
+    python -m pytest test_sessions.py
+"""
+
+import time
+
+import pytest
+
+from backend.app.sessions import InMemorySessionStore, SessionLimits, SQLiteSessionStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**limits):
+        settings = SessionLimits(**limits)
+        if request.param == "sqlite":
+            return SQLiteSessionStore(settings, tmp_path / "sessions.sqlite3")
+        return InMemorySessionStore(settings)
+    return make
+
+def test_first_turn_of_a_new_session(make_store):
+    store = make_store()
+    assert store.get_history("new") == []
+    store.append_turn("new", "hello", "hi there")
+    assert store.get_history("new") == [{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi there"}]
+
+def test_history_is_trimmed_to_the_turn_cap(make_store):
+    store = make_store(max_turns=2)
+    for turn in range(3):
+        store.get_history("chat")
+        store.append_turn("chat", f"question {turn}", f"answer {turn}")
+    assert [message["content"] for message in store.get_history("chat")] == [
+        "question 1", "answer 1", "question 2", "answer 2"
+    ]
+
+def test_idle_sessions_expire(make_store):
+    store = make_store(idle_ttl=0.2)
+    store.append_turn("idle", "hello", "hi")
+    time.sleep(0.1)
+    store.append_turn("active", "hello", "hi")
+    time.sleep(0.15)
+    assert store.get_history("idle") == []
+    assert store.get_history("active") != []
+    assert store.stats()["sessions"] == 1
+    assert store.stats()["evictions"] == 1
+
+def test_least_recently_used_sessions_go_over_the_byte_budget(make_store):
+    # Each turn is 10 + 10 bytes of content; the budget holds two sessions
+    store = make_store(memory_budget_bytes=45)
+    for session_id in ("a", "b"):
+        store.append_turn(session_id, "q" * 10, "a" * 10)
+        time.sleep(0.01)
+    store.get_history("a")  # "b" is now the least recently used
+    time.sleep(0.01)
+    store.append_turn("c", "q" * 10, "a" * 10)
+    assert store.get_history("b") == []
+    assert store.get_history("a") != [] and store.get_history("c") != []
+    assert store.stats()["bytes"] <= 45
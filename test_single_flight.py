@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for coalescing identical in-flight requests
+
+    python -m pytest test_single_flight.py
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services.single_flight import SingleFlight
+
+def test_concurrent_async_callers_share_one_run():
+    flight, runs = SingleFlight(), []
+
+    async def plan(name):
+        runs.append(name)
+        await asyncio.sleep(0.05)
+        return {"plan": name}
+
+    async def main():
+        same = [flight.run("a", lambda: plan("a")) for _ in range(5)]
+        return await asyncio.gather(*same, flight.run("b", lambda: plan("b")))
+
+    results = asyncio.run(main())
+    assert runs == ["a", "b"]
+    assert [shared for _, shared in results[:5]] == [False, True, True, True, True]
+    assert all(result == {"plan": "a"} for result, _ in results[:5])
+    assert results[5] == ({"plan": "b"}, False)
+    assert flight.stats() == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+
+def test_finished_keys_run_again():
+    flight, runs = SingleFlight(), []
+
+    async def plan():
+        runs.append(1)
+        return len(runs)
+
+    async def main():
+        first = await flight.run("a", plan)
+        second = await flight.run("a", plan)
+        return first, second
+
+    assert asyncio.run(main()) == ((1, False), (2, False))
+
+def test_async_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.02)
+        raise ValueError("model down")
+
+    async def main():
+        return await asyncio.gather(*(flight.run("a", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert flight.stats()["in_flight"] == 0
+
+def test_a_caller_going_away_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def plan():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.run("a", plan))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.run("a", plan))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == ("done", True)
+
+def test_concurrent_threads_share_one_run():
+    flight, runs = SingleFlight(), []
+    lock = threading.Lock()
+
+    def plan():
+        with lock:
+            runs.append(1)
+        time.sleep(0.1)
+        return "plan"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: flight.run_sync("a", plan), range(4)))
+    assert len(runs) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {result for result, _ in results} == {"plan"}
+
+def test_sync_errors_reach_followers_and_the_key_is_released():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.run_sync, "a", fail)
+        started.wait(1)
+        follower = pool.submit(flight.run_sync, "a", lambda: "unused")
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert flight.run_sync("a", lambda: "fresh") == ("fresh", False)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Tests for JSON extraction from model replies
+
+    python -m pytest test_structured_output.py
+"""
+
+from backend.services.structured_output import extract_json
+
+def test_fenced_json_with_prose_around_it():
+    value, rest = extract_json('Here is the plan:\n```json\n{"phases": [1, 2]}\n```\nGood luck!')
+    assert value == {"phases": [1, 2]}
+    assert rest == "Good luck!"
+
+def test_object_before_a_later_fenced_example():
+    reply = '{"skills": ["SQL"]}\n\nTo load it:\n```python\nimport json\nplan = json.loads(reply)\n```'
+    value, rest = extract_json(reply)
+    assert value == {"skills": ["SQL"]}
+    assert rest.startswith("To load it:")
+
+def test_undecodable_braces_before_the_object():
+    value, rest = extract_json('Use {braces} around placeholders. ROADMAP: {"timeline": "6 months"} done')
+    assert value == {"timeline": "6 months"}
+    assert rest == "done"
+
+def test_no_object():
+    assert extract_json("no json {here") == (None, "no json {here")
+    assert extract_json(None) == (None, None)
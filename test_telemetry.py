@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics exposition
+
+    python -m pytest test_telemetry.py
+"""
+
+from backend.services import telemetry
+
+def test_http_request_totals_are_exposed_as_a_counter():
+    telemetry.record_http_pool({"requests": {"sync": 3, "async": 7}, "sync": None, "async": {"idle": 1}})
+    text = telemetry.registry.render()
+    assert "# TYPE careerpath_http_requests_total counter" in text
+    assert 'careerpath_http_requests_total{client="async"} 7' in text
+    assert 'careerpath_http_pool_connections{client="async",state="idle"} 1' in text
+    # Later scrapes copy the newer total rather than adding to it
+    telemetry.record_http_pool({"requests": {"sync": 4, "async": 7}, "sync": None, "async": None})
+    assert 'careerpath_http_requests_total{client="sync"} 4' in telemetry.registry.render()
+
+def test_counters_and_histograms_render_per_label_set():
+    counter = telemetry.Counter("test_events_total", "Events")
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc(kind="b")
+    assert counter.render()[2:] == ['test_events_total{kind="a"} 3', 'test_events_total{kind="b"} 1']
+    histogram = telemetry.Histogram("test_seconds", "Latency", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    assert histogram.render()[2:] == [
+        'test_seconds_bucket{le="0.1"} 1', 'test_seconds_bucket{le="1"} 2', 'test_seconds_bucket{le="+Inf"} 2',
+        "test_seconds_sum 0.550000", "test_seconds_count 2"
+    ]
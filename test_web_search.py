@@ -34,11 +34,12 @@ def test_web_search():
     print("✅ API keys found")
     
     try:
-        # Test Tavily search directly
-        from langchain_tavily import TavilySearch
+        # Test Tavily search directly, over the same pooled client the agents use
+        from backend.services.web_search import create_search_tool_from_env
         
         print("\n🔍 Testing Tavily search...")
-        search_tool = TavilySearch(max_results=2)
+        search_tool = create_search_tool_from_env()
+        search_tool.max_results = 2
         result = search_tool.invoke("Python programming courses 2024")
         
         print("✅ Tavily search successful!")
@@ -53,9 +54,9 @@ def test_web_search():
         
         return True
         
-    except ImportError:
-        print("❌ langchain-tavily not installed")
-        print("Run: pip install langchain-tavily")
+    except ImportError as e:
+        print(f"❌ Missing dependency: {e.name}")
+        print("Run: pip install -r requirements.txt")
         return False
     except Exception as e:
         print(f"❌ Error testing web search: {str(e)}")
@@ -68,13 +69,17 @@ def test_resources_agent():
     
     try:
         from backend.agents.resources_agent import ResourceRecommendationAgent
+        from backend.services.http_clients import get_http_clients
         from langchain_openai import ChatOpenAI
         
         # Initialize model and agent
+        http_clients = get_http_clients()
         model = ChatOpenAI(
             temperature=0.1,
             api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4o-mini-2024-07-18"
+            model="gpt-4o-mini-2024-07-18",
+            http_client=http_clients.sync_client(),
+            http_async_client=http_clients.async_client()
         )
         
         agent = ResourceRecommendationAgent(model)